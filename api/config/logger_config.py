@@ -1,110 +1,200 @@
+import atexit
+import json
 import logging
 import os
-from logging.config import dictConfig
+import random
+import time
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    TimedRotatingFileHandler,
+)
+from queue import SimpleQueue
+from typing import List, Optional
 
 import colorlog
-from pythonjsonlogger import jsonlogger
 
+# Attributes every LogRecord has; anything else came in through `extra`.
+RECORD_ATTRIBUTES = frozenset(
+    vars(logging.LogRecord('', 0, '', 0, '', None, None))
+) | {'message', 'asctime'}
 
-def configure_logging(is_dev: bool, app_name: str):
+_listener: Optional[QueueListener] = None
+
+
+class FastJsonFormatter(logging.Formatter):
+    """One JSON object per line with a fixed set of fields plus extras.
+
+    Produces the same keys as the previous python-json-logger format
+    without parsing a format string for every record.
+    """
+
+    def __init__(self, app_name: str):
+        super().__init__()
+        self._app_name = app_name
+        self._encoder = json.JSONEncoder(default=str)
+        self._second = None
+        self._second_text = ''
+
+    def format(self, record: logging.LogRecord) -> str:
+        document = {
+            'asctime': self.formatTime(record),
+            'app': self._app_name,
+            'levelname': record.levelname,
+            'msg': record.getMessage(),
+            'pathname': record.pathname,
+            'lineno': record.lineno,
+        }
+        if record.exc_info:
+            document['exc_info'] = self.formatException(record.exc_info)
+        for key, value in vars(record).items():
+            if key not in RECORD_ATTRIBUTES:
+                document[key] = value
+        return self._encoder.encode(document)
+
+    def formatTime(self, record, datefmt=None) -> str:
+        # strftime dominates formatting, and records arrive in bursts
+        # within the same second.
+        second = int(record.created)
+        if second != self._second:
+            self._second = second
+            self._second_text = time.strftime(
+                self.default_time_format, self.converter(record.created)
+            )
+        return f'{self._second_text},{int(record.msecs):03d}'
+
+
+class LocalQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue never leaves the process, so the record is not made
+        # picklable: only the message is rendered here, so mutable arguments
+        # are captured as they were. Formatting and I/O run on the listener.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a `rate` fraction of the records at or below `max_level`."""
+
+    def __init__(self, rate: float, max_level: int = logging.DEBUG):
+        super().__init__()
+        self.rate = rate
+        self.max_level = max_level
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return (
+            record.levelno > self.max_level
+            or self.rate >= 1.0
+            or random.random() < self.rate
+        )
+
+
+def build_handlers(
+    log_level: int, app_name: str, log_dir: str
+) -> List[logging.Handler]:
+    console = logging.StreamHandler()
+    console.setLevel(log_level)
+    console.setFormatter(
+        colorlog.ColoredFormatter(
+            f'%(log_color)s%(asctime)s%(reset)s - {app_name} - %(log_color)s%(levelname)s%(reset)s - %(message)s',
+            log_colors={
+                'DEBUG': 'green',
+                'INFO': 'cyan',
+                'WARNING': 'yellow',
+                'ERROR': 'red',
+                'CRITICAL': 'bold_red',
+            },
+        )
+    )
+
+    file = TimedRotatingFileHandler(
+        os.path.join(log_dir, f'{app_name}.log'),
+        when='midnight',
+        backupCount=7,
+    )
+    file.setFormatter(
+        logging.Formatter(
+            f'%(asctime)s - {app_name} - %(levelname)s - %(message)s'
+        )
+    )
+
+    json_file = TimedRotatingFileHandler(
+        os.path.join(log_dir, f'{app_name}_structured.log'),
+        when='midnight',
+        backupCount=7,
+    )
+    json_file.setFormatter(FastJsonFormatter(app_name))
+
+    # Only the application's own records go to the files; uvicorn's share
+    # the queue but are written to the console alone, as before.
+    for handler in (file, json_file):
+        handler.setLevel(log_level)
+        handler.addFilter(logging.Filter('api_gateway'))
+    return [console, file, json_file]
+
+
+def stop_logging() -> None:
+    global _listener
+    if _listener is not None:
+        # Drains the queue before returning.
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
+
+
+def configure_logging(
+    is_dev: bool,
+    app_name: str,
+    debug_sample_rate: float = 1.0,
+    access_sample_rate: float = 1.0,
+):
+    global _listener
     log_level = logging.DEBUG if is_dev else logging.INFO
 
     log_dir = os.path.join(os.getcwd(), 'logs', app_name)
     os.makedirs(log_dir, exist_ok=True)
 
-    log_file = os.path.join(log_dir, f'{app_name}.log')
-    json_log_file = os.path.join(log_dir, f'{app_name}_structured.log')
-
-    colored_formatter = colorlog.ColoredFormatter(
-        f'%(log_color)s%(asctime)s%(reset)s - {app_name} - %(levelname)s - %(message)s',
-        log_colors={
-            'DEBUG': 'green',
-            'INFO': 'cyan',
-            'WARNING': 'yellow',
-            'ERROR': 'red',
-            'CRITICAL': 'bold_red',
-        },
+    # Log calls only enqueue the record; a background thread does the
+    # console and file writes, including the midnight rollover.
+    stop_logging()
+    queue = SimpleQueue()
+    _listener = QueueListener(
+        queue,
+        *build_handlers(log_level, app_name, log_dir),
+        respect_handler_level=True,
     )
+    _listener.start()
 
-    json_formatter = jsonlogger.JsonFormatter(
-        f'%(asctime)s {app_name} %(levelname)s %(message)s',
-        rename_fields={
-            'asctime': 'timestamp',
-            'levelname': 'level',
-            'message': 'msg',
-        },
-    )
+    queue_handler = LocalQueueHandler(queue)
+    loggers = {
+        'api_gateway': log_level,
+        'uvicorn': logging.INFO,
+        'uvicorn.error': logging.INFO,
+        'uvicorn.access': logging.INFO,
+    }
+    for name, level in loggers.items():
+        configured = logging.getLogger(name)
+        for handler in list(configured.handlers):
+            configured.removeHandler(handler)
+        for sampling in [
+            f for f in configured.filters if isinstance(f, SamplingFilter)
+        ]:
+            configured.removeFilter(sampling)
+        configured.addHandler(queue_handler)
+        configured.setLevel(level)
+        configured.propagate = False
 
-    dictConfig(
-        {
-            'version': 1,
-            'disable_existing_loggers': False,
-            'formatters': {
-                'default': {
-                    'format': f'%(asctime)s - {app_name} - %(levelname)s - %(message)s'
-                },
-                'colored': {
-                    '()': colorlog.ColoredFormatter,
-                    'format': f'%(log_color)s%(asctime)s%(reset)s - {app_name} - %(log_color)s%(levelname)s%(reset)s - %(message)s',
-                    'log_colors': {
-                        'DEBUG': 'green',
-                        'INFO': 'cyan',
-                        'WARNING': 'yellow',
-                        'ERROR': 'red',
-                        'CRITICAL': 'bold_red',
-                    },
-                },
-                'json': {
-                    '()': jsonlogger.JsonFormatter,
-                    'format': f'%(asctime)s {app_name} %(levelname)s %(msg)s %(pathname)s %(lineno)d',
-                },
-            },
-            'handlers': {
-                'console': {
-                    'level': log_level,
-                    'class': 'logging.StreamHandler',
-                    'formatter': 'colored',
-                },
-                'file': {
-                    'level': log_level,
-                    'class': 'logging.handlers.TimedRotatingFileHandler',
-                    'filename': log_file,
-                    'when': 'midnight',
-                    'backupCount': 7,
-                    'formatter': 'default',
-                },
-                'json_file': {
-                    'level': log_level,
-                    'class': 'logging.handlers.TimedRotatingFileHandler',
-                    'filename': json_log_file,
-                    'when': 'midnight',
-                    'backupCount': 7,
-                    'formatter': 'json',
-                },
-            },
-            'loggers': {
-                'api_gateway': {
-                    'level': log_level,
-                    'handlers': ['console', 'file', 'json_file'],
-                    'propagate': False,
-                },
-                'uvicorn': {
-                    'level': logging.INFO,
-                    'handlers': ['console'],
-                    'propagate': False,
-                },
-                'uvicorn.error': {
-                    'level': logging.INFO,
-                    'handlers': ['console'],
-                    'propagate': False,
-                },
-                'uvicorn.access': {
-                    'level': logging.INFO,
-                    'handlers': ['console'],
-                    'propagate': False,
-                },
-            },
-        }
+    # Sampled on the calling side, so dropped records cost no queue traffic.
+    logging.getLogger('api_gateway').addFilter(
+        SamplingFilter(debug_sample_rate)
+    )
+    logging.getLogger('uvicorn.access').addFilter(
+        SamplingFilter(access_sample_rate, logging.INFO)
     )
 
     logger = logging.getLogger('api_gateway')
@@ -0,0 +1,14 @@
+import asyncpg
+
+from api.config.settings import settings
+from infrastructure.database.postgres import create_pool
+
+
+async def get_postgres_pool() -> asyncpg.Pool:
+    return await create_pool(
+        settings.DATABASE_URL,
+        min_size=settings.DATABASE_POOL_MIN_SIZE,
+        max_size=settings.DATABASE_POOL_MAX_SIZE,
+        statement_cache_size=settings.DATABASE_STATEMENT_CACHE_SIZE,
+        command_timeout=settings.DATABASE_COMMAND_TIMEOUT,
+    )
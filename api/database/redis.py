@@ -1,12 +1,14 @@
-import redis
+from redis import asyncio as redis
 
 from api.config.settings import settings
 
 
-def get_redis_client():
-    return redis.StrictRedis.from_url(
-        settings.REDIS_URL, decode_responses=True
+def get_redis_client() -> redis.Redis:
+    return redis.from_url(
+        settings.REDIS_URL,
+        decode_responses=True,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
     )
-
-
-client_redis = get_redis_client()
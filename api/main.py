@@ -1,22 +1,165 @@
+from contextlib import asynccontextmanager
+
+import asyncpg
 from fastapi import FastAPI
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
 from uvicorn import run
 
+from application.interfaces.post_repository_interface import (
+    PostRepositoryInterface,
+)
+from application.services.post_service import PostService
+from infrastructure.cache.memory_cache import MemoryCache
+from infrastructure.database.postgres import create_schema
+from infrastructure.metrics.multiprocess import MetricsStore
+from infrastructure.metrics.registry import REGISTRY
+from infrastructure.repositories.author_repository import AuthorRepository
+from infrastructure.repositories.cached_post_repository import (
+    CachedPostRepository,
+)
+from infrastructure.repositories.local_cached_post_repository import (
+    LocalCachedPostRepository,
+)
+from infrastructure.repositories.post_repository import PostRepository
+from infrastructure.search.inverted_index import restore_search_index
+
 from .config.settings import settings
+from .database.postgres import get_postgres_pool
+from .database.redis import get_redis_client
+from .metrics.instruments import record_cache_stats
+from .metrics.tasks import start_metrics_tasks, stop_metrics_tasks
+from .middlewares.compression_middleware import CompressionMiddleware
 from .middlewares.jwt_middleware import JWTMiddleware
+from .middlewares.metrics_middleware import MetricsMiddleware
 from .middlewares.rate_limit_middleware import RateLimitMiddleware
+from .rate_limit.factory import get_rate_limiter
 from .routes import init_routes
 
-settings.configure_logging()
+logger = settings.configure_logging()
+
+compression_cache = MemoryCache(
+    max_entries=settings.COMPRESSION_CACHE_MAX_ENTRIES,
+    max_bytes=settings.COMPRESSION_CACHE_MAX_BYTES,
+    ttl=settings.COMPRESSION_CACHE_TTL,
+)
+
+
+def collect_cache_stats() -> None:
+    repository = getattr(app.state, 'post_repository', None)
+    stats = getattr(repository, 'stats', dict)()
+    record_cache_stats({**stats, 'compression': compression_cache.stats()})
+
+
+async def create_post_repository(
+    postgres: asyncpg.Pool, redis: Redis
+) -> PostRepositoryInterface:
+    repository = PostRepository(postgres)
+    if settings.POST_CACHE_ENABLED:
+        repository = CachedPostRepository(
+            repository,
+            redis,
+            ttl=settings.POST_CACHE_TTL,
+            list_ttl=settings.POST_LIST_CACHE_TTL,
+            miss_ttl=settings.POST_CACHE_MISS_TTL,
+            early_refresh_beta=settings.POST_CACHE_EARLY_REFRESH_BETA,
+        )
+    if settings.POST_L1_CACHE_ENABLED:
+        repository = LocalCachedPostRepository(
+            repository,
+            redis,
+            MemoryCache(
+                max_entries=settings.POST_L1_CACHE_MAX_ENTRIES,
+                max_bytes=settings.POST_L1_CACHE_MAX_BYTES,
+                ttl=settings.POST_L1_CACHE_TTL,
+            ),
+        )
+        await repository.start()
+    return repository
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.redis = get_redis_client()
+    app.state.rate_limiter = get_rate_limiter(app.state.redis)
+    try:
+        await app.state.rate_limiter.start()
+    except RedisError as e:
+        logger.warning(f'Could not start rate limiter: {e}')
+
+    memory_search = settings.POST_SEARCH_BACKEND == 'memory'
+    if not settings.DATABASE_URL and not memory_search:
+        raise RuntimeError(
+            'DATABASE_URL is required unless POST_SEARCH_BACKEND is memory.'
+        )
+
+    # Without a database only search is served, from the index snapshot.
+    app.state.postgres = app.state.post_repository = None
+    app.state.author_repository = None
+    if settings.DATABASE_URL:
+        app.state.postgres = await get_postgres_pool()
+        if settings.DATABASE_CREATE_SCHEMA:
+            await create_schema(app.state.postgres)
+        app.state.post_repository = await create_post_repository(
+            app.state.postgres, app.state.redis
+        )
+        app.state.author_repository = AuthorRepository(app.state.postgres)
+    app.state.search_index = None
+    if memory_search:
+        app.state.search_index = restore_search_index(
+            settings.POST_SEARCH_INDEX_PATH
+        )
+    app.state.post_service = PostService(
+        app.state.post_repository, app.state.search_index
+    )
+    if memory_search and app.state.post_repository is not None:
+        await app.state.post_service.sync_search_index()
+
+    app.state.metrics_store, metrics_tasks = None, []
+    if settings.METRICS_ENABLED:
+        if settings.METRICS_DIR:
+            app.state.metrics_store = MetricsStore(settings.METRICS_DIR)
+        metrics_tasks = start_metrics_tasks(
+            app.state.metrics_store,
+            settings.METRICS_PUBLISH_INTERVAL,
+            settings.METRICS_LOOP_LAG_INTERVAL,
+        )
+
+    try:
+        yield
+    finally:
+        await stop_metrics_tasks(metrics_tasks, app.state.metrics_store)
+        # A snapshot taken without a database would record a sync that
+        # never happened.
+        if memory_search and app.state.post_repository is not None:
+            try:
+                app.state.search_index.snapshot(
+                    settings.POST_SEARCH_INDEX_PATH
+                )
+            except OSError as e:
+                logger.warning(f'Could not save the search index: {e}')
+        if isinstance(app.state.post_repository, LocalCachedPostRepository):
+            await app.state.post_repository.stop()
+        if app.state.postgres is not None:
+            await app.state.postgres.close()
+        await app.state.rate_limiter.stop()
+        await app.state.redis.aclose()
+
 
 app = FastAPI(
     title='Api Blog',
     description='Api for management to a blog app with python and FastAPI',
     version='1.0.0',
+    lifespan=lifespan,
 )
 
+app.add_middleware(CompressionMiddleware, cache=compression_cache)
 app.add_middleware(TrustedHostMiddleware, allowed_hosts=['localhost', '*'])
 app.add_middleware(RateLimitMiddleware)
 app.add_middleware(JWTMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    REGISTRY.on_collect(collect_cache_stats)
 
 init_routes(app=app)
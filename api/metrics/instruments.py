@@ -0,0 +1,53 @@
+from typing import Any, Dict
+
+from infrastructure.metrics.registry import REGISTRY
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+REQUEST_DURATION = REGISTRY.histogram(
+    'http_request_duration_seconds',
+    'Time to serve a request, by route template and status.',
+    ['method', 'route', 'status'],
+)
+JWT_DURATION = REGISTRY.histogram(
+    'jwt_duration_seconds',
+    'Time spent verifying tokens: fetching the signing key or decoding.',
+    ['phase'],
+)
+RATE_LIMIT_DURATION = REGISTRY.histogram(
+    'rate_limit_duration_seconds',
+    'Time spent asking the rate limiter, by outcome.',
+    ['result'],
+)
+EVENT_LOOP_LAG = REGISTRY.gauge(
+    'event_loop_lag_seconds',
+    'How late the last event loop probe woke up.',
+)
+EVENT_LOOP_LAG_HISTOGRAM = REGISTRY.histogram(
+    'event_loop_lag_histogram_seconds',
+    'How late event loop probes wake up.',
+    buckets=LAG_BUCKETS,
+)
+CACHE_HITS = REGISTRY.counter(
+    'cache_hits_total', 'Cache lookups answered from the cache.', ['cache']
+)
+CACHE_MISSES = REGISTRY.counter(
+    'cache_misses_total', 'Cache lookups that missed.', ['cache']
+)
+CACHE_ENTRIES = REGISTRY.gauge(
+    'cache_entries', 'Entries held by in-process caches.', ['cache']
+)
+CACHE_BYTES = REGISTRY.gauge(
+    'cache_bytes', 'Bytes held by in-process caches.', ['cache']
+)
+
+
+def record_cache_stats(stats: Dict[str, Dict[str, Any]]) -> None:
+    # Hit ratios are derived when querying:
+    # rate(cache_hits_total) / (rate(cache_hits_total) + rate(...misses)).
+    for cache, values in stats.items():
+        CACHE_HITS.set(values['hits'], (cache,))
+        CACHE_MISSES.set(values['misses'], (cache,))
+        if 'entries' in values:
+            CACHE_ENTRIES.set(values['entries'], (cache,))
+            CACHE_BYTES.set(values['bytes'], (cache,))
@@ -0,0 +1,57 @@
+import asyncio
+import logging
+from typing import List, Optional
+
+from infrastructure.metrics.multiprocess import MetricsStore
+from infrastructure.metrics.registry import REGISTRY
+
+from .instruments import EVENT_LOOP_LAG, EVENT_LOOP_LAG_HISTOGRAM
+
+logger = logging.getLogger('api_gateway')
+
+
+async def monitor_event_loop_lag(interval: float) -> None:
+    # A probe that should wake up every `interval` seconds; anything
+    # blocking the loop delays it by as much.
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - expected)
+        EVENT_LOOP_LAG.set(lag)
+        EVENT_LOOP_LAG_HISTOGRAM.observe(lag)
+
+
+async def publish_metrics(store: MetricsStore, interval: float) -> None:
+    # Keeps this worker's numbers visible to scrapes served by the others.
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(store.write, REGISTRY.collect())
+        except OSError as e:
+            logger.warning(f'Could not publish metrics: {e}')
+
+
+def start_metrics_tasks(
+    store: Optional[MetricsStore], publish_interval: float, lag_interval: float
+) -> List[asyncio.Task]:
+    tasks = [asyncio.create_task(monitor_event_loop_lag(lag_interval))]
+    if store is not None:
+        tasks.append(
+            asyncio.create_task(publish_metrics(store, publish_interval))
+        )
+    return tasks
+
+
+async def stop_metrics_tasks(
+    tasks: List[asyncio.Task], store: Optional[MetricsStore]
+) -> None:
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    if store is not None:
+        # The final totals of this worker outlive it in the archive.
+        try:
+            store.write(REGISTRY.collect())
+        except OSError as e:
+            logger.warning(f'Could not publish metrics: {e}')
@@ -0,0 +1,244 @@
+import zlib
+from typing import Callable, Dict, Optional
+
+from fastapi import FastAPI
+from starlette.datastructures import Headers, MutableHeaders
+
+from api.config.settings import settings
+from api.routes.streaming import parse_accept_encoding
+from infrastructure.cache.memory_cache import MemoryCache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/json',
+    'application/x-ndjson',
+    'application/javascript',
+    'application/xml',
+)
+
+
+class GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(
+            level, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+        )
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        compressed = self._compressor.compress(data)
+        if flush:
+            compressed += self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        return compressed
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        compressed = self._compressor.process(data)
+        if flush:
+            compressed += self._compressor.flush()
+        return compressed
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdEncoder:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        compressed = self._compressor.compress(data)
+        if flush:
+            compressed += self._compressor.flush(
+                zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            )
+        return compressed
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def available_encoders() -> Dict[str, Callable[[], object]]:
+    # Server preference when the client rates several codings equally.
+    # brotli and zstd are used when their packages are installed.
+    encoders = {}
+    if brotli is not None:
+        encoders['br'] = lambda: BrotliEncoder(
+            settings.COMPRESSION_BROTLI_QUALITY
+        )
+    if zstandard is not None:
+        encoders['zstd'] = lambda: ZstdEncoder(settings.COMPRESSION_ZSTD_LEVEL)
+    encoders['gzip'] = lambda: GzipEncoder(settings.COMPRESSION_GZIP_LEVEL)
+    return encoders
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: FastAPI,
+        minimum_size: Optional[int] = None,
+        cache: Optional[MemoryCache] = None,
+        encoders: Optional[Dict[str, Callable[[], object]]] = None,
+    ):
+        self.app = app
+        self.minimum_size = (
+            minimum_size
+            if minimum_size is not None
+            else settings.COMPRESSION_MINIMUM_SIZE
+        )
+        self.cache = (
+            cache
+            if cache is not None
+            else MemoryCache(
+                max_entries=settings.COMPRESSION_CACHE_MAX_ENTRIES,
+                max_bytes=settings.COMPRESSION_CACHE_MAX_BYTES,
+                ttl=settings.COMPRESSION_CACHE_TTL,
+            )
+        )
+        self.encoders = encoders or available_encoders()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self.choose_encoding(
+            Headers(scope=scope).get('accept-encoding', '')
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = CompressedResponder(self, encoding, scope['path'], send)
+        await self.app(scope, receive, responder.send)
+
+    def choose_encoding(self, header: str) -> Optional[str]:
+        qualities = parse_accept_encoding(header)
+        wildcard = qualities.get('*', 0.0)
+        best, best_quality = None, 0.0
+        for name in self.encoders:
+            quality = qualities.get(name, wildcard)
+            if quality > best_quality:
+                best, best_quality = name, quality
+        return best
+
+
+class CompressedResponder:
+    def __init__(
+        self, middleware: CompressionMiddleware, encoding: str, path: str, send
+    ):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.path = path
+        self.send_downstream = send
+        self.start = None
+        self.encoder = None
+        self.passthrough = False
+
+    async def send(self, message):
+        if message['type'] == 'http.response.start':
+            self.start = message
+            return
+        if message['type'] != 'http.response.body' or self.passthrough:
+            await self.send_downstream(message)
+            return
+
+        if self.encoder is not None:
+            await self.send_chunk(message)
+            return
+
+        # First body message: everything needed to decide is known now.
+        headers = MutableHeaders(scope=self.start)
+        body = message.get('body', b'')
+        more_body = message.get('more_body', False)
+        size = len(body) if not more_body else headers.get('content-length')
+        if not self.is_compressible(headers) or (
+            size is not None and int(size) < self.middleware.minimum_size
+        ):
+            self.passthrough = True
+            await self.send_downstream(self.start)
+            await self.send_downstream(message)
+            return
+
+        etag = headers.get('etag')
+        self.set_encoding_headers(headers)
+        if more_body:
+            del headers['content-length']
+            self.encoder = self.middleware.encoders[self.encoding]()
+            await self.send_downstream(self.start)
+            await self.send_chunk(message)
+            return
+
+        compressed = self.compress_body(body, etag)
+        headers['content-length'] = str(len(compressed))
+        await self.send_downstream(self.start)
+        await self.send_downstream(
+            {'type': 'http.response.body', 'body': compressed}
+        )
+
+    async def send_chunk(self, message):
+        more_body = message.get('more_body', False)
+        chunk = self.encoder.compress(message.get('body', b''), more_body)
+        if not more_body:
+            chunk += self.encoder.finish()
+        await self.send_downstream(
+            {
+                'type': 'http.response.body',
+                'body': chunk,
+                'more_body': more_body,
+            }
+        )
+
+    def compress_body(self, body: bytes, etag: Optional[str]) -> bytes:
+        # A strong ETag names exactly these bytes, so popular posts are
+        # compressed once per version and coding instead of per request.
+        cacheable = (
+            self.start['status'] == 200
+            and etag is not None
+            and not etag.startswith('W/')
+        )
+        key = (self.path, etag, self.encoding)
+        if cacheable:
+            compressed = self.middleware.cache.get(key)
+            if compressed is not None:
+                return compressed
+
+        encoder = self.middleware.encoders[self.encoding]()
+        compressed = encoder.compress(body) + encoder.finish()
+        if cacheable:
+            self.middleware.cache.set(key, compressed, len(compressed))
+        return compressed
+
+    def is_compressible(self, headers: MutableHeaders) -> bool:
+        if self.start['status'] < 200 or self.start['status'] in (204, 304):
+            return False
+        if 'content-encoding' in headers:
+            return False
+        if 'no-transform' in headers.get('cache-control', ''):
+            return False
+        content_type = headers.get('content-type', '')
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    def set_encoding_headers(self, headers: MutableHeaders) -> None:
+        headers['content-encoding'] = self.encoding
+        headers.add_vary_header('Accept-Encoding')
+        # The encoded bytes differ from the identity ones, so the validator
+        # becomes weak; If-None-Match uses the weak comparison anyway.
+        etag = headers.get('etag')
+        if etag is not None and not etag.startswith('W/'):
+            headers['etag'] = f'W/{etag}'
@@ -1,16 +1,41 @@
-import httpx
+from typing import Optional
+
 import jwt
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
 
 from api.config.settings import settings
+from api.metrics.instruments import JWT_DURATION
+from api.security.jwks_cache import JWKSCache
+from api.security.token_cache import VerifiedTokenCache
+from infrastructure.metrics.timing import measure
 
 
 class JWTMiddleware:
-    def __init__(self, app: FastAPI):
+    def __init__(
+        self,
+        app: FastAPI,
+        jwks_cache: Optional[JWKSCache] = None,
+        token_cache: Optional[VerifiedTokenCache] = None,
+    ):
         self.app = app
+        self.jwks_cache = jwks_cache or JWKSCache(
+            settings.KEYCLOAK_JWK_URI,
+            default_ttl=settings.JWKS_CACHE_TTL,
+            refresh_margin=settings.JWKS_REFRESH_MARGIN,
+            min_refresh_interval=settings.JWKS_MIN_REFRESH_INTERVAL,
+            http_timeout=settings.JWKS_HTTP_TIMEOUT,
+        )
+        self.token_cache = token_cache or VerifiedTokenCache(
+            max_size=settings.TOKEN_CACHE_SIZE,
+            max_ttl=settings.TOKEN_CACHE_TTL,
+        )
 
     async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
         request = Request(scope, receive)
 
         if self.is_protected_route(request):
@@ -75,29 +100,15 @@ class JWTMiddleware:
             }
         )
 
-    async def get_jwk(self):
-        jwk_uri = settings.KEYCLOAK_JWK_URI
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(jwk_uri)
-                response.raise_for_status()
-                jwk_data = response.json()
-                return jwk_data['keys'][0]
-            except httpx.HTTPStatusError as e:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f'Error fetching JWK from Keycloak: {e}',
-                )
-            except httpx.RequestError as e:
-                raise HTTPException(
-                    status_code=500, detail=f'Request error: {e}'
-                )
-
-    def get_public_key(self, jwk):
-        return jwt.algorithms.RSAAlgorithm.from_jwk(jwk)
-
     async def decode_token(self, token: str):
-        jwk = await self.get_jwk()
-        public_key = self.get_public_key(jwk)
-        payload = jwt.decode(token, public_key, algorithms=['RS256'])
+        payload = self.token_cache.get(token)
+        if payload is not None:
+            return payload
+
+        with measure(JWT_DURATION, ('jwks',)):
+            kid = jwt.get_unverified_header(token).get('kid')
+            public_key = await self.jwks_cache.get_key(kid)
+        with measure(JWT_DURATION, ('decode',)):
+            payload = jwt.decode(token, public_key, algorithms=['RS256'])
+        self.token_cache.set(token, payload)
         return payload
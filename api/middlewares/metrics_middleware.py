@@ -0,0 +1,41 @@
+import time
+
+from fastapi import FastAPI
+
+from api.metrics.instruments import REQUEST_DURATION
+
+UNMATCHED_ROUTE = 'unmatched'
+
+
+class MetricsMiddleware:
+    def __init__(self, app: FastAPI):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the scope; labelling by
+            # its template rather than the path keeps the series bounded.
+            route = scope.get('route')
+            REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                (
+                    scope['method'],
+                    getattr(route, 'path', UNMATCHED_ROUTE),
+                    str(status),
+                ),
+            )
@@ -1,28 +1,137 @@
+import logging
+import math
 import time
+from typing import Dict, List, Optional, Tuple
 
-import redis
-from fastapi import HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import FastAPI
+from redis.exceptions import RedisError
 
-from api.database.redis import client_redis
+from api.config.settings import settings
+from api.metrics.instruments import RATE_LIMIT_DURATION
+from api.rate_limit.redis_limiter import RateLimitResult
+from api.rate_limit.rules import RateLimitRule, parse_rate, parse_route_limits
 
-r = client_redis
+logger = logging.getLogger('api_gateway')
 
+TOO_MANY_REQUESTS_BODY = b'{"detail":"Too many requests"}'
+TOO_MANY_REQUESTS_HEADERS = [
+    (b'content-type', b'application/json'),
+    (b'content-length', str(len(TOO_MANY_REQUESTS_BODY)).encode()),
+]
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request, call_next):
-        if request.url.path in ['/docs', '/openapi.json']:
-            return await call_next(request)
 
-        ip = request.client.host
-        current_time = int(time.time())
-        key = f'rate_limit:{ip}:{current_time // 60}'
+class RateLimitMiddleware:
+    def __init__(
+        self,
+        app: FastAPI,
+        default_limit: Optional[RateLimitRule] = None,
+        authenticated_limit: Optional[RateLimitRule] = None,
+        route_limits: Optional[Dict[str, RateLimitRule]] = None,
+    ):
+        self.app = app
+        self.default_limit = default_limit or parse_rate(
+            settings.RATE_LIMIT_DEFAULT
+        )
+        self.authenticated_limit = authenticated_limit or parse_rate(
+            settings.RATE_LIMIT_AUTHENTICATED
+        )
+        self.route_limits = sorted(
+            (
+                route_limits
+                if route_limits is not None
+                else parse_route_limits(settings.RATE_LIMIT_ROUTES)
+            ).items(),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+        self.exempt_routes = frozenset(settings.RATE_LIMIT_EXEMPT_ROUTES)
 
-        if r.get(key):
-            raise HTTPException(status_code=429, detail='Too many requests')
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'] in self.exempt_routes:
+            await self.app(scope, receive, send)
+            return
 
-        r.incr(key)
-        r.expire(key, 60)
+        route, rule = self.get_route_rule(scope)
+        principal = self.get_principal(scope)
+        if rule is None:
+            rule = (
+                self.authenticated_limit
+                if principal.startswith('user:')
+                else self.default_limit
+            )
 
-        response = await call_next(request)
-        return response
+        started = time.perf_counter()
+        try:
+            result = await scope['app'].state.rate_limiter.hit(
+                f'{route}:{principal}', rule
+            )
+        except RedisError as e:
+            RATE_LIMIT_DURATION.observe(
+                time.perf_counter() - started, ('error',)
+            )
+            logger.warning(f'Rate limiter unavailable, allowing request: {e}')
+            await self.app(scope, receive, send)
+            return
+
+        RATE_LIMIT_DURATION.observe(
+            time.perf_counter() - started,
+            ('allowed' if result.allowed else 'limited',),
+        )
+        headers = self.get_headers(rule, result)
+        if not result.allowed:
+            await self.send_too_many_requests(send, headers, result)
+            return
+
+        async def send_with_headers(message):
+            if message['type'] == 'http.response.start':
+                message['headers'] = list(message.get('headers', [])) + headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    def get_route_rule(self, scope) -> Tuple[str, Optional[RateLimitRule]]:
+        path = scope['path']
+        for route, rule in self.route_limits:
+            method, _, prefix = route.rpartition(' ')
+            if method and method.upper() != scope['method']:
+                continue
+            if path.startswith(prefix):
+                return route.replace(' ', ':'), rule
+        return '*', None
+
+    def get_principal(self, scope) -> str:
+        user = scope.get('state', {}).get('user')
+        if user and user.get('sub'):
+            return f'user:{user["sub"]}'
+        client = scope.get('client')
+        return f'ip:{client[0] if client else "unknown"}'
+
+    def get_headers(
+        self, rule: RateLimitRule, result: RateLimitResult
+    ) -> List[Tuple[bytes, bytes]]:
+        return [
+            (b'ratelimit-limit', str(result.limit).encode()),
+            (b'ratelimit-remaining', str(max(result.remaining, 0)).encode()),
+            (b'ratelimit-reset', str(math.ceil(result.reset_after)).encode()),
+            (b'ratelimit-policy', rule.policy.encode()),
+        ]
+
+    async def send_too_many_requests(
+        self, send, headers: List[Tuple[bytes, bytes]], result: RateLimitResult
+    ):
+        retry_after = str(math.ceil(result.retry_after)).encode()
+        await send(
+            {
+                'type': 'http.response.start',
+                'status': 429,
+                'headers': TOO_MANY_REQUESTS_HEADERS
+                + headers
+                + [(b'retry-after', retry_after)],
+            }
+        )
+        await send(
+            {
+                'type': 'http.response.body',
+                'body': TOO_MANY_REQUESTS_BODY,
+            }
+        )
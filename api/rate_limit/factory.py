@@ -0,0 +1,19 @@
+from redis import asyncio as redis
+
+from api.config.settings import settings
+
+from .local_limiter import TwoTierRateLimiter
+from .redis_limiter import RedisRateLimiter
+
+
+def get_rate_limiter(
+    client: redis.Redis,
+) -> RedisRateLimiter | TwoTierRateLimiter:
+    if settings.RATE_LIMIT_MODE == 'two_tier':
+        return TwoTierRateLimiter(
+            client,
+            max_keys=settings.RATE_LIMIT_LOCAL_MAX_KEYS,
+            sync_interval=settings.RATE_LIMIT_SYNC_INTERVAL,
+            max_overshoot=settings.RATE_LIMIT_MAX_OVERSHOOT,
+        )
+    return RedisRateLimiter(client, algorithm=settings.RATE_LIMIT_ALGORITHM)
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from redis import asyncio as redis
+from redis.exceptions import RedisError
+
+from .redis_limiter import RateLimitResult
+from .rules import RateLimitRule
+
+logger = logging.getLogger('api_gateway')
+
+
+class TokenBucket:
+    __slots__ = ('tokens', 'updated_at', 'rule')
+
+    def __init__(self, rule: RateLimitRule, now: float):
+        self.tokens = float(rule.limit)
+        self.updated_at = now
+        self.rule = rule
+
+    def refill(self, now: float) -> None:
+        rate = self.rule.limit / self.rule.period
+        self.tokens = min(
+            self.rule.limit, self.tokens + (now - self.updated_at) * rate
+        )
+        self.updated_at = now
+
+
+class TwoTierRateLimiter:
+    def __init__(
+        self,
+        client: Optional[redis.Redis],
+        max_keys: int = 10000,
+        sync_interval: float = 1.0,
+        max_overshoot: float = 0.1,
+        prefix: str = 'rate_limit',
+    ):
+        self._client = client
+        self._max_keys = max_keys
+        self._sync_interval = sync_interval
+        self._max_overshoot = max_overshoot
+        self._prefix = prefix
+
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+        self._pending: Dict[str, Tuple[int, int]] = {}
+        self._sync_task: Optional[asyncio.Task] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._redis_available = True
+
+    async def start(self) -> None:
+        if self._client is not None and self._sync_task is None:
+            self._sync_task = asyncio.create_task(self._sync_loop())
+
+    async def stop(self) -> None:
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            self._sync_task = None
+        await self.sync()
+
+    async def hit(
+        self, key: str, rule: RateLimitRule, cost: int = 1
+    ) -> RateLimitResult:
+        now = time.monotonic()
+        bucket = self._get_bucket(key, rule, now)
+        bucket.refill(now)
+
+        rate = rule.limit / rule.period
+        if bucket.tokens < cost:
+            return RateLimitResult(
+                allowed=False,
+                limit=rule.limit,
+                remaining=0,
+                retry_after=(cost - bucket.tokens) / rate,
+                reset_after=(rule.limit - bucket.tokens) / rate,
+            )
+
+        bucket.tokens -= cost
+        pending = self._pending.get(key, (0, rule.period))[0] + cost
+        self._pending[key] = (pending, rule.period)
+        if pending >= max(rule.limit * self._max_overshoot, 1):
+            self._schedule_flush()
+
+        return RateLimitResult(
+            allowed=True,
+            limit=rule.limit,
+            remaining=math.floor(bucket.tokens),
+            retry_after=0,
+            reset_after=(rule.limit - bucket.tokens) / rate,
+        )
+
+    async def sync(self) -> None:
+        if self._client is None or not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for key, (count, period) in pending.items():
+                    window = int(time.time() // period)
+                    redis_key = f'{self._prefix}:bucket:{key}:{window}'
+                    pipe.incrby(redis_key, count)
+                    pipe.expire(redis_key, period * 2)
+                results = await pipe.execute()
+        except RedisError as e:
+            if self._redis_available:
+                logger.warning(
+                    f'Rate limit sync failed, limiting locally only: {e}'
+                )
+            self._redis_available = False
+            return
+
+        self._redis_available = True
+        for key, global_count in zip(pending, results[::2]):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                remaining = max(bucket.rule.limit - int(global_count), 0)
+                bucket.tokens = min(bucket.tokens, remaining)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'keys': len(self._buckets),
+            'pending': sum(count for count, _ in self._pending.values()),
+            'redis_available': int(self._redis_available),
+        }
+
+    def _get_bucket(
+        self, key: str, rule: RateLimitRule, now: float
+    ) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None or bucket.rule != rule:
+            bucket = TokenBucket(rule, now)
+            self._buckets[key] = bucket
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self._max_keys:
+            self._buckets.popitem(last=False)
+        return bucket
+
+    def _schedule_flush(self) -> None:
+        if self._client is None or not self._redis_available:
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self.sync())
+
+    async def _sync_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._sync_interval)
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.warning(f'Unexpected rate limit sync error: {e}')
@@ -0,0 +1,56 @@
+from typing import NamedTuple
+
+from redis import asyncio as redis
+
+from .rules import RateLimitRule
+from .scripts import GCRA_SCRIPT, SLIDING_WINDOW_SCRIPT
+
+ALGORITHMS = {
+    'sliding_window': SLIDING_WINDOW_SCRIPT,
+    'gcra': GCRA_SCRIPT,
+}
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float
+    reset_after: float
+
+
+class RedisRateLimiter:
+    def __init__(
+        self,
+        client: redis.Redis,
+        algorithm: str = 'sliding_window',
+        prefix: str = 'rate_limit',
+    ):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f'Unknown rate limit algorithm: {algorithm}')
+
+        self._client = client
+        self._prefix = prefix
+        self._script = client.register_script(ALGORITHMS[algorithm])
+        self.algorithm = algorithm
+
+    async def start(self) -> None:
+        await self._client.script_load(self._script.script)
+
+    async def stop(self) -> None:
+        pass
+
+    async def hit(
+        self, key: str, rule: RateLimitRule, cost: int = 1
+    ) -> RateLimitResult:
+        allowed, remaining, retry_after, reset_after = await self._script(
+            keys=[f'{self._prefix}:{self.algorithm}:{key}'],
+            args=[rule.limit, rule.period * 1000, cost],
+        )
+        return RateLimitResult(
+            allowed=bool(allowed),
+            limit=rule.limit,
+            remaining=int(remaining),
+            retry_after=int(retry_after) / 1000,
+            reset_after=int(reset_after) / 1000,
+        )
@@ -0,0 +1,45 @@
+from typing import Dict, NamedTuple
+
+PERIODS = {
+    'second': 1,
+    'minute': 60,
+    'hour': 3600,
+    'day': 86400,
+}
+
+
+class RateLimitRule(NamedTuple):
+    limit: int
+    period: int
+
+    @property
+    def policy(self) -> str:
+        return f'{self.limit};w={self.period}'
+
+
+def parse_rate(value: str) -> RateLimitRule:
+    try:
+        limit, period = value.strip().split('/')
+        period = period.strip()
+        seconds = PERIODS.get(period.rstrip('s'))
+        rule = RateLimitRule(limit=int(limit), period=seconds or int(period))
+    except ValueError:
+        raise ValueError(
+            f'Invalid rate limit "{value}", expected e.g. "60/minute".'
+        )
+
+    if rule.limit <= 0 or rule.period <= 0:
+        raise ValueError(f'Rate limit "{value}" must be positive.')
+    return rule
+
+
+def parse_route_limits(value: str) -> Dict[str, RateLimitRule]:
+    routes = {}
+    for entry in filter(None, (item.strip() for item in value.split(','))):
+        route, _, rate = entry.rpartition('=')
+        if not route:
+            raise ValueError(
+                f'Invalid route limit "{entry}", expected "/path=10/minute".'
+            )
+        routes[route.strip()] = parse_rate(rate)
+    return routes
@@ -0,0 +1,62 @@
+# Both scripts take KEYS[1] = limiter key and
+# ARGV = limit, period (ms), cost, and return
+# {allowed, remaining, retry_after_ms, reset_after_ms}.
+# Time is read from the Redis server so every worker shares one clock.
+
+SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local limit = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+local window = math.floor(now / period)
+local elapsed = now - window * period
+local current = tonumber(redis.call('HGET', key, window) or '0')
+local previous = tonumber(redis.call('HGET', key, window - 1) or '0')
+local weight = (period - elapsed) / period
+local used = math.floor(previous * weight) + current
+
+if used + cost > limit then
+    local retry_after = period - elapsed
+    if current + cost <= limit and previous > 0 then
+        local allowed_weight = (limit - current - cost) / previous
+        retry_after = math.ceil(period - elapsed - allowed_weight * period)
+    end
+    return {0, math.max(limit - used, 0), retry_after, period - elapsed}
+end
+
+redis.call('HINCRBY', key, window, cost)
+redis.call('HDEL', key, window - 2)
+redis.call('PEXPIRE', key, period * 2)
+return {1, limit - used - cost, 0, period - elapsed}
+"""
+
+GCRA_SCRIPT = """
+local key = KEYS[1]
+local limit = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + tonumber(time[2]) / 1000
+
+local emission = period / limit
+local tat = tonumber(redis.call('GET', key) or now)
+if tat < now then
+    tat = now
+end
+
+local new_tat = tat + emission * cost
+local diff = now - (new_tat - period)
+
+if diff < 0 then
+    return {0, 0, math.ceil(-diff), math.ceil(tat - now)}
+end
+
+local ttl = math.ceil(new_tat - now)
+redis.call('SET', key, string.format('%.3f', new_tat), 'PX', ttl)
+return {1, math.floor(diff / emission), 0, ttl}
+"""
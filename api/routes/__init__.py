@@ -1,5 +1,12 @@
 from fastapi import FastAPI
 
+from api.config.settings import settings
+
+from .metrics_routes import router as metrics_router
+from .post_routes import router as post_router
+
 
 def init_routes(app: FastAPI) -> None:
-    pass
+    app.include_router(post_router)
+    if settings.METRICS_ENABLED:
+        app.include_router(metrics_router)
@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+
+
+def make_etag(id: str, version: int) -> str:
+    return f'"{id}.{version}"'
+
+
+def validator_headers(
+    etag: str, updated_at: Optional[datetime]
+) -> Dict[str, str]:
+    headers = {'ETag': etag}
+    if updated_at is not None:
+        headers['Last-Modified'] = format_datetime(
+            updated_at.astimezone(timezone.utc), usegmt=True
+        )
+    return headers
+
+
+def is_not_modified(
+    headers: Mapping[str, str], etag: str, updated_at: Optional[datetime]
+) -> bool:
+    # If-None-Match wins over If-Modified-Since and uses the weak
+    # comparison, so W/ prefixes added by proxies still match.
+    if_none_match = headers.get('if-none-match')
+    if if_none_match is not None:
+        tags = {
+            tag.strip().removeprefix('W/') for tag in if_none_match.split(',')
+        }
+        return '*' in tags or etag in tags
+
+    if_modified_since = headers.get('if-modified-since')
+    if if_modified_since is None or updated_at is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have whole seconds.
+    return updated_at.replace(microsecond=0) <= since
+
+
+def has_conditions(headers: Mapping[str, str]) -> bool:
+    return 'if-none-match' in headers or 'if-modified-since' in headers
@@ -0,0 +1,18 @@
+from fastapi import HTTPException, Request
+
+from application.services.post_service import PostService
+
+
+def get_post_service(request: Request) -> PostService:
+    service = request.app.state.post_service
+    if not service.has_repository:
+        raise HTTPException(
+            status_code=503,
+            detail='Posts are not available without a database.',
+        )
+    return service
+
+
+def get_search_service(request: Request) -> PostService:
+    # Search can be served by the in-process index alone.
+    return request.app.state.post_service
@@ -0,0 +1,18 @@
+import asyncio
+
+from fastapi import APIRouter, Request
+from fastapi.responses import Response
+
+from infrastructure.metrics.registry import CONTENT_TYPE, REGISTRY, render
+
+router = APIRouter(tags=['metrics'])
+
+
+@router.get('/metrics', include_in_schema=False)
+async def metrics(request: Request) -> Response:
+    snapshot = REGISTRY.collect()
+    store = getattr(request.app.state, 'metrics_store', None)
+    if store is not None:
+        # Totals across every worker; file I/O stays off the event loop.
+        snapshot = await asyncio.to_thread(store.collect, snapshot)
+    return Response(render(snapshot), media_type=CONTENT_TYPE)
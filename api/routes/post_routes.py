@@ -0,0 +1,79 @@
+from datetime import datetime
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+
+from application.dtos.post_dto import PostDTO
+from application.dtos.post_search_page_dto import PostSearchPageDTO
+from application.dtos.post_search_query_dto import PostSearchQueryDTO
+from application.services.post_service import PostService
+
+from .conditional import (
+    has_conditions,
+    is_not_modified,
+    make_etag,
+    validator_headers,
+)
+from .dependencies import get_post_service, get_search_service
+from .streaming import accepts_gzip, dump_json, gzip_chunks, ndjson_chunks
+
+router = APIRouter(prefix='/api/v1/posts', tags=['posts'])
+
+
+@router.get('/export')
+async def export_posts(
+    request: Request,
+    since: Optional[datetime] = None,
+    service: PostService = Depends(get_post_service),
+) -> StreamingResponse:
+    body = ndjson_chunks(service.stream(since))
+    headers = {'Vary': 'Accept-Encoding'}
+    if accepts_gzip(request.headers.get('accept-encoding', '')):
+        body = gzip_chunks(body)
+        headers['Content-Encoding'] = 'gzip'
+    return StreamingResponse(
+        body, media_type='application/x-ndjson', headers=headers
+    )
+
+
+@router.get('/search', response_model=PostSearchPageDTO)
+async def search_posts(
+    query: Annotated[PostSearchQueryDTO, Query()],
+    service: PostService = Depends(get_search_service),
+) -> PostSearchPageDTO:
+    try:
+        return await service.search(query)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get('/{id}', response_model=PostDTO)
+async def get_post(
+    id: str,
+    request: Request,
+    service: PostService = Depends(get_post_service),
+) -> Response:
+    # Revalidation only needs the version: it is answered from the local
+    # cache or a primary key lookup that never reads the body.
+    if has_conditions(request.headers):
+        current = await service.get_version(id)
+        if current is None:
+            raise HTTPException(status_code=404, detail='Post not found.')
+        version, updated_at = current
+        etag = make_etag(id, version)
+        if is_not_modified(request.headers, etag, updated_at):
+            return Response(
+                status_code=304, headers=validator_headers(etag, updated_at)
+            )
+
+    post = await service.get(id)
+    if post is None:
+        raise HTTPException(status_code=404, detail='Post not found.')
+    return Response(
+        dump_json(post),
+        media_type='application/json',
+        headers=validator_headers(
+            make_etag(id, post.version), post.updated_at
+        ),
+    )
@@ -0,0 +1,61 @@
+import zlib
+from typing import AsyncIterable, AsyncIterator, Dict
+
+from pydantic import BaseModel
+
+NDJSON_CHUNK_SIZE = 64 * 1024
+
+
+def dump_json(item: BaseModel) -> bytes:
+    # Serialises straight to bytes, skipping model_dump_json's str round trip.
+    return item.__pydantic_serializer__.to_json(item)
+
+
+async def ndjson_chunks(
+    items: AsyncIterable[BaseModel], chunk_size: int = NDJSON_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    # Lines are grouped into chunks so each ASGI send carries many rows.
+    buffer = bytearray()
+    async for item in items:
+        buffer += dump_json(item)
+        buffer += b'\n'
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+async def gzip_chunks(
+    chunks: AsyncIterable[bytes], level: int = 6
+) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    qualities = {}
+    for coding in header.split(','):
+        name, *params = coding.split(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name] = quality
+    return qualities
+
+
+def accepts_gzip(header: str) -> bool:
+    qualities = parse_accept_encoding(header)
+    return qualities.get('gzip', qualities.get('*', 0.0)) > 0
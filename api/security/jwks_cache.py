@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import re
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+import jwt
+from fastapi import HTTPException
+
+logger = logging.getLogger('api_gateway')
+
+MAX_AGE_PATTERN = re.compile(r'max-age=(\d+)')
+
+
+class JWKSCache:
+    def __init__(
+        self,
+        jwk_uri: str,
+        default_ttl: int = 300,
+        refresh_margin: int = 30,
+        min_refresh_interval: int = 10,
+        http_timeout: float = 5.0,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
+        self._jwk_uri = jwk_uri
+        self._default_ttl = default_ttl
+        self._refresh_margin = refresh_margin
+        self._min_refresh_interval = min_refresh_interval
+        self._http_timeout = http_timeout
+        self._client = http_client
+
+        self._keys: Dict[str, Any] = {}
+        self._default_kid: Optional[str] = None
+        self._expires_at = 0.0
+        self._fetched_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def keys(self) -> Dict[str, Any]:
+        return dict(self._keys)
+
+    def is_expired(self) -> bool:
+        return time.monotonic() >= self._expires_at
+
+    def needs_refresh(self) -> bool:
+        return time.monotonic() >= self._expires_at - self._refresh_margin
+
+    async def get_key(self, kid: Optional[str] = None):
+        if not self._keys:
+            await self.refresh()
+        elif self.needs_refresh() and self._can_refetch():
+            self.refresh_in_background()
+
+        key = self._lookup(kid)
+        if key is None and self._can_refetch():
+            await self.refresh()
+            key = self._lookup(kid)
+
+        if key is None:
+            if not self._keys:
+                raise HTTPException(
+                    status_code=500,
+                    detail='No signing keys available from Keycloak',
+                )
+            raise jwt.InvalidTokenError(f'Unknown signing key: {kid}')
+        return key
+
+    async def refresh(self) -> None:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._fetch())
+        await asyncio.shield(self._refresh_task)
+
+    def refresh_in_background(self) -> None:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._fetch())
+
+    async def close(self) -> None:
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _lookup(self, kid: Optional[str]):
+        if kid is None:
+            kid = self._default_kid
+        return self._keys.get(kid) if kid is not None else None
+
+    def _can_refetch(self) -> bool:
+        if self._fetched_at is None:
+            return True
+        elapsed = time.monotonic() - self._fetched_at
+        return elapsed >= self._min_refresh_interval
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self._http_timeout)
+        return self._client
+
+    async def _fetch(self) -> None:
+        self._fetched_at = time.monotonic()
+        try:
+            response = await self._get_client().get(self._jwk_uri)
+            response.raise_for_status()
+            keys = self._parse_keys(response.json())
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            if not self._keys:
+                raise HTTPException(
+                    status_code=500,
+                    detail=f'Error fetching JWK from Keycloak: {e}',
+                )
+            logger.warning(f'JWKS refresh failed, serving stale keys: {e}')
+            self._expires_at = time.monotonic() + self._min_refresh_interval
+            return
+
+        self._keys = keys
+        self._default_kid = next(iter(keys), None)
+        self._expires_at = time.monotonic() + self._get_ttl(response)
+
+    def _parse_keys(self, jwk_data: dict) -> Dict[str, Any]:
+        keys = {}
+        for index, jwk in enumerate(jwk_data['keys']):
+            if jwk.get('kty') != 'RSA' or jwk.get('use', 'sig') != 'sig':
+                continue
+            kid = jwk.get('kid', str(index))
+            keys[kid] = jwt.algorithms.RSAAlgorithm.from_jwk(jwk)
+        if not keys:
+            raise ValueError('JWKS response contains no RSA signing keys')
+        return keys
+
+    def _get_ttl(self, response: httpx.Response) -> int:
+        cache_control = response.headers.get('cache-control', '')
+        if 'no-store' in cache_control or 'no-cache' in cache_control:
+            return self._refresh_margin
+        match = MAX_AGE_PATTERN.search(cache_control)
+        if match:
+            return max(int(match.group(1)), self._refresh_margin)
+        return self._default_ttl
@@ -0,0 +1,66 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class VerifiedTokenCache:
+    def __init__(self, max_size: int = 10000, max_ttl: int = 300):
+        self._max_size = max_size
+        self._max_ttl = max_ttl
+        self._entries: OrderedDict[
+            bytes, Tuple[float, Dict[str, Any]]
+        ] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_size > 0 and self._max_ttl > 0
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        digest = self._digest(token)
+        entry = self._entries.get(digest)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, payload = entry
+        if time.time() >= expires_at:
+            del self._entries[digest]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return payload
+
+    def set(self, token: str, payload: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+
+        expires_at = time.time() + self._max_ttl
+        if 'exp' in payload:
+            expires_at = min(expires_at, float(payload['exp']))
+
+        digest = self._digest(token)
+        self._entries[digest] = (expires_at, payload)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _digest(self, token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
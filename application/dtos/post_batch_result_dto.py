@@ -0,0 +1,9 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class PostBatchResultDTO(BaseModel):
+    id: Optional[str] = None
+    success: bool
+    error: Optional[str] = None
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
@@ -16,3 +17,9 @@ class PostDTO(BaseModel):
     author_id: Optional[UUID] = None
     status: Optional[bool] = False
     thumbnail: Optional[HttpUrl] = None
+    excerpt: Optional[str] = None
+    word_count: Optional[int] = None
+    reading_time: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    version: Optional[int] = None
@@ -0,0 +1,15 @@
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+MAX_PAGE_SIZE = 100
+
+
+class PostListQueryDTO(BaseModel):
+    limit: int = Field(default=20, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
+    status: Optional[bool] = None
+    author_id: Optional[UUID] = None
+    summary: bool = False
+    include_author: bool = True
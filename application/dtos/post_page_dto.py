@@ -0,0 +1,10 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from .post_dto import PostDTO
+
+
+class PostPageDTO(BaseModel):
+    items: List[PostDTO]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,11 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from .post_dto import PostDTO
+
+
+class PostSearchHitDTO(BaseModel):
+    post: PostDTO
+    rank: float
+    snippet: Optional[str] = None
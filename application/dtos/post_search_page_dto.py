@@ -0,0 +1,10 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from .post_search_hit_dto import PostSearchHitDTO
+
+
+class PostSearchPageDTO(BaseModel):
+    items: List[PostSearchHitDTO]
+    next_cursor: Optional[str] = None
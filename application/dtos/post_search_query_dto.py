@@ -0,0 +1,13 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from .post_list_query_dto import MAX_PAGE_SIZE
+
+
+class PostSearchQueryDTO(BaseModel):
+    q: str = Field(min_length=1, max_length=200)
+    limit: int = Field(default=20, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
+    status: Optional[bool] = None
+    include_author: bool = True
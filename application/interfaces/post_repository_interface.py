@@ -0,0 +1,65 @@
+from abc import abstractmethod
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
+
+from application.dtos.post_list_query_dto import PostListQueryDTO
+from application.dtos.post_search_query_dto import PostSearchQueryDTO
+
+from .async_base_repository_interface import AsyncBaseRepositoryInterface
+from .database_model import DatabaseModel
+
+
+class PostRepositoryInterface(AsyncBaseRepositoryInterface):
+    @abstractmethod
+    async def view_by_slug(self, slug: str) -> Optional[DatabaseModel]:
+        """Retrieve an entry by its unique slug."""
+        pass
+
+    @abstractmethod
+    async def view_version(self, id: str) -> Optional[Tuple[int, datetime]]:
+        """Return the version and modification time of an entry."""
+        pass
+
+    @abstractmethod
+    async def list_page(
+        self, query: PostListQueryDTO
+    ) -> Tuple[List[DatabaseModel], Optional[str]]:
+        """List one page of entries and the cursor for the next page."""
+        pass
+
+    @abstractmethod
+    async def search(
+        self, query: PostSearchQueryDTO
+    ) -> Tuple[
+        List[Tuple[DatabaseModel, float, Optional[str]]], Optional[str]
+    ]:
+        """Rank entries matching a text query, with a highlighted snippet."""
+        pass
+
+    @abstractmethod
+    def stream(
+        self, since: Optional[datetime] = None
+    ) -> AsyncIterator[DatabaseModel]:
+        """Iterate over all entries changed since a moment, oldest first."""
+        pass
+
+    @abstractmethod
+    async def update(self, id: str, data: DatabaseModel) -> Optional[int]:
+        """Update an entry by its ID and return its new version, or None
+        when there is no such entry."""
+        pass
+
+    @abstractmethod
+    async def create_many(self, data: List[DatabaseModel]) -> List[str]:
+        """Create entries in bulk and return the ids actually inserted."""
+        pass
+
+    @abstractmethod
+    async def update_many(self, data: List[DatabaseModel]) -> List[str]:
+        """Update entries by their IDs and return the ids that existed."""
+        pass
+
+    @abstractmethod
+    async def delete_many(self, ids: List[str]) -> List[str]:
+        """Delete entries by their IDs and return the ids that existed."""
+        pass
@@ -0,0 +1,40 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+
+
+class SearchIndexInterface(ABC):
+    # When the index last caught up with the repository, as a timestamp.
+    synced_at: Optional[float] = None
+
+    @abstractmethod
+    def add(
+        self,
+        id: str,
+        title: Optional[str],
+        description: Optional[str],
+        body: Optional[str],
+        document: Optional[bytes] = None,
+    ) -> None:
+        """Index an entry, replacing any previous version of it, and keep
+        `document` to serve it from."""
+        pass
+
+    @abstractmethod
+    def remove(self, id: str) -> None:
+        """Remove an entry from the index."""
+        pass
+
+    @abstractmethod
+    def search(
+        self,
+        query: str,
+        limit: int,
+        after: Optional[Tuple[float, str]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Return the best (id, score) pairs ranked below `after`."""
+        pass
+
+    @abstractmethod
+    def document(self, id: str) -> Optional[bytes]:
+        """Return the document stored with an entry, if any."""
+        pass
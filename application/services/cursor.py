@@ -0,0 +1,39 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Tuple
+
+
+def _encode(values: List[Any]) -> str:
+    raw = json.dumps(values, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def _decode(cursor: str) -> List[Any]:
+    raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+    return json.loads(raw)
+
+
+def encode_cursor(created_at: datetime, id: str) -> str:
+    return _encode([created_at.isoformat(), str(id)])
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        created_at, id = _decode(cursor)
+        return datetime.fromisoformat(created_at), str(id)
+    except (binascii.Error, TypeError, ValueError):
+        raise ValueError('Invalid cursor.')
+
+
+def encode_search_cursor(rank: float, id: str) -> str:
+    return _encode([rank, str(id)])
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        rank, id = _decode(cursor)
+        return float(rank), str(id)
+    except (binascii.Error, TypeError, ValueError):
+        raise ValueError('Invalid cursor.')
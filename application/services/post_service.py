@@ -0,0 +1,398 @@
+import time
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+from uuid import NAMESPACE_URL, uuid5
+
+from application.dtos.author_dto import AuthorDTO
+from application.dtos.post_batch_result_dto import PostBatchResultDTO
+from application.dtos.post_dto import PostDTO
+from application.dtos.post_list_query_dto import PostListQueryDTO
+from application.dtos.post_page_dto import PostPageDTO
+from application.dtos.post_search_hit_dto import PostSearchHitDTO
+from application.dtos.post_search_page_dto import PostSearchPageDTO
+from application.dtos.post_search_query_dto import PostSearchQueryDTO
+from application.interfaces.post_repository_interface import (
+    PostRepositoryInterface,
+)
+from application.interfaces.search_index_interface import SearchIndexInterface
+from application.services.cursor import (
+    decode_search_cursor,
+    encode_search_cursor,
+)
+from domain.src.post_entity import PostEntity
+from infrastructure.models.author_model import AuthorModel
+from infrastructure.models.post_model import PostModel
+
+AUTHOR_NAMESPACE = uuid5(NAMESPACE_URL, 'urn:blog:authors')
+AUTHOR_FIELDS = tuple(AuthorDTO.model_fields)
+POST_FIELDS = tuple(name for name in PostDTO.model_fields if name != 'author')
+
+
+def author_id_from_name(firstname: str, lastname: str) -> str:
+    # Authors sent without an id get one derived from their name, matched
+    # like the importer's AuthorIndex does. The same author then maps to
+    # one row across a batch and later updates, and the inserts, which
+    # skip existing ids, do not duplicate it.
+    key = f'{firstname.strip().casefold()}\0{lastname.strip().casefold()}'
+    return str(uuid5(AUTHOR_NAMESPACE, key))
+
+
+def post_fields(model: PostModel) -> Dict[str, Any]:
+    # Reads the instance dicts directly: attribute access on table models
+    # goes through SQLAlchemy instrumentation and costs more per row than
+    # validating the values does.
+    values = vars(model)
+    fields = {name: values.get(name) for name in POST_FIELDS}
+    author = values.get('author')
+    if author is not None:
+        author_values = vars(author)
+        fields['author'] = {
+            name: author_values.get(name) for name in AUTHOR_FIELDS
+        }
+        fields['author_id'] = author_values.get('id')
+    return fields
+
+
+class PostService:
+    """Stateless post operations; one instance can serve every request."""
+
+    def __init__(
+        self,
+        repository: Optional[PostRepositoryInterface],
+        search_index: Optional[SearchIndexInterface] = None,
+    ):
+        # Without a repository only search works, served from the index.
+        self._repository = repository
+        self._search_index = search_index
+
+    @property
+    def has_repository(self) -> bool:
+        return self._repository is not None
+
+    async def create(self, data: PostDTO) -> PostDTO:
+        model = self.build_new_post_model(data)
+        await self._repository.create(model)
+        self._index(model)
+        return self.convert_model_to_dto(model)
+
+    async def get(self, id: str) -> Optional[PostDTO]:
+        model = await self._repository.view(id)
+        return self.convert_model_to_dto(model) if model else None
+
+    async def get_version(self, id: str) -> Optional[Tuple[int, datetime]]:
+        return await self._repository.view_version(id)
+
+    async def get_by_slug(self, slug: str) -> Optional[PostDTO]:
+        model = await self._repository.view_by_slug(slug)
+        return self.convert_model_to_dto(model) if model else None
+
+    async def list(self) -> List[PostDTO]:
+        models = await self._repository.list()
+        return [self.convert_model_to_dto(model) for model in models]
+
+    async def list_page(self, query: PostListQueryDTO) -> PostPageDTO:
+        models, next_cursor = await self._repository.list_page(query)
+        return PostPageDTO(
+            items=[self.convert_model_to_dto(model) for model in models],
+            next_cursor=next_cursor,
+        )
+
+    async def search(self, query: PostSearchQueryDTO) -> PostSearchPageDTO:
+        if self._search_index is not None:
+            return await self._search_in_index(query)
+
+        hits, next_cursor = await self._repository.search(query)
+        return PostSearchPageDTO(
+            items=[
+                PostSearchHitDTO(
+                    post=self.convert_model_to_dto(model),
+                    rank=rank,
+                    snippet=snippet,
+                )
+                for model, rank, snippet in hits
+            ],
+            next_cursor=next_cursor,
+        )
+
+    async def update(self, id: str, data: PostDTO) -> Optional[PostDTO]:
+        model = self.build_post_model(data, id=id)
+        version = await self._repository.update(model.id, model)
+        if version is None:
+            return None
+        model.version = version
+        self._index(model)
+        return self.convert_model_to_dto(model)
+
+    async def delete(self, id: str) -> None:
+        await self._repository.delete(id)
+        self._unindex(id)
+
+    async def stream(
+        self, since: Optional[datetime] = None
+    ) -> AsyncIterator[PostDTO]:
+        async for model in self._repository.stream(since):
+            yield self.convert_model_to_dto(model)
+
+    async def sync_search_index(self) -> None:
+        """Indexes the posts written since the index last caught up.
+
+        Posts deleted in the meantime stay indexed until they are written
+        to again through this service.
+        """
+        index = self._search_index
+        started = time.time()
+        since = None
+        if index.synced_at is not None:
+            since = datetime.fromtimestamp(index.synced_at, timezone.utc)
+        async for model in self._repository.stream(since):
+            self._index(model)
+        # Posts written by other workers are only picked up here, so the
+        # snapshot records this rather than the time it was saved.
+        index.synced_at = started
+
+    async def create_many(
+        self, data: List[PostDTO]
+    ) -> List[PostBatchResultDTO]:
+        return await self._run_batch(
+            data,
+            self.build_new_post_model,
+            self._repository.create_many,
+            'Post already exists.',
+        )
+
+    async def update_many(
+        self, data: List[PostDTO]
+    ) -> List[PostBatchResultDTO]:
+        return await self._run_batch(
+            data,
+            self.build_post_model,
+            self._repository.update_many,
+            'Post not found.',
+        )
+
+    async def delete_many(self, ids: List[str]) -> List[PostBatchResultDTO]:
+        ids = [str(id) for id in ids]
+        deleted = set(await self._repository.delete_many(ids))
+        for id in deleted:
+            self._unindex(id)
+        return [
+            PostBatchResultDTO(id=id, success=True)
+            if id in deleted
+            else PostBatchResultDTO(
+                id=id, success=False, error='Post not found.'
+            )
+            for id in ids
+        ]
+
+    async def _run_batch(
+        self,
+        data: List[PostDTO],
+        build: Callable[[PostDTO], PostModel],
+        persist: Callable[[List[PostModel]], Awaitable[List[str]]],
+        missing_error: str,
+    ) -> List[PostBatchResultDTO]:
+        results: List[PostBatchResultDTO] = []
+        models: List[PostModel] = []
+        seen = set()
+        for item in data:
+            try:
+                model = build(item)
+            except ValueError as e:
+                results.append(PostBatchResultDTO(success=False, error=str(e)))
+                continue
+            if model.id in seen:
+                results.append(
+                    PostBatchResultDTO(
+                        id=model.id, success=False, error='Duplicate id.'
+                    )
+                )
+                continue
+            seen.add(model.id)
+            models.append(model)
+            results.append(PostBatchResultDTO(id=model.id, success=True))
+
+        persisted = set(await persist(models)) if models else set()
+        for model in models:
+            if model.id in persisted:
+                self._index(model)
+        for result in results:
+            if result.success and result.id not in persisted:
+                result.success = False
+                result.error = missing_error
+        return results
+
+    async def _search_in_index(
+        self, query: PostSearchQueryDTO
+    ) -> PostSearchPageDTO:
+        after = decode_search_cursor(query.cursor) if query.cursor else None
+        hits = self._search_index.search(query.q, query.limit + 1, after)
+        page = hits[: query.limit]
+
+        # Hits are served from the documents stored with them. The status
+        # filter is applied here, so a page can hold fewer than `limit`.
+        items = []
+        for id, rank in page:
+            document = self._search_index.document(id)
+            if document is None:
+                continue
+            post = PostDTO.model_validate_json(document)
+            if query.status is not None and post.status != query.status:
+                continue
+            if not query.include_author:
+                post.author = None
+            items.append(PostSearchHitDTO(post=post, rank=rank))
+        next_cursor = None
+        if len(hits) > query.limit:
+            id, rank = page[-1]
+            next_cursor = encode_search_cursor(rank, id)
+        return PostSearchPageDTO(items=items, next_cursor=next_cursor)
+
+    def _index(self, post: PostModel | PostEntity) -> None:
+        if self._search_index is not None:
+            self._search_index.add(
+                str(post.id),
+                post.title,
+                post.description,
+                post.body,
+                self._search_document(post),
+            )
+
+    def _search_document(self, post: PostModel | PostEntity) -> bytes:
+        # The summary a search hit returns, as the SQL search does: no body.
+        if isinstance(post, PostEntity):
+            post = self.convert_entity_to_model(post)
+        document = self.convert_model_to_dto(post)
+        # Writes do not carry the timestamps the database sets; the
+        # creation time is kept from the previous version of the post.
+        if document.created_at is None:
+            previous = self._search_index.document(str(post.id))
+            if previous is not None:
+                document.created_at = PostDTO.model_validate_json(
+                    previous
+                ).created_at
+        now = datetime.now(timezone.utc)
+        document.created_at = document.created_at or now
+        document.updated_at = document.updated_at or now
+        return document.model_dump_json(exclude={'body'}).encode()
+
+    def _unindex(self, id: str) -> None:
+        if self._search_index is not None:
+            self._search_index.remove(str(id))
+
+    def build_new_post_model(self, data: PostDTO) -> PostModel:
+        entity = PostEntity(
+            id=str(data.id) if data.id else None,
+            title=data.title,
+            status=bool(data.status),
+            thumbnail=str(data.thumbnail) if data.thumbnail else None,
+        )
+        entity.create_a_new_post(description=data.description, body=data.body)
+        model = self.convert_entity_to_model(entity)
+        model.slug = data.slug or model.slug
+        model.author = self._author_model(data.author)
+        if model.author is None and data.author_id:
+            model.author_id = str(data.author_id)
+        model.created_at = data.created_at
+        return model
+
+    def build_post_model(
+        self, data: PostDTO, id: Optional[str] = None
+    ) -> PostModel:
+        id = id or data.id
+        if not id:
+            raise ValueError('Id is required.')
+        entity = PostEntity(id=str(id))
+        entity.set_post_data(
+            title=data.title,
+            description=data.description,
+            body=data.body,
+            slug=data.slug,
+            author=data.author,
+            status=bool(data.status),
+            thumbnail=str(data.thumbnail) if data.thumbnail else None,
+        )
+        model = self.convert_entity_to_model(entity)
+        model.author = self._author_model(data.author)
+        # A slug or author left out keeps the stored one; the repository
+        # fills them in on the model after the update.
+        if model.author is None and data.author_id:
+            model.author_id = str(data.author_id)
+        return model
+
+    def _author_model(
+        self, author: Optional[AuthorDTO]
+    ) -> Optional[AuthorModel]:
+        if author is None:
+            return None
+        return AuthorModel(
+            id=(
+                str(author.id)
+                if author.id
+                else author_id_from_name(author.firstname, author.lastname)
+            ),
+            firstname=author.firstname,
+            lastname=author.lastname,
+            description=author.description,
+            resume=author.resume,
+        )
+
+    def convert_model_to_dto(self, model: PostModel) -> PostDTO:
+        return PostDTO.model_validate(post_fields(model))
+
+    def convert_entity_to_model(self, entity: PostEntity) -> PostModel:
+        author_entity = None
+        if entity.author:
+            author_entity = AuthorModel(
+                id=entity.author.id,
+                firstname=entity.author.firstname,
+                lastname=entity.author.lastname,
+                description=entity.author.description,
+                resume=entity.author.resume,
+            )
+
+        return PostModel(
+            id=entity.id,
+            title=entity.title,
+            description=entity.description,
+            body=entity.body,
+            slug=entity.slug,
+            status=entity.status,
+            thumbnail=entity.thumbnail,
+            excerpt=entity.excerpt,
+            word_count=entity.word_count,
+            reading_time=entity.reading_time,
+            author=author_entity,
+        )
+
+    def convert_dto_to_model(self, post_dto: PostDTO) -> PostModel:
+        author_entity = None
+        if post_dto.author:
+            author_entity = AuthorModel(
+                id=post_dto.author.id,
+                firstname=post_dto.author.firstname,
+                lastname=post_dto.author.lastname,
+                description=post_dto.author.description,
+                resume=post_dto.author.resume,
+            )
+        return PostModel(
+            id=post_dto.id,
+            title=post_dto.title,
+            description=post_dto.description,
+            body=post_dto.body,
+            slug=post_dto.slug,
+            status=post_dto.status,
+            thumbnail=post_dto.thumbnail,
+            excerpt=post_dto.excerpt,
+            word_count=post_dto.word_count or 0,
+            reading_time=post_dto.reading_time or 0,
+            author=author_entity,
+        )
@@ -1,22 +1,37 @@
 from typing import Optional
-from uuid import UUID, uuid4
 
 from application.dtos.author_dto import AuthorDTO
 from application.dtos.post_dto import PostDTO
+from application.dtos.post_list_query_dto import PostListQueryDTO
+from application.dtos.post_page_dto import PostPageDTO
+from application.interfaces.async_base_repository_interface import (
+    AsyncBaseRepositoryInterface,
+)
 from application.interfaces.base_repository_interface import (
     BaseRepositoryInterface,
 )
+from application.interfaces.search_index_interface import SearchIndexInterface
 from domain.src.post_entity import PostEntity
-from infrastructure.models.author_model import AuthorModel
 from infrastructure.models.post_model import PostModel
 
+from .post_service import PostService
+
 
-class PostServices:
-    def __init__(self, repository: BaseRepositoryInterface):
-        self._repository = repository
+class PostServices(PostService):
+    """Builder kept for compatibility; it holds per-call state, so use a
+    shared PostService for concurrent requests instead."""
+
+    def __init__(
+        self,
+        repository: BaseRepositoryInterface | AsyncBaseRepositoryInterface,
+        search_index: Optional[SearchIndexInterface] = None,
+    ):
+        super().__init__(repository, search_index)
         self._post_entity: Optional[PostEntity] = None
         self._action: Optional[str] = None
         self._post_model: Optional[PostModel] = None
+        self._list_query: Optional[PostListQueryDTO] = None
+        self._slug: Optional[str] = None
 
     def init_new_post(self, data: PostDTO) -> 'PostServices':
         self._post_entity = PostEntity(**data.model_dump())
@@ -65,10 +80,20 @@ class PostServices:
         self._action = 'view'
         return self
 
+    def view_a_post_by_slug(self, slug: str) -> 'PostServices':
+        self._slug = slug
+        self._action = 'view_by_slug'
+        return self
+
     def list_all_posts(self) -> 'PostServices':
         self._action = 'list'
         return self
 
+    def list_posts(self, query: PostListQueryDTO) -> 'PostServices':
+        self._list_query = query
+        self._action = 'list_page'
+        return self
+
     def execute(self) -> Optional[PostDTO] | Optional[list[PostDTO]] | None:
         if not self._action:
             raise ValueError('No action specified.')
@@ -78,14 +103,17 @@ class PostServices:
         match self._action:
             case 'create':
                 self._repository.create(self._post_model)
+                self._index(self._post_entity)
                 return self._post_model
 
             case 'update':
                 self._repository.update(self._post_entity.id, self._post_model)
+                self._index(self._post_entity)
                 return self._post_model
 
             case 'delete':
                 self._repository.delete(self._post_entity.id)
+                self._unindex(self._post_entity.id)
                 return None
 
             case 'view':
@@ -99,70 +127,46 @@ class PostServices:
             case _:
                 raise ValueError(f'Unknown action: {self._action}')
 
-    def convert_model_to_dto(self, model: PostModel) -> PostDTO:
-        author_dto = (
-            AuthorDTO(
-                id=str(model.author.id),
-                firstname=str(model.author.firstname),
-                lastname=str(model.author.lastname),
-                description=str(model.author.description),
-                resume=str(model.author.resume),
-            )
-            if model.author
-            else None
-        )
+    async def execute_async(
+        self,
+    ) -> Optional[PostDTO] | Optional[list[PostDTO]] | PostPageDTO | None:
+        if not self._action:
+            raise ValueError('No action specified.')
 
-        return PostDTO(
-            id=str(model.id),
-            title=str(model.title),
-            description=str(model.description),
-            body=str(model.body),
-            slug=str(model.slug),
-            author=author_dto,
-            author_id=str(model.author.id) if model.author else None,
-            status=bool(model.status),
-            thumbnail=str(model.thumbnail),
-        )
+        if self._post_entity:
+            self._post_model = self.convert_entity_to_model(self._post_entity)
 
-    def convert_entity_to_model(self, entity: PostEntity) -> PostModel:
-        author_entity = None
-        if entity.author:
-            author_entity = AuthorModel(
-                id=entity.author.id,
-                firstname=entity.author.firstname,
-                lastname=entity.author.lastname,
-                description=entity.author.description,
-                resume=entity.author.resume,
-            )
-
-        return PostModel(
-            id=entity.id,
-            title=entity.title,
-            description=entity.description,
-            body=entity.body,
-            slug=entity.slug,
-            status=entity.status,
-            thumbnail=entity.thumbnail,
-            author=author_entity,
-        )
+        match self._action:
+            case 'create':
+                await self._repository.create(self._post_model)
+                self._index(self._post_entity)
+                return self._post_model
 
-    def convert_dto_to_model(self, post_dto: PostDTO) -> PostModel:
-        author_entity = None
-        if post_dto.author:
-            author_entity = AuthorModel(
-                id=post_dto.author.id,
-                firstname=post_dto.author.firstname,
-                lastname=post_dto.author.lastname,
-                description=post_dto.author.description,
-                resume=post_dto.author.resume,
-            )
-        return PostModel(
-            id=post_dto.id,
-            title=post_dto.title,
-            description=post_dto.description,
-            body=post_dto.body,
-            slug=post_dto.slug,
-            status=post_dto.status,
-            thumbnail=post_dto.thumbnail,
-            author=author_entity,
-        )
+            case 'update':
+                version = await self._repository.update(
+                    self._post_entity.id, self._post_model
+                )
+                if version is None:
+                    return None
+                self._post_model.version = version
+                self._index(self._post_entity)
+                return self._post_model
+
+            case 'delete':
+                await self.delete(self._post_entity.id)
+                return None
+
+            case 'view':
+                return await self.get(self._post_entity.id)
+
+            case 'view_by_slug':
+                return await self.get_by_slug(self._slug)
+
+            case 'list':
+                return await self.list()
+
+            case 'list_page':
+                return await self.list_page(self._list_query)
+
+            case _:
+                raise ValueError(f'Unknown action: {self._action}')
@@ -0,0 +1,125 @@
+"""Event-loop time spent per log call, direct handlers against the queue.
+
+Writes to a temporary directory and discards console output:
+python -m benchmarks.logging_pipeline --calls 20000
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+from logging.handlers import QueueListener
+from queue import SimpleQueue
+from typing import List
+
+from pythonjsonlogger import jsonlogger
+
+from api.config.logger_config import (
+    FastJsonFormatter,
+    LocalQueueHandler,
+    build_handlers,
+)
+
+APP_NAME = 'bench'
+
+
+def previous_json_formatter() -> logging.Formatter:
+    return jsonlogger.JsonFormatter(
+        f'%(asctime)s {APP_NAME} %(levelname)s %(msg)s %(pathname)s %(lineno)d'
+    )
+
+
+def quiet_handlers(log_dir: str) -> List[logging.Handler]:
+    handlers = build_handlers(logging.INFO, APP_NAME, log_dir)
+    handlers[0].setStream(open(os.devnull, 'w'))
+    return handlers
+
+
+async def measure(logger: logging.Logger, calls: int) -> List[float]:
+    timings = []
+    for number in range(calls):
+        started = time.perf_counter_ns()
+        logger.info('post %s served', number, extra={'route': '/posts'})
+        timings.append((time.perf_counter_ns() - started) / 1000)
+        if number % 100 == 0:
+            # Let the loop run, as it would between requests.
+            await asyncio.sleep(0)
+    return timings
+
+
+def report(name: str, timings: List[float]) -> None:
+    timings = sorted(timings)
+    p99 = timings[int(len(timings) * 0.99) - 1]
+    print(
+        f'{name:<32} mean {statistics.fmean(timings):7.1f} us'
+        f'   p99 {p99:7.1f} us   max {timings[-1]:9.1f} us'
+    )
+
+
+def formatter_cost(formatter: logging.Formatter, calls: int) -> float:
+    record = logging.LogRecord(
+        APP_NAME, logging.INFO, __file__, 1, 'post %s served', (1,), None
+    )
+    record.route = '/posts'
+    started = time.perf_counter()
+    for _ in range(calls):
+        formatter.format(record)
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def run_variant(name: str, calls: int, queued: bool, fast_json: bool) -> None:
+    with tempfile.TemporaryDirectory() as log_dir:
+        handlers = quiet_handlers(log_dir)
+        if not fast_json:
+            handlers[2].setFormatter(previous_json_formatter())
+
+        logger = logging.getLogger(f'api_gateway.bench.{name}')
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        listener = None
+        if queued:
+            queue = SimpleQueue()
+            listener = QueueListener(
+                queue, *handlers, respect_handler_level=True
+            )
+            listener.start()
+            logger.addHandler(LocalQueueHandler(queue))
+        else:
+            for handler in handlers:
+                logger.addHandler(handler)
+
+        try:
+            report(name, asyncio.run(measure(logger, calls)))
+        finally:
+            if listener is not None:
+                listener.stop()
+            for handler in handlers:
+                handler.close()
+
+
+def main(args: argparse.Namespace) -> None:
+    print('event-loop time per log call')
+    run_variant('direct handlers (before)', args.calls, False, False)
+    run_variant('direct, fast JSON', args.calls, False, True)
+    run_variant('queue + fast JSON (after)', args.calls, True, True)
+
+    print('\nJSON formatter per record')
+    for name, formatter in (
+        ('python-json-logger', previous_json_formatter()),
+        ('FastJsonFormatter', FastJsonFormatter(APP_NAME)),
+    ):
+        cost = formatter_cost(formatter, args.calls)
+        print(f'{name:<32} {cost:7.1f} us')
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=20000)
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    main(parse_args())
@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from api.middlewares.rate_limit_middleware import RateLimitMiddleware
+from api.rate_limit.redis_limiter import RateLimitResult
+from api.rate_limit.rules import RateLimitRule
+
+REQUESTS = 20000
+RULE = RateLimitRule(limit=10**9, period=60)
+
+
+class NullRateLimiter:
+    async def hit(self, key, rule, cost=1):
+        return RateLimitResult(True, rule.limit, rule.limit, 0, 0)
+
+
+class BaseHTTPRateLimitMiddleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware-based limiter, kept for comparison."""
+
+    async def dispatch(self, request: Request, call_next):
+        result = await request.app.state.rate_limiter.hit(
+            f'*:ip:{request.client.host}', RULE
+        )
+        if not result.allowed:
+            return JSONResponse(
+                status_code=429, content={'detail': 'Too many requests'}
+            )
+        response = await call_next(request)
+        response.headers['RateLimit-Remaining'] = str(result.remaining)
+        return response
+
+
+def build_app(middleware=None, **options) -> FastAPI:
+    app = FastAPI()
+    app.state.rate_limiter = NullRateLimiter()
+    if middleware is not None:
+        app.add_middleware(middleware, **options)
+
+    @app.get('/ping')
+    async def ping():
+        return {'ok': True}
+
+    return app
+
+
+async def measure(app: FastAPI) -> float:
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': '/ping',
+        'raw_path': b'/ping',
+        'root_path': '',
+        'query_string': b'',
+        'headers': [(b'host', b'localhost')],
+        'client': ('127.0.0.1', 1234),
+        'server': ('localhost', 8000),
+    }
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        pass
+
+    for _ in range(500):
+        await app(dict(scope), receive, send)
+
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - started) / REQUESTS * 1e6
+
+
+def run():
+    variants = {
+        'no rate limit middleware': build_app(),
+        'BaseHTTPMiddleware (before)': build_app(BaseHTTPRateLimitMiddleware),
+        'pure ASGI (after)': build_app(
+            RateLimitMiddleware,
+            default_limit=RULE,
+            authenticated_limit=RULE,
+            route_limits={},
+        ),
+    }
+
+    baseline = None
+    for name, app in variants.items():
+        per_request = asyncio.run(measure(app))
+        baseline = baseline if baseline is not None else per_request
+        print(
+            f'{name:<30} {per_request:8.1f} us/request '
+            f'(+{per_request - baseline:.1f} us)'
+        )
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,149 @@
+"""Full-text search against ILIKE on a generated corpus.
+
+Also reports how many snippets of each result page mark a query word. The
+corpus mixes accented and plain spellings; only hits that match in the title
+or description alone should have none.
+
+Writes posts into the database configured by DATABASE_URL, so point it at a
+scratch database: python -m benchmarks.post_search --rows 1000000
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Awaitable, Callable, List
+from uuid import uuid4
+
+import asyncpg
+
+from api.database.postgres import get_postgres_pool
+from application.dtos.post_search_query_dto import PostSearchQueryDTO
+from infrastructure.database.postgres import create_schema
+from infrastructure.models.post_model import PostModel
+from infrastructure.repositories.post_repository import PostRepository
+
+VOCABULARY = [
+    f'{stem}{suffix}'
+    for stem in (
+        'python async database index query cache postgres redis stream '
+        'search vector ranking latency memory worker socket schema café '
+        'ação información über naïve résumé deploy docker cluster token'
+    ).split()
+    for suffix in ('', 's', 'ing', 'ed', 'er')
+]
+QUERIES = ['postgres', 'cafe', 'async worker', '"cache latency"', 'resume']
+ILIKE_QUERY = """
+    SELECT id, title FROM posts
+    WHERE title ILIKE $1 OR description ILIKE $1 OR body ILIKE $1
+    ORDER BY created_at DESC
+    LIMIT $2
+"""
+
+
+def sentence(words: int) -> str:
+    # Zipf-like: the first words of the vocabulary are far more common.
+    return ' '.join(
+        VOCABULARY[int(random.paretovariate(1.2)) % len(VOCABULARY)]
+        for _ in range(words)
+    )
+
+
+def make_posts(count: int) -> List[PostModel]:
+    return [
+        PostModel(
+            id=str(uuid4()),
+            title=sentence(6).capitalize(),
+            description=sentence(20),
+            body=sentence(250),
+            slug=f'bench-{uuid4().hex}',
+            status=True,
+        )
+        for _ in range(count)
+    ]
+
+
+async def load_corpus(
+    repository: PostRepository, rows: int, batch_size: int
+) -> None:
+    started = time.perf_counter()
+    for written in range(0, rows, batch_size):
+        await repository.copy_many(make_posts(min(batch_size, rows - written)))
+    elapsed = time.perf_counter() - started
+    print(f'loaded {rows} posts in {elapsed:.0f}s ({rows / elapsed:.0f}/s)')
+
+
+async def measure(runs: int, call: Callable[[], Awaitable]) -> List[float]:
+    await call()
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def report(name: str, timings: List[float]) -> None:
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(
+        f'{name:<36} p50 {statistics.median(timings):8.1f} ms'
+        f'   p95 {p95:8.1f} ms'
+    )
+
+
+async def run_queries(pool: asyncpg.Pool, runs: int, limit: int) -> None:
+    repository = PostRepository(pool)
+    for text in QUERIES:
+        term = text.strip('"').split()[0]
+        report(
+            f'ILIKE {term!r}',
+            await measure(
+                runs, lambda: pool.fetch(ILIKE_QUERY, f'%{term}%', limit)
+            ),
+        )
+
+        query = PostSearchQueryDTO(q=text, limit=limit)
+        report(
+            f'search {text!r}',
+            await measure(runs, lambda: repository.search(query)),
+        )
+        hits, cursor = await repository.search(query)
+        # Snippets are matched folded, so 'cafe' must mark 'café' too.
+        marked = sum('<mark>' in (snippet or '') for _, _, snippet in hits)
+        print(f'{"":<36} {marked}/{len(hits)} snippets highlighted')
+        if cursor:
+            next_page = PostSearchQueryDTO(q=text, limit=limit, cursor=cursor)
+            report(
+                f'search {text!r}, page 2',
+                await measure(runs, lambda: repository.search(next_page)),
+            )
+
+
+async def main(args: argparse.Namespace) -> None:
+    pool = await get_postgres_pool()
+    try:
+        await create_schema(pool)
+        if args.rows:
+            await load_corpus(PostRepository(pool), args.rows, args.batch_size)
+            await pool.execute('ANALYZE posts')
+        await run_queries(pool, args.runs, args.limit)
+    finally:
+        await pool.close()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--rows', type=int, default=1000000, help='posts to generate, 0 reuses'
+    )
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--runs', type=int, default=50)
+    parser.add_argument('--limit', type=int, default=20)
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    random.seed(451)
+    asyncio.run(main(parse_args()))
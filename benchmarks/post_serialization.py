@@ -0,0 +1,143 @@
+import time
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+from uuid import UUID, uuid4
+
+from pydantic import HttpUrl, TypeAdapter
+
+from api.routes.streaming import dump_json
+from application.dtos.author_dto import AuthorDTO
+from application.dtos.post_dto import PostDTO
+from application.services.post_service import PostService
+from infrastructure.models.author_model import AuthorModel
+from infrastructure.models.post_model import PostModel
+
+ROWS = 10000
+URL_ADAPTER = TypeAdapter(HttpUrl)
+
+
+def optional_str(value) -> Optional[str]:
+    return str(value) if value is not None else None
+
+
+def validated_dto(model: PostModel) -> PostDTO:
+    """The previous conversion, which re-validated every field."""
+    author_dto = (
+        AuthorDTO(
+            id=str(model.author.id),
+            firstname=str(model.author.firstname),
+            lastname=str(model.author.lastname),
+            description=optional_str(model.author.description),
+            resume=optional_str(model.author.resume),
+        )
+        if model.author
+        else None
+    )
+    return PostDTO(
+        id=str(model.id),
+        title=str(model.title),
+        description=optional_str(model.description),
+        body=optional_str(model.body),
+        slug=optional_str(model.slug),
+        author=author_dto,
+        author_id=(
+            str(model.author.id)
+            if model.author
+            else optional_str(model.author_id)
+        ),
+        status=bool(model.status),
+        thumbnail=optional_str(model.thumbnail),
+        created_at=model.created_at,
+        updated_at=model.updated_at,
+    )
+
+
+def constructed_dto(model: PostModel) -> PostDTO:
+    """Skips validation entirely, but model_construct runs in Python."""
+    author = model.author
+    author_dto = (
+        AuthorDTO.model_construct(
+            id=UUID(author.id),
+            firstname=author.firstname,
+            lastname=author.lastname,
+            description=author.description,
+            resume=author.resume,
+        )
+        if author
+        else None
+    )
+    return PostDTO.model_construct(
+        id=UUID(model.id),
+        title=model.title,
+        description=model.description,
+        body=model.body,
+        slug=model.slug,
+        author=author_dto,
+        author_id=author_dto.id if author_dto else model.author_id,
+        status=model.status,
+        thumbnail=URL_ADAPTER.validate_python(model.thumbnail),
+        created_at=model.created_at,
+        updated_at=model.updated_at,
+    )
+
+
+def make_rows(count: int) -> List[PostModel]:
+    now = datetime.now(timezone.utc)
+    authors = [
+        AuthorModel(id=str(uuid4()), firstname='John', lastname=f'Doe {n}')
+        for n in range(50)
+    ]
+    rows = []
+    for number in range(count):
+        author = authors[number % len(authors)]
+        post = PostModel(
+            id=str(uuid4()),
+            title=f'Post {number}',
+            description='A short description of the post',
+            body='Lorem ipsum dolor sit amet. ' * 40,
+            slug=f'post-{number}',
+            status=True,
+            thumbnail='https://example.com/thumbnail.jpg',
+            author_id=author.id,
+            created_at=now,
+            updated_at=now,
+        )
+        post.author = author
+        rows.append(post)
+    return rows
+
+
+def measure(rows: List[PostModel], convert: Callable, dump: Callable) -> float:
+    for row in rows[:500]:
+        dump(convert(row))
+
+    started = time.perf_counter()
+    for row in rows:
+        dump(convert(row))
+    return len(rows) / (time.perf_counter() - started)
+
+
+def run():
+    rows = make_rows(ROWS)
+    service = PostService(None)
+    variants = {
+        'validated DTO + model_dump_json (before)': (
+            validated_dto,
+            lambda dto: dto.model_dump_json().encode(),
+        ),
+        'model_construct + to_json': (constructed_dto, dump_json),
+        'validate instance dict + to_json (after)': (
+            service.convert_model_to_dto,
+            dump_json,
+        ),
+    }
+
+    baseline = None
+    for name, (convert, dump) in variants.items():
+        rate = measure(rows, convert, dump)
+        baseline = baseline or rate
+        print(f'{name:<42} {rate:10.0f} rows/s ({rate / baseline:.1f}x)')
+
+
+if __name__ == '__main__':
+    run()
@@ -1,3 +1,4 @@
+import math
 import re
 from typing import Optional
 from uuid import uuid4
@@ -6,6 +7,9 @@ from unidecode import unidecode
 
 from .author_entity import AuthorEntity
 
+EXCERPT_LENGTH = 200
+WORDS_PER_MINUTE = 200
+
 
 class PostEntity:
     _id: str
@@ -16,6 +20,9 @@ class PostEntity:
     _author: Optional[AuthorEntity]
     _status: bool
     _thumbnail: Optional[str]
+    _excerpt: Optional[str]
+    _word_count: int
+    _reading_time: int
 
     def __init__(
         self,
@@ -32,6 +39,9 @@ class PostEntity:
         self._author = None
         self._status = status
         self._thumbnail = thumbnail
+        self._excerpt = None
+        self._word_count = 0
+        self._reading_time = 0
 
     def set_post_data(
         self,
@@ -53,6 +63,7 @@ class PostEntity:
         self._author = author
         self._status = status
         self._thumbnail = thumbnail
+        self.__compute_reading_stats(body)
         return self
 
     def create_a_new_post(self, description: str, body: str) -> 'PostEntity':
@@ -64,6 +75,7 @@ class PostEntity:
         self._description = description
         self._body = body
         self._slug = self.__generate_slug(self._title)
+        self.__compute_reading_stats(body)
         return self
 
     def publish(self) -> 'PostEntity':
@@ -111,11 +123,34 @@ class PostEntity:
         self._thumbnail = thumbnail
         return self
 
+    @property
+    def excerpt(self) -> Optional[str]:
+        return self._excerpt
+
+    @property
+    def word_count(self) -> int:
+        return self._word_count
+
+    @property
+    def reading_time(self) -> int:
+        return self._reading_time
+
     def __generate_slug(self, title: str) -> str:
         slug = unidecode(title)
         slug = re.sub(r'[^\w\s-]', '', slug)
         slug = re.sub(r'[\s-]+', '-', slug).strip('-')
         return slug.lower()
 
+    def __compute_reading_stats(self, body: str) -> None:
+        words = re.sub(r'<[^>]+>', ' ', body).split()
+        self._word_count = len(words)
+        self._reading_time = math.ceil(len(words) / WORDS_PER_MINUTE)
+
+        excerpt = ' '.join(words)
+        if len(excerpt) > EXCERPT_LENGTH:
+            cut = excerpt.rfind(' ', 0, EXCERPT_LENGTH)
+            excerpt = excerpt[: cut if cut > 0 else EXCERPT_LENGTH] + '…'
+        self._excerpt = excerpt
+
     def __repr__(self) -> str:
         return f"<PostEntity(id={self._id}, title={self._title}, status={'published' if self._status else 'draft'})>"
@@ -116,3 +116,34 @@ def test_repr_method():
         repr(post)
         == f'<PostEntity(id={post.id}, title=Test Repr, status=published)>'
     )
+
+
+def test_create_a_new_post_computes_reading_stats():
+    post = PostEntity(title='My New Post')
+    post.create_a_new_post(
+        description='Test Description', body='<p>Hello   world</p>\n' * 150
+    )
+
+    assert post.word_count == 300
+    assert post.reading_time == 2
+    assert post.excerpt.startswith('Hello world Hello world')
+    assert post.excerpt.endswith('…')
+    assert len(post.excerpt) <= 201
+
+
+def test_set_post_data_recomputes_reading_stats(author_entity):
+    post = PostEntity(title='My New Post')
+    post.create_a_new_post(description='Test Description', body='a ' * 500)
+    post.set_post_data(
+        title='My New Post',
+        description='Test Description',
+        body='Short body',
+        slug='my-new-post',
+        author=author_entity,
+        status=True,
+        thumbnail=None,
+    )
+
+    assert post.excerpt == 'Short body'
+    assert post.word_count == 2
+    assert post.reading_time == 1
@@ -0,0 +1,53 @@
+from typing import List
+
+import asyncpg
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateColumn, CreateIndex, CreateTable
+
+from infrastructure.models.post_model import PostModel
+
+
+async def create_pool(
+    dsn: str,
+    min_size: int = 5,
+    max_size: int = 20,
+    statement_cache_size: int = 100,
+    command_timeout: float = 10.0,
+) -> asyncpg.Pool:
+    return await asyncpg.create_pool(
+        dsn=dsn,
+        min_size=min_size,
+        max_size=max_size,
+        statement_cache_size=statement_cache_size,
+        command_timeout=command_timeout,
+    )
+
+
+def get_schema_statements() -> List[str]:
+    dialect = postgresql.dialect()
+    statements = []
+    for table in PostModel.metadata.sorted_tables:
+        statements.append(CreateTable(table, if_not_exists=True))
+        statements.extend(
+            f'ALTER TABLE {table.name} ADD COLUMN IF NOT EXISTS '
+            f'{CreateColumn(column).compile(dialect=dialect)}'
+            for column in table.columns
+            if not column.primary_key
+        )
+        statements.extend(
+            CreateIndex(index, if_not_exists=True)
+            for index in sorted(table.indexes, key=lambda index: index.name)
+        )
+    return [
+        statement
+        if isinstance(statement, str)
+        else str(statement.compile(dialect=dialect)).strip()
+        for statement in statements
+    ]
+
+
+async def create_schema(pool: asyncpg.Pool) -> None:
+    async with pool.acquire() as connection:
+        async with connection.transaction():
+            for statement in get_schema_statements():
+                await connection.execute(statement)
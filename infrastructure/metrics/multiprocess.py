@@ -0,0 +1,100 @@
+import fcntl
+import json
+import os
+import threading
+import time
+from typing import List, Tuple
+
+from .registry import Snapshot, merge
+
+ARCHIVE = 'archive.json'
+LOCK = '.lock'
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class MetricsStore:
+    """Per-worker metric snapshots in a directory shared by all workers.
+
+    Each worker writes its own file; any worker can then answer a scrape
+    with the totals of all of them. Files left by exited workers are folded
+    into an archive so the directory does not grow with every recycled
+    worker.
+    """
+
+    def __init__(self, directory: str):
+        self._directory = directory
+        os.makedirs(directory, exist_ok=True)
+        # The start time keeps a reused pid from overwriting the totals of
+        # the earlier process.
+        self._path = os.path.join(
+            directory, f'{os.getpid()}-{time.time_ns()}.json'
+        )
+
+    def write(self, snapshot: Snapshot) -> None:
+        # The periodic publisher and a scrape may write at the same time.
+        temporary = f'{self._path}.{threading.get_ident()}.tmp'
+        with open(temporary, 'w') as file:
+            json.dump(snapshot, file, separators=(',', ':'))
+        os.replace(temporary, self._path)
+
+    def collect(self, snapshot: Snapshot) -> Snapshot:
+        """Saves this worker's snapshot and returns the merged totals."""
+        self.write(snapshot)
+        with open(os.path.join(self._directory, LOCK), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            snapshots, exited = self._read()
+            if exited:
+                self._archive(snapshots, exited)
+            return merge(snapshots)
+
+    def _read(self) -> Tuple[List[Tuple[Snapshot, str, bool]], List[str]]:
+        snapshots, exited = [], []
+        for name in os.listdir(self._directory):
+            path = os.path.join(self._directory, name)
+            if name == ARCHIVE:
+                snapshots.append((self._load(path), '', False))
+                continue
+            if not name.endswith('.json'):
+                continue
+            pid = name.split('-', 1)[0]
+            alive = pid.isdigit() and pid_alive(int(pid))
+            snapshots.append((self._load(path), pid, alive))
+            if not alive:
+                exited.append(path)
+        return snapshots, exited
+
+    def _archive(
+        self, snapshots: List[Tuple[Snapshot, str, bool]], exited: List[str]
+    ) -> None:
+        archive = merge(
+            (snapshot, pid, False)
+            for snapshot, pid, alive in snapshots
+            if not alive
+        )
+        archive = {
+            name: metric
+            for name, metric in archive.items()
+            if metric['type'] != 'gauge'
+        }
+        path = os.path.join(self._directory, ARCHIVE)
+        with open(f'{path}.tmp', 'w') as file:
+            json.dump(archive, file, separators=(',', ':'))
+        os.replace(f'{path}.tmp', path)
+        for exited_path in exited:
+            os.remove(exited_path)
+
+    def _load(self, path: str) -> Snapshot:
+        try:
+            with open(path) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
@@ -0,0 +1,224 @@
+import logging
+import math
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+logger = logging.getLogger('api_gateway')
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+Labels = Tuple[str, ...]
+# name -> {'type', 'help', 'labels', 'buckets', 'samples': [[labels, value]]}
+Snapshot = Dict[str, Dict[str, Any]]
+
+
+class Metric:
+    type = ''
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._values: Dict[Labels, Any] = {}
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            'type': self.type,
+            'help': self.help,
+            'labels': list(self.label_names),
+            'samples': [
+                [list(labels), value] for labels, value in self._values.items()
+            ],
+        }
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, labels: Labels = (), amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def set(self, value: float, labels: Labels = ()) -> None:
+        # For totals kept elsewhere, such as cache hit counts.
+        self._values[labels] = value
+
+
+class Gauge(Metric):
+    type = 'gauge'
+
+    def set(self, value: float, labels: Labels = ()) -> None:
+        self._values[labels] = value
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        # Per-bucket counts, the last one for +Inf, followed by the sum.
+        counts = self._values.get(labels)
+        if counts is None:
+            counts = self._values[labels] = [0] * (len(self.buckets) + 1)
+            counts.append(0.0)
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def describe(self) -> Dict[str, Any]:
+        description = super().describe()
+        description['samples'] = [
+            [labels, list(counts)] for labels, counts in description['samples']
+        ]
+        description['buckets'] = list(self.buckets)
+        return description
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._hooks: List[Callable[[], None]] = []
+
+    def counter(self, name: str, help: str, labels=()) -> Counter:
+        return self._register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels=()) -> Gauge:
+        return self._register(Gauge(name, help, labels))
+
+    def histogram(
+        self, name: str, help: str, labels=(), buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def on_collect(self, hook: Callable[[], None]) -> None:
+        """Runs `hook` before every collection to refresh derived values."""
+        self._hooks.append(hook)
+
+    def collect(self) -> Snapshot:
+        for hook in self._hooks:
+            try:
+                hook()
+            except Exception as e:
+                logger.warning(f'Metrics collection hook failed: {e}')
+        return {
+            name: metric.describe() for name, metric in self._metrics.items()
+        }
+
+    def _register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f'Metric {metric.name} is already registered.')
+        self._metrics[metric.name] = metric
+        return metric
+
+
+def merge(snapshots: Iterable[Tuple[Snapshot, str, bool]]) -> Snapshot:
+    """Combines the snapshots of several workers, given as (snapshot, pid,
+    alive) triples.
+
+    Counters and histograms are summed, including those of workers that
+    have exited, so totals never go backwards. Gauges are only meaningful
+    for running workers and are kept apart with a pid label.
+    """
+    merged: Snapshot = {}
+    for snapshot, pid, alive in snapshots:
+        for name, metric in snapshot.items():
+            target = merged.get(name)
+            if target is None:
+                target = merged[name] = {**metric, 'samples': {}}
+                if metric['type'] == 'gauge':
+                    target['labels'] = metric['labels'] + ['pid']
+            elif (target['type'], target.get('buckets')) != (
+                metric['type'],
+                metric.get('buckets'),
+            ):
+                # Left behind by a worker running a different version.
+                continue
+
+            samples = target['samples']
+            for labels, value in metric['samples']:
+                if metric['type'] == 'gauge':
+                    if alive:
+                        samples[tuple(labels) + (pid,)] = value
+                    continue
+                key = tuple(labels)
+                if key not in samples:
+                    samples[key] = value
+                elif metric['type'] == 'histogram':
+                    samples[key] = [a + b for a, b in zip(samples[key], value)]
+                else:
+                    samples[key] += value
+
+    for metric in merged.values():
+        metric['samples'] = [
+            [list(labels), value]
+            for labels, value in metric['samples'].items()
+        ]
+    return merged
+
+
+def render(snapshot: Snapshot) -> str:
+    lines = []
+    for name, metric in sorted(snapshot.items()):
+        lines.append(f'# HELP {name} {escape(metric["help"], False)}')
+        lines.append(f'# TYPE {name} {metric["type"]}')
+        label_names = metric['labels']
+        for labels, value in metric['samples']:
+            pairs = list(zip(label_names, labels))
+            if metric['type'] != 'histogram':
+                lines.append(f'{name}{format_labels(pairs)} {number(value)}')
+                continue
+
+            cumulative = 0
+            bounds = metric['buckets'] + [math.inf]
+            for bound, count in zip(bounds, value[:-1]):
+                cumulative += count
+                le = format_labels(pairs + [('le', number(bound))])
+                lines.append(f'{name}_bucket{le} {cumulative}')
+            lines.append(f'{name}_sum{format_labels(pairs)} {value[-1]!r}')
+            lines.append(f'{name}_count{format_labels(pairs)} {cumulative}')
+    return '\n'.join(lines) + '\n'
+
+
+def format_labels(pairs: List[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ''
+    text = ','.join(f'{key}="{escape(str(value))}"' for key, value in pairs)
+    return f'{{{text}}}'
+
+
+def escape(value: str, quotes: bool = True) -> str:
+    value = value.replace('\\', r'\\').replace('\n', r'\n')
+    return value.replace('"', r'\"') if quotes else value
+
+
+def number(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+REGISTRY = Registry()
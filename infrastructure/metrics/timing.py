@@ -0,0 +1,39 @@
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Awaitable, Callable, Iterator, TypeVar
+
+from .registry import Histogram, Labels
+
+T = TypeVar('T')
+
+
+@contextmanager
+def measure(histogram: Histogram, labels: Labels = ()) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - started, labels)
+
+
+def timed(
+    histogram: Histogram, labels: Labels = ()
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Observes how long each call to a coroutine function takes.
+
+    Without labels the function name is used, which suits histograms with
+    a single operation label.
+    """
+
+    def decorator(function):
+        names = labels or (function.__name__,)
+
+        @wraps(function)
+        async def wrapper(*args, **kwargs):
+            with measure(histogram, names):
+                return await function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
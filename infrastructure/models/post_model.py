@@ -1,5 +1,8 @@
+from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import DateTime, Index, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped
 from sqlmodel import Field, Relationship
 
@@ -8,6 +11,26 @@ from application.interfaces.database_model import DatabaseModel
 
 class PostModel(DatabaseModel, table=True):
     __tablename__ = 'posts'
+    __table_args__ = (
+        Index('ix_posts_created_at_id', 'created_at', 'id'),
+        Index('ix_posts_status_created_at_id', 'status', 'created_at', 'id'),
+        Index(
+            'ix_posts_author_id_created_at_id',
+            'author_id',
+            'created_at',
+            'id',
+        ),
+        Index('ix_posts_updated_at_id', 'updated_at', 'id'),
+        Index(
+            'ix_posts_slug',
+            'slug',
+            unique=True,
+            postgresql_ops={'slug': 'text_pattern_ops'},
+        ),
+        Index(
+            'ix_posts_search_vector', 'search_vector', postgresql_using='gin'
+        ),
+    )
 
     title: str
     description: Optional[str] = Field(default=None)
@@ -15,6 +38,30 @@ class PostModel(DatabaseModel, table=True):
     slug: Optional[str] = Field(default=None)
     status: bool = Field(default=False)
     thumbnail: Optional[str] = Field(default=None)
+    excerpt: Optional[str] = Field(default=None)
+    word_count: int = Field(
+        default=0, sa_column_kwargs={'server_default': '0'}
+    )
+    reading_time: int = Field(
+        default=0, sa_column_kwargs={'server_default': '0'}
+    )
+    version: int = Field(default=1, sa_column_kwargs={'server_default': '1'})
+    created_at: Optional[datetime] = Field(
+        default=None,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={'server_default': func.now()},
+        nullable=False,
+    )
+    updated_at: Optional[datetime] = Field(
+        default=None,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={'server_default': func.now()},
+        nullable=False,
+    )
+    # Maintained by the repository on every write, never read back.
+    search_vector: Optional[str] = Field(
+        default=None, sa_type=TSVECTOR, exclude=True
+    )
 
     author_id: Optional[str] = Field(default=None, foreign_key='authors.id')
     author: Mapped[Optional['AuthorModel']] = Relationship(
@@ -0,0 +1,66 @@
+from typing import List, Optional
+
+import asyncpg
+
+from application.interfaces.async_base_repository_interface import (
+    AsyncBaseRepositoryInterface,
+)
+from infrastructure.models.author_model import AuthorModel
+
+AUTHOR_COLUMNS = 'id, firstname, lastname, description, resume'
+
+INSERT_AUTHOR = f"""
+    INSERT INTO authors ({AUTHOR_COLUMNS})
+    VALUES ($1, $2, $3, $4, $5)
+"""
+INSERT_AUTHOR_IF_MISSING = f'{INSERT_AUTHOR} ON CONFLICT (id) DO NOTHING'
+INSERT_AUTHORS_IF_MISSING = f"""
+    INSERT INTO authors ({AUTHOR_COLUMNS})
+    SELECT * FROM unnest(
+        $1::text[], $2::text[], $3::text[], $4::text[], $5::text[]
+    )
+    ON CONFLICT (id) DO NOTHING
+"""
+SELECT_AUTHOR = f'SELECT {AUTHOR_COLUMNS} FROM authors WHERE id = $1'
+SELECT_AUTHORS = (
+    f'SELECT {AUTHOR_COLUMNS} FROM authors ORDER BY lastname, firstname'
+)
+UPDATE_AUTHOR = """
+    UPDATE authors
+    SET firstname = $2, lastname = $3, description = $4, resume = $5
+    WHERE id = $1
+"""
+DELETE_AUTHOR = 'DELETE FROM authors WHERE id = $1'
+
+
+def author_values(author: AuthorModel) -> tuple:
+    return (
+        str(author.id),
+        author.firstname,
+        author.lastname,
+        author.description,
+        author.resume,
+    )
+
+
+class AuthorRepository(AsyncBaseRepositoryInterface):
+    def __init__(self, pool: asyncpg.Pool):
+        self._pool = pool
+
+    async def create(self, data: AuthorModel) -> None:
+        await self._pool.execute(INSERT_AUTHOR, *author_values(data))
+
+    async def view(self, id: str) -> Optional[AuthorModel]:
+        row = await self._pool.fetchrow(SELECT_AUTHOR, str(id))
+        return AuthorModel(**dict(row)) if row else None
+
+    async def list(self) -> List[AuthorModel]:
+        rows = await self._pool.fetch(SELECT_AUTHORS)
+        return [AuthorModel(**dict(row)) for row in rows]
+
+    async def update(self, id: str, data: AuthorModel) -> None:
+        values = author_values(data)
+        await self._pool.execute(UPDATE_AUTHOR, str(id), *values[1:])
+
+    async def delete(self, id: str) -> None:
+        await self._pool.execute(DELETE_AUTHOR, str(id))
@@ -0,0 +1,347 @@
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import random
+import time
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+from redis import asyncio as redis
+from redis.exceptions import RedisError
+
+from application.dtos.post_list_query_dto import PostListQueryDTO
+from application.dtos.post_search_query_dto import PostSearchQueryDTO
+from application.interfaces.post_repository_interface import (
+    PostRepositoryInterface,
+)
+from infrastructure.models.author_model import AuthorModel
+from infrastructure.models.post_model import PostModel
+
+logger = logging.getLogger('api_gateway')
+
+# KEYS = list version, entry[, slug pointer]; ARGV = list version read
+# before loading, entry, ttl[, post id]. The list version is bumped by
+# every write, so an entry loaded before a write is not stored after it.
+STORE_SCRIPT = """
+if (redis.call('GET', KEYS[1]) or '') ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[3])
+if KEYS[3] then
+    redis.call('SET', KEYS[3], ARGV[4], 'EX', ARGV[3])
+end
+return 1
+"""
+
+
+def dump_post(post: Optional[PostModel]) -> Optional[Dict[str, Any]]:
+    if post is None:
+        return None
+    data = post.model_dump(mode='json')
+    data['author'] = (
+        post.author.model_dump(mode='json') if post.author else None
+    )
+    return data
+
+
+def load_post(data: Optional[Dict[str, Any]]) -> Optional[PostModel]:
+    if data is None:
+        return None
+    data = dict(data)
+    author = data.pop('author', None)
+    post = PostModel.model_validate(data)
+    if author:
+        post.author = AuthorModel.model_validate(author)
+    return post
+
+
+class CachedPostRepository(PostRepositoryInterface):
+    def __init__(
+        self,
+        repository: PostRepositoryInterface,
+        client: redis.Redis,
+        ttl: int = 300,
+        list_ttl: int = 60,
+        miss_ttl: int = 30,
+        early_refresh_beta: float = 1.0,
+        prefix: str = 'posts',
+    ):
+        self._repository = repository
+        self._client = client
+        self._ttl = ttl
+        self._list_ttl = list_ttl
+        self._miss_ttl = miss_ttl
+        self._beta = early_refresh_beta
+        self._prefix = prefix
+        self._loading: Dict[str, asyncio.Task] = {}
+        self._store_script = client.register_script(STORE_SCRIPT)
+        self.hits = 0
+        self.misses = 0
+
+    async def create(self, data: PostModel) -> None:
+        await self._repository.create(data)
+        await self._invalidate([data.id], [data.slug])
+
+    async def create_many(self, data: List[PostModel]) -> List[str]:
+        created = await self._repository.create_many(data)
+        await self._invalidate(created, [post.slug for post in data])
+        return created
+
+    async def view(
+        self, id: str, include_author: bool = True
+    ) -> Optional[PostModel]:
+        if not include_author:
+            return await self._repository.view(id, include_author=False)
+
+        return await self._get_or_load(
+            self._id_key(id),
+            lambda: self._repository.view(id),
+            ttl=self._ttl,
+            dump=dump_post,
+            load=load_post,
+        )
+
+    async def view_by_slug(
+        self, slug: str, include_author: bool = True
+    ) -> Optional[PostModel]:
+        if not include_author:
+            return await self._repository.view_by_slug(
+                slug, include_author=False
+            )
+
+        try:
+            id = await self._client.get(self._slug_key(slug))
+        except RedisError:
+            id = None
+        if id is not None:
+            post = await self.view(id)
+            if post is not None and post.slug == slug:
+                return post
+
+        self.misses += 1
+        version = await self._write_version()
+        started = time.monotonic()
+        post = await self._repository.view_by_slug(slug)
+        if post is not None:
+            await self._store(
+                self._id_key(post.id),
+                post,
+                time.monotonic() - started,
+                self._ttl,
+                dump_post,
+                version,
+            )
+        return post
+
+    async def view_version(self, id: str) -> Optional[Tuple[int, datetime]]:
+        # The cached entry carries the whole body; reading the version
+        # columns by primary key is cheaper than fetching and parsing it.
+        return await self._repository.view_version(id)
+
+    async def list(self, include_author: bool = True) -> List[PostModel]:
+        if not include_author:
+            return await self._repository.list(include_author=False)
+
+        return await self._get_or_load(
+            await self._list_key('all'),
+            self._repository.list,
+            ttl=self._list_ttl,
+            dump=lambda posts: [dump_post(post) for post in posts],
+            load=lambda posts: [load_post(post) for post in posts],
+        )
+
+    async def list_page(
+        self, query: PostListQueryDTO
+    ) -> Tuple[List[PostModel], Optional[str]]:
+        digest = hashlib.sha1(query.model_dump_json().encode()).hexdigest()
+        return await self._get_or_load(
+            await self._list_key(digest),
+            lambda: self._repository.list_page(query),
+            ttl=self._list_ttl,
+            dump=lambda page: [[dump_post(post) for post in page[0]], page[1]],
+            load=lambda page: ([load_post(post) for post in page[0]], page[1]),
+        )
+
+    async def search(
+        self, query: PostSearchQueryDTO
+    ) -> Tuple[List[Tuple[PostModel, float, Optional[str]]], Optional[str]]:
+        return await self._repository.search(query)
+
+    def stream(
+        self, since: Optional[datetime] = None
+    ) -> AsyncIterator[PostModel]:
+        return self._repository.stream(since)
+
+    async def update(self, id: str, data: PostModel) -> Optional[int]:
+        previous_slug = await self._cached_slug(id)
+        version = await self._repository.update(id, data)
+        await self._invalidate([id], [data.slug, previous_slug])
+        return version
+
+    async def update_many(self, data: List[PostModel]) -> List[str]:
+        # Pointers from old slugs are left to expire: view_by_slug checks
+        # the slug of the post they resolve to.
+        updated = await self._repository.update_many(data)
+        await self._invalidate(updated, [post.slug for post in data])
+        return updated
+
+    async def delete(self, id: str) -> None:
+        previous_slug = await self._cached_slug(id)
+        await self._repository.delete(id)
+        await self._invalidate([id], [previous_slug])
+
+    async def delete_many(self, ids: List[str]) -> List[str]:
+        deleted = await self._repository.delete_many(ids)
+        await self._invalidate(deleted, [])
+        return deleted
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        lookups = self.hits + self.misses
+        return {
+            'redis': {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+            }
+        }
+
+    def _id_key(self, id: str) -> str:
+        return f'{self._prefix}:id:{id}'
+
+    def _slug_key(self, slug: str) -> str:
+        return f'{self._prefix}:slug:{slug}'
+
+    def _list_version_key(self) -> str:
+        return f'{self._prefix}:list_version'
+
+    async def _list_key(self, name: str) -> str:
+        try:
+            version = await self._client.get(self._list_version_key()) or 0
+        except RedisError:
+            version = 'unavailable'
+        return f'{self._prefix}:list:{version}:{name}'
+
+    async def _write_version(self) -> Optional[str]:
+        # None when Redis is unavailable: the loaded value is then not
+        # stored, as it could not be checked against later writes.
+        try:
+            return await self._client.get(self._list_version_key()) or ''
+        except RedisError:
+            return None
+
+    async def _cached_slug(self, id: str) -> Optional[str]:
+        try:
+            raw = await self._client.get(self._id_key(id))
+        except RedisError:
+            return None
+        if raw is None:
+            return None
+        value = json.loads(raw)['value']
+        return value.get('slug') if value else None
+
+    async def _get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+        dump: Callable[[Any], Any],
+        load: Callable[[Any], Any],
+    ) -> Any:
+        try:
+            raw = await self._client.get(key)
+        except RedisError as e:
+            logger.warning(f'Post cache unavailable, reading through: {e}')
+            self.misses += 1
+            return await loader()
+
+        if raw is not None:
+            entry = json.loads(raw)
+            if not self._should_refresh_early(entry):
+                self.hits += 1
+                return load(entry['value'])
+
+        self.misses += 1
+
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, loader, ttl, dump))
+            self._loading[key] = task
+            task.add_done_callback(lambda _: self._loading.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+        dump: Callable[[Any], Any],
+    ) -> Any:
+        version = await self._write_version()
+        started = time.monotonic()
+        value = await loader()
+        await self._store(
+            key, value, time.monotonic() - started, ttl, dump, version
+        )
+        return value
+
+    async def _store(
+        self,
+        key: str,
+        value: Any,
+        delta: float,
+        ttl: int,
+        dump: Callable[[Any], Any],
+        version: Optional[str],
+    ) -> None:
+        if version is None:
+            return
+        ttl = ttl if value is not None else self._miss_ttl
+        entry = {
+            'value': dump(value),
+            'delta': delta,
+            'expires_at': time.time() + ttl,
+        }
+        keys = [self._list_version_key(), key]
+        args = [version, json.dumps(entry), ttl]
+        if isinstance(value, PostModel) and value.slug:
+            keys.append(self._slug_key(value.slug))
+            args.append(str(value.id))
+        try:
+            await self._store_script(keys=keys, args=args)
+        except RedisError as e:
+            logger.warning(f'Could not cache {key}: {e}')
+
+    def _should_refresh_early(self, entry: Dict[str, Any]) -> bool:
+        # Probabilistic early expiration (XFetch): the closer an entry is to
+        # expiring and the longer it took to compute, the likelier a reader
+        # recomputes it, so a hot key is refreshed once instead of stampeding.
+        jitter = -entry['delta'] * self._beta * math.log(1.0 - random.random())
+        return time.time() + jitter >= entry['expires_at']
+
+    async def _invalidate(
+        self, ids: Iterable[str], slugs: Iterable[Optional[str]]
+    ) -> None:
+        keys = [self._id_key(id) for id in ids]
+        keys += [self._slug_key(slug) for slug in filter(None, slugs)]
+        try:
+            # The version goes first: a load that began before this write
+            # and stores between the two commands is then refused.
+            async with self._client.pipeline(transaction=False) as pipe:
+                pipe.incr(self._list_version_key())
+                if keys:
+                    pipe.delete(*keys)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning(f'Could not invalidate cached posts: {e}')
@@ -0,0 +1,194 @@
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from redis import asyncio as redis
+from redis.exceptions import RedisError
+
+from application.dtos.post_list_query_dto import PostListQueryDTO
+from application.dtos.post_search_query_dto import PostSearchQueryDTO
+from application.interfaces.post_repository_interface import (
+    PostRepositoryInterface,
+)
+from infrastructure.cache.memory_cache import MemoryCache
+from infrastructure.models.post_model import PostModel
+
+logger = logging.getLogger('api_gateway')
+
+
+def estimate_size(post: PostModel) -> int:
+    size = len(post.model_dump_json())
+    if post.author:
+        size += len(post.author.model_dump_json())
+    return size
+
+
+class LocalCachedPostRepository(PostRepositoryInterface):
+    def __init__(
+        self,
+        repository: PostRepositoryInterface,
+        client: Optional[redis.Redis],
+        cache: MemoryCache,
+        channel: str = 'posts:invalidate',
+        reconnect_delay: float = 1.0,
+        poll_timeout: float = 1.0,
+    ):
+        self._repository = repository
+        self._client = client
+        self._cache = cache
+        self._channel = channel
+        self._reconnect_delay = reconnect_delay
+        self._poll_timeout = poll_timeout
+        self._listener: Optional[asyncio.Task] = None
+        # Bumped by every eviction; a load that saw it change may have read
+        # the row before the write behind the eviction and is not cached.
+        self._evictions = 0
+
+    async def start(self) -> None:
+        if self._client is not None and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+
+    async def create(self, data: PostModel) -> None:
+        await self._repository.create(data)
+
+    async def create_many(self, data: List[PostModel]) -> List[str]:
+        return await self._repository.create_many(data)
+
+    async def view(
+        self, id: str, include_author: bool = True
+    ) -> Optional[PostModel]:
+        if not include_author:
+            return await self._repository.view(id, include_author=False)
+
+        key = ('id', str(id))
+        post = self._cache.get(key)
+        if post is None:
+            evictions = self._evictions
+            post = await self._repository.view(id)
+            if post is not None and self._evictions == evictions:
+                self._cache.set(key, post, estimate_size(post))
+        return post
+
+    async def view_by_slug(
+        self, slug: str, include_author: bool = True
+    ) -> Optional[PostModel]:
+        if not include_author:
+            return await self._repository.view_by_slug(
+                slug, include_author=False
+            )
+
+        # Slugs map to ids so invalidation by id also covers slug lookups;
+        # a pointer left behind by a renamed post fails the slug check.
+        key = ('slug', slug)
+        id = self._cache.get(key)
+        if id is not None:
+            post = await self.view(id)
+            if post is not None and post.slug == slug:
+                return post
+            self._cache.delete(key)
+
+        evictions = self._evictions
+        post = await self._repository.view_by_slug(slug)
+        if post is not None and self._evictions == evictions:
+            id = str(post.id)
+            self._cache.set(('id', id), post, estimate_size(post))
+            self._cache.set(key, id, len(slug) + len(id))
+        return post
+
+    async def view_version(self, id: str) -> Optional[Tuple[int, datetime]]:
+        post = self._cache.get(('id', str(id)))
+        if post is not None:
+            return post.version, post.updated_at
+        return await self._repository.view_version(id)
+
+    async def list(self, include_author: bool = True) -> List[PostModel]:
+        return await self._repository.list(include_author=include_author)
+
+    async def list_page(
+        self, query: PostListQueryDTO
+    ) -> Tuple[List[PostModel], Optional[str]]:
+        return await self._repository.list_page(query)
+
+    async def search(
+        self, query: PostSearchQueryDTO
+    ) -> Tuple[List[Tuple[PostModel, float, Optional[str]]], Optional[str]]:
+        return await self._repository.search(query)
+
+    def stream(
+        self, since: Optional[datetime] = None
+    ) -> AsyncIterator[PostModel]:
+        return self._repository.stream(since)
+
+    async def update(self, id: str, data: PostModel) -> Optional[int]:
+        version = await self._repository.update(id, data)
+        await self._invalidate([id])
+        return version
+
+    async def update_many(self, data: List[PostModel]) -> List[str]:
+        updated = await self._repository.update_many(data)
+        await self._invalidate(updated)
+        return updated
+
+    async def delete(self, id: str) -> None:
+        await self._repository.delete(id)
+        await self._invalidate([id])
+
+    async def delete_many(self, ids: List[str]) -> List[str]:
+        deleted = await self._repository.delete_many(ids)
+        await self._invalidate(deleted)
+        return deleted
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        inner_stats = getattr(self._repository, 'stats', dict)()
+        return {'l1': self._cache.stats(), **inner_stats}
+
+    def evict(self, id: str) -> None:
+        self._evictions += 1
+        self._cache.delete(('id', str(id)))
+
+    async def _invalidate(self, ids: List[str]) -> None:
+        ids = [str(id) for id in ids]
+        for id in ids:
+            self.evict(id)
+        if self._client is None or not ids:
+            return
+        try:
+            await self._client.publish(self._channel, json.dumps({'ids': ids}))
+        except RedisError as e:
+            logger.warning(f'Could not publish post invalidation: {e}')
+
+    async def _listen(self) -> None:
+        reconnecting = False
+        while True:
+            pubsub = self._client.pubsub()
+            try:
+                await pubsub.subscribe(self._channel)
+                if reconnecting:
+                    # Invalidations sent while we were not subscribed are lost.
+                    self._evictions += 1
+                    self._cache.clear()
+                    reconnecting = False
+                while True:
+                    # With an explicit timeout an idle channel yields None;
+                    # a blocking read would hit the client's socket timeout
+                    # and look like a dropped connection.
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True,
+                        timeout=self._poll_timeout,
+                    )
+                    if message is not None and message['type'] == 'message':
+                        for id in json.loads(message['data'])['ids']:
+                            self.evict(id)
+            except RedisError as e:
+                logger.warning(f'Post invalidation listener failed: {e}')
+                reconnecting = True
+                await asyncio.sleep(self._reconnect_delay)
+            finally:
+                await pubsub.aclose()
@@ -0,0 +1,640 @@
+import re
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+import asyncpg
+from unidecode import unidecode
+
+from application.dtos.post_list_query_dto import PostListQueryDTO
+from application.dtos.post_search_query_dto import PostSearchQueryDTO
+from application.interfaces.post_repository_interface import (
+    PostRepositoryInterface,
+)
+from application.services.cursor import (
+    decode_cursor,
+    decode_search_cursor,
+    encode_cursor,
+    encode_search_cursor,
+)
+from infrastructure.metrics.registry import REGISTRY
+from infrastructure.metrics.timing import timed
+from infrastructure.models.author_model import AuthorModel
+from infrastructure.models.post_model import PostModel
+from infrastructure.search.snippet import headline
+
+from .author_repository import (
+    INSERT_AUTHOR_IF_MISSING,
+    INSERT_AUTHORS_IF_MISSING,
+    author_values,
+)
+
+QUERY_DURATION = REGISTRY.histogram(
+    'post_repository_query_duration_seconds',
+    'Time spent in post queries, by repository method.',
+    ['operation'],
+)
+
+SUMMARY_COLUMNS = [
+    'id',
+    'title',
+    'description',
+    'slug',
+    'status',
+    'thumbnail',
+    'author_id',
+    'excerpt',
+    'word_count',
+    'reading_time',
+    'created_at',
+    'updated_at',
+    'version',
+]
+
+POST_COLUMNS = SUMMARY_COLUMNS + ['body']
+AUTHOR_COLUMNS = ['firstname', 'lastname', 'description', 'resume']
+AUTHOR_PREFIX = 'author__'
+WRITE_COLUMNS = [
+    'id',
+    'title',
+    'description',
+    'body',
+    'slug',
+    'status',
+    'thumbnail',
+    'author_id',
+    'excerpt',
+    'word_count',
+    'reading_time',
+    'created_at',
+]
+
+# Documents are folded with unidecode before indexing, like slugs, and the
+# 'simple' configuration keeps words as they are, so a query matches however
+# its accents are typed. Each field takes "folded, original" parameters and
+# the folded text is only sent when it differs from the original.
+SEARCH_CONFIG = 'simple'
+SEARCH_RANK = 'ts_rank(p.search_vector, q.query)'
+
+
+def search_vector(title: str, description: str, body: str) -> str:
+    # Each argument lists the folded text first and the original second.
+    return '\n        || '.join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({document}, '')),"
+        f" '{weight}')"
+        for document, weight in ((title, 'A'), (description, 'B'), (body, 'C'))
+    )
+
+
+INSERT_POST = """
+    INSERT INTO posts (
+        id, title, description, body, slug, status, thumbnail, author_id,
+        excerpt, word_count, reading_time, created_at, search_vector
+    )
+    VALUES (
+        $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, COALESCE($12, now()),
+        {search_vector}
+    )
+""".format(
+    search_vector=search_vector('$13, $2', '$14, $3', '$15, $4')
+)
+# Updates keep the stored slug and author when the new values leave them
+# out, and return what was kept so the models can be completed.
+UPDATE_POST = """
+    UPDATE posts
+    SET title = $2, description = $3, body = $4, slug = COALESCE($5, slug),
+        status = $6, thumbnail = $7, author_id = COALESCE($8, author_id),
+        excerpt = $9, word_count = $10, reading_time = $11,
+        updated_at = now(), version = version + 1,
+        search_vector = {search_vector}
+    WHERE id = $1
+    RETURNING version, slug, author_id
+""".format(
+    search_vector=search_vector('$12, $2', '$13, $3', '$14, $4')
+)
+SELECT_POST_VERSION = 'SELECT version, updated_at FROM posts WHERE id = $1'
+DELETE_POST = 'DELETE FROM posts WHERE id = $1'
+DELETE_POSTS = 'DELETE FROM posts WHERE id = ANY($1::text[]) RETURNING id'
+INSERT_POSTS = """
+    INSERT INTO posts (
+        id, title, description, body, slug, status, thumbnail, author_id,
+        excerpt, word_count, reading_time, created_at, search_vector
+    )
+    SELECT
+        id, title, description, body, slug, status, thumbnail, author_id,
+        excerpt, word_count, reading_time, COALESCE(created_at, now()),
+        {search_vector}
+    FROM unnest(
+        $1::text[], $2::text[], $3::text[], $4::text[], $5::text[],
+        $6::bool[], $7::text[], $8::text[], $9::text[], $10::int[],
+        $11::int[], $12::timestamptz[], $13::text[], $14::text[], $15::text[]
+    ) AS v(
+        id, title, description, body, slug, status, thumbnail, author_id,
+        excerpt, word_count, reading_time, created_at, search_title,
+        search_description, search_body
+    )
+    ON CONFLICT DO NOTHING
+    RETURNING id
+""".format(
+    search_vector=search_vector(
+        'search_title, title',
+        'search_description, description',
+        'search_body, body',
+    )
+)
+UPDATE_POSTS = """
+    UPDATE posts AS p
+    SET title = v.title, description = v.description, body = v.body,
+        slug = COALESCE(v.slug, p.slug), status = v.status,
+        thumbnail = v.thumbnail,
+        author_id = COALESCE(v.author_id, p.author_id), excerpt = v.excerpt,
+        word_count = v.word_count, reading_time = v.reading_time,
+        updated_at = now(), version = p.version + 1,
+        search_vector = {search_vector}
+    FROM unnest(
+        $1::text[], $2::text[], $3::text[], $4::text[], $5::text[],
+        $6::bool[], $7::text[], $8::text[], $9::text[], $10::int[],
+        $11::int[], $12::text[], $13::text[], $14::text[]
+    ) AS v(
+        id, title, description, body, slug, status, thumbnail, author_id,
+        excerpt, word_count, reading_time, search_title, search_description,
+        search_body
+    )
+    WHERE p.id = v.id
+    RETURNING p.id, p.slug, p.author_id
+""".format(
+    search_vector=search_vector(
+        'v.search_title, v.title',
+        'v.search_description, v.description',
+        'v.search_body, v.body',
+    )
+)
+SET_SEARCH_VECTORS = """
+    UPDATE posts AS p
+    SET search_vector = {search_vector}
+    FROM unnest($1::text[], $2::text[], $3::text[], $4::text[])
+        AS v(id, title, description, body)
+    WHERE p.id = v.id
+""".format(
+    search_vector=search_vector(
+        'v.title, p.title', 'v.description, p.description', 'v.body, p.body'
+    )
+)
+SELECT_UNINDEXED_POSTS = """
+    SELECT id, title, description, body
+    FROM posts
+    WHERE search_vector IS NULL AND id > $1
+    ORDER BY id
+    LIMIT $2
+"""
+LOCK_SLUGS = """
+    SELECT pg_advisory_xact_lock(hashtext(base))
+    FROM unnest($1::text[]) AS b(base)
+    ORDER BY base
+"""
+# Every candidate for a base slug ("base" and "base-<n>") sorts between the
+# base itself and the base followed by '.', the character after '-', so each
+# base costs one range scan on the text_pattern_ops slug index.
+SELECT_TAKEN_SLUGS = """
+    SELECT b.base, p.slug
+    FROM unnest($1::text[]) AS b(base)
+    JOIN posts p ON p.slug ~>=~ b.base AND p.slug ~<~ (b.base || '.')
+    WHERE p.id <> ALL($2::text[])
+"""
+
+
+def select_posts(summary: bool = False, include_author: bool = True) -> str:
+    columns = [
+        f'p.{column}'
+        for column in (SUMMARY_COLUMNS if summary else POST_COLUMNS)
+    ]
+    join = ''
+    if include_author:
+        columns += [
+            f'a.{column} AS {AUTHOR_PREFIX}{column}'
+            for column in AUTHOR_COLUMNS
+        ]
+        join = ' LEFT JOIN authors a ON a.id = p.author_id'
+    return f'SELECT {", ".join(columns)} FROM posts p{join}'
+
+
+def row_to_model(row: asyncpg.Record) -> PostModel:
+    values = dict(row)
+    author_fields = {
+        column: values.pop(f'{AUTHOR_PREFIX}{column}')
+        for column in AUTHOR_COLUMNS
+        if f'{AUTHOR_PREFIX}{column}' in values
+    }
+    post = PostModel(**values)
+    if author_fields.get('firstname') is not None:
+        post.author = AuthorModel(id=post.author_id, **author_fields)
+    return post
+
+
+def post_values(post: PostModel) -> tuple:
+    author_id = post.author_id or (post.author.id if post.author else None)
+    return (
+        str(post.id),
+        post.title,
+        post.description,
+        post.body,
+        post.slug,
+        bool(post.status),
+        str(post.thumbnail) if post.thumbnail else None,
+        str(author_id) if author_id else None,
+        post.excerpt,
+        post.word_count or 0,
+        post.reading_time or 0,
+        post.created_at,
+    )
+
+
+def fold_text(text: Optional[str]) -> Optional[str]:
+    # None when folding changes nothing, so the SQL reuses the original.
+    if not text:
+        return None
+    folded = unidecode(text)
+    return folded if folded != text else None
+
+
+def search_values(post: PostModel) -> tuple:
+    return (
+        fold_text(post.title),
+        fold_text(post.description),
+        fold_text(post.body),
+    )
+
+
+def select_search(query: PostSearchQueryDTO) -> Tuple[str, list]:
+    conditions, args = ['p.search_vector @@ q.query'], [unidecode(query.q)]
+    if query.status is not None:
+        args.append(query.status)
+        conditions.append(f'p.status = ${len(args)}')
+    if query.cursor:
+        args.extend(decode_search_cursor(query.cursor))
+        conditions.append(
+            f'({SEARCH_RANK}, p.id) < (${len(args) - 1}::real, ${len(args)})'
+        )
+    args.append(query.limit + 1)
+
+    columns = [f'p.{column}' for column in SUMMARY_COLUMNS]
+    join = ''
+    if query.include_author:
+        columns += [
+            f'a.{column} AS {AUTHOR_PREFIX}{column}'
+            for column in AUTHOR_COLUMNS
+        ]
+        join = ' LEFT JOIN authors a ON a.id = p.author_id'
+    # The GIN index finds the matches; only the page that survives the
+    # LIMIT reads its bodies, for the snippets. They are built in Python:
+    # ts_headline would parse the original body, whose accented words never
+    # match the folded query.
+    sql = f"""
+        SELECT hit.*, p.body AS snippet_source
+        FROM (
+            SELECT {', '.join(columns)}, {SEARCH_RANK} AS rank
+            FROM websearch_to_tsquery('{SEARCH_CONFIG}', $1) AS q(query)
+            JOIN posts p ON {' AND '.join(conditions)}{join}
+            ORDER BY rank DESC, p.id DESC
+            LIMIT ${len(args)}
+        ) AS hit
+        JOIN posts p ON p.id = hit.id
+        ORDER BY hit.rank DESC, hit.id DESC
+    """
+    return sql, args
+
+
+class SlugAllocator:
+    def __init__(self, taken: Iterable[Tuple[str, str]] = ()):
+        self._taken: Set[str] = set()
+        self._taken_by_base: Dict[str, List[str]] = defaultdict(list)
+        self._next_suffix: Dict[str, int] = {}
+        for base, slug in taken:
+            self._taken.add(slug)
+            self._taken_by_base[base].append(slug)
+
+    def allocate(self, base: str) -> str:
+        slug = base
+        if slug in self._taken:
+            number = self._next_suffix.get(base) or self._max_suffix(base) + 1
+            while f'{base}-{number}' in self._taken:
+                number += 1
+            slug = f'{base}-{number}'
+            self._next_suffix[base] = number + 1
+        self._taken.add(slug)
+        return slug
+
+    def _max_suffix(self, base: str) -> int:
+        suffix = re.compile(rf'{re.escape(base)}-(\d+)')
+        numbers = [
+            int(match.group(1))
+            for match in map(suffix.fullmatch, self._taken_by_base[base])
+            if match is not None
+        ]
+        return max(numbers, default=1)
+
+
+def next_free_slug(slug: str, taken: Iterable[str]) -> str:
+    return SlugAllocator((slug, other) for other in taken).allocate(slug)
+
+
+async def resolve_slugs(
+    connection: asyncpg.Connection,
+    posts: List[PostModel],
+    exclude_ids: Iterable[str] = (),
+) -> None:
+    # The advisory locks serialise writers competing for the same base slugs
+    # until the transaction commits; the unique index stays the final guard.
+    # Resolved slugs are written back onto the models.
+    for post in posts:
+        # A title without word characters folds to an empty slug; the id
+        # stands in for it, as the unique index would reject a second ''.
+        if post.slug is not None and not post.slug.strip():
+            post.slug = str(post.id)
+    bases = sorted({post.slug for post in posts if post.slug})
+    if not bases:
+        return
+    await connection.execute(LOCK_SLUGS, bases)
+    rows = await connection.fetch(
+        SELECT_TAKEN_SLUGS, bases, [str(id) for id in exclude_ids]
+    )
+    allocator = SlugAllocator((row['base'], row['slug']) for row in rows)
+    for post in posts:
+        if post.slug:
+            post.slug = allocator.allocate(post.slug)
+
+
+def columns_of(rows: List[tuple]) -> List[list]:
+    return [list(column) for column in zip(*rows)]
+
+
+class PostRepository(PostRepositoryInterface):
+    def __init__(self, pool: asyncpg.Pool):
+        self._pool = pool
+
+    @timed(QUERY_DURATION)
+    async def create(self, data: PostModel) -> None:
+        async with self._pool.acquire() as connection:
+            async with connection.transaction():
+                await self._save_author(connection, data)
+                await resolve_slugs(connection, [data])
+                await connection.execute(
+                    INSERT_POST, *post_values(data), *search_values(data)
+                )
+
+    @timed(QUERY_DURATION)
+    async def create_many(self, data: List[PostModel]) -> List[str]:
+        if not data:
+            return []
+        async with self._pool.acquire() as connection:
+            async with connection.transaction():
+                await self._save_authors(connection, data)
+                await resolve_slugs(connection, data)
+                rows = await connection.fetch(
+                    INSERT_POSTS,
+                    *columns_of(
+                        [post_values(p) + search_values(p) for p in data]
+                    ),
+                )
+        return [row['id'] for row in rows]
+
+    @timed(QUERY_DURATION)
+    async def copy_many(
+        self, data: List[PostModel], new_authors: List[AuthorModel] = ()
+    ) -> None:
+        # COPY is the fastest bulk path but has no conflict handling: the
+        # whole call fails on a duplicate id, and new_authors must not exist.
+        if not data:
+            return
+        now = datetime.now(timezone.utc)
+        async with self._pool.acquire() as connection:
+            async with connection.transaction():
+                if new_authors:
+                    await connection.copy_records_to_table(
+                        'authors',
+                        records=[author_values(a) for a in new_authors],
+                        columns=['id'] + AUTHOR_COLUMNS,
+                    )
+                await resolve_slugs(connection, data)
+                await connection.copy_records_to_table(
+                    'posts',
+                    records=[
+                        post_values(post)[:-1] + (post.created_at or now,)
+                        for post in data
+                    ],
+                    columns=WRITE_COLUMNS,
+                )
+                # COPY cannot compute expressions, so the search vectors
+                # are filled in by a second statement in the same
+                # transaction.
+                await connection.execute(
+                    SET_SEARCH_VECTORS,
+                    *columns_of(
+                        [(str(p.id),) + search_values(p) for p in data]
+                    ),
+                )
+
+    @timed(QUERY_DURATION)
+    async def view(
+        self, id: str, include_author: bool = True
+    ) -> Optional[PostModel]:
+        row = await self._pool.fetchrow(
+            f'{select_posts(include_author=include_author)} WHERE p.id = $1',
+            str(id),
+        )
+        return row_to_model(row) if row else None
+
+    @timed(QUERY_DURATION)
+    async def view_by_slug(
+        self, slug: str, include_author: bool = True
+    ) -> Optional[PostModel]:
+        row = await self._pool.fetchrow(
+            f'{select_posts(include_author=include_author)} '
+            'WHERE p.slug = $1',
+            slug,
+        )
+        return row_to_model(row) if row else None
+
+    @timed(QUERY_DURATION)
+    async def view_version(self, id: str) -> Optional[Tuple[int, datetime]]:
+        row = await self._pool.fetchrow(SELECT_POST_VERSION, str(id))
+        return (row['version'], row['updated_at']) if row else None
+
+    @timed(QUERY_DURATION)
+    async def list(self, include_author: bool = True) -> List[PostModel]:
+        rows = await self._pool.fetch(
+            f'{select_posts(include_author=include_author)} '
+            'ORDER BY p.created_at DESC, p.id DESC'
+        )
+        return [row_to_model(row) for row in rows]
+
+    async def stream(
+        self, since: Optional[datetime] = None, prefetch: int = 500
+    ) -> AsyncIterator[PostModel]:
+        # A server-side cursor inside a read-only snapshot: rows arrive in
+        # prefetch-sized round trips and the export sees one consistent view.
+        query, args = select_posts(), []
+        if since is not None:
+            query += ' WHERE p.updated_at >= $1'
+            args.append(since)
+        query += ' ORDER BY p.updated_at, p.id'
+        async with self._pool.acquire() as connection:
+            async with connection.transaction(
+                isolation='repeatable_read', readonly=True
+            ):
+                async for row in connection.cursor(
+                    query, *args, prefetch=prefetch
+                ):
+                    yield row_to_model(row)
+
+    @timed(QUERY_DURATION)
+    async def list_page(
+        self, query: PostListQueryDTO
+    ) -> Tuple[List[PostModel], Optional[str]]:
+        conditions, args = [], []
+        if query.status is not None:
+            args.append(query.status)
+            conditions.append(f'p.status = ${len(args)}')
+        if query.author_id is not None:
+            args.append(str(query.author_id))
+            conditions.append(f'p.author_id = ${len(args)}')
+        if query.cursor:
+            args.extend(decode_cursor(query.cursor))
+            conditions.append(
+                f'(p.created_at, p.id) < (${len(args) - 1}, ${len(args)})'
+            )
+        args.append(query.limit + 1)
+
+        where = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+        select = select_posts(query.summary, query.include_author)
+        rows = await self._pool.fetch(
+            f'{select} {where} '
+            f'ORDER BY p.created_at DESC, p.id DESC LIMIT ${len(args)}',
+            *args,
+        )
+
+        models = [row_to_model(row) for row in rows[: query.limit]]
+        next_cursor = None
+        if len(rows) > query.limit:
+            last = models[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+        return models, next_cursor
+
+    @timed(QUERY_DURATION)
+    async def search(
+        self, query: PostSearchQueryDTO
+    ) -> Tuple[List[Tuple[PostModel, float, Optional[str]]], Optional[str]]:
+        sql, args = select_search(query)
+        rows = await self._pool.fetch(sql, *args)
+
+        hits = []
+        for row in rows[: query.limit]:
+            values = dict(row)
+            rank, body = values.pop('rank'), values.pop('snippet_source')
+            hits.append((row_to_model(values), rank, headline(body, query.q)))
+        next_cursor = None
+        if len(rows) > query.limit:
+            last, rank, _ = hits[-1]
+            next_cursor = encode_search_cursor(rank, last.id)
+        return hits, next_cursor
+
+    @timed(QUERY_DURATION)
+    async def index_missing_search_vectors(
+        self, batch_size: int = 1000
+    ) -> int:
+        # Backfills rows written before the search column existed.
+        indexed, last_id = 0, ''
+        while True:
+            rows = await self._pool.fetch(
+                SELECT_UNINDEXED_POSTS, last_id, batch_size
+            )
+            if not rows:
+                return indexed
+            last_id = rows[-1]['id']
+            await self._pool.execute(
+                SET_SEARCH_VECTORS,
+                *columns_of(
+                    [
+                        (
+                            row['id'],
+                            fold_text(row['title']),
+                            fold_text(row['description']),
+                            fold_text(row['body']),
+                        )
+                        for row in rows
+                    ]
+                ),
+            )
+            indexed += len(rows)
+
+    @timed(QUERY_DURATION)
+    async def update(self, id: str, data: PostModel) -> Optional[int]:
+        async with self._pool.acquire() as connection:
+            async with connection.transaction():
+                await self._save_author(connection, data)
+                await resolve_slugs(connection, [data], [id])
+                values = post_values(data)
+                row = await connection.fetchrow(
+                    UPDATE_POST,
+                    str(id),
+                    *values[1:-1],
+                    *search_values(data),
+                )
+        if row is None:
+            return None
+        data.slug, data.author_id = row['slug'], row['author_id']
+        return row['version']
+
+    @timed(QUERY_DURATION)
+    async def update_many(self, data: List[PostModel]) -> List[str]:
+        if not data:
+            return []
+        ids = [str(post.id) for post in data]
+        async with self._pool.acquire() as connection:
+            async with connection.transaction():
+                await self._save_authors(connection, data)
+                await resolve_slugs(connection, data, ids)
+                rows = await connection.fetch(
+                    UPDATE_POSTS,
+                    *columns_of(
+                        [post_values(p)[:-1] + search_values(p) for p in data]
+                    ),
+                )
+        updated = {row['id']: row for row in rows}
+        for post in data:
+            row = updated.get(str(post.id))
+            if row is not None:
+                post.slug, post.author_id = row['slug'], row['author_id']
+        return list(updated)
+
+    @timed(QUERY_DURATION)
+    async def delete(self, id: str) -> None:
+        await self._pool.execute(DELETE_POST, str(id))
+
+    @timed(QUERY_DURATION)
+    async def delete_many(self, ids: List[str]) -> List[str]:
+        if not ids:
+            return []
+        rows = await self._pool.fetch(DELETE_POSTS, [str(id) for id in ids])
+        return [row['id'] for row in rows]
+
+    async def _save_author(
+        self, connection: asyncpg.Connection, data: PostModel
+    ) -> None:
+        if data.author:
+            await connection.execute(
+                INSERT_AUTHOR_IF_MISSING, *author_values(data.author)
+            )
+
+    async def _save_authors(
+        self, connection: asyncpg.Connection, data: List[PostModel]
+    ) -> None:
+        authors = {
+            str(post.author.id): author_values(post.author)
+            for post in data
+            if post.author
+        }
+        if authors:
+            await connection.execute(
+                INSERT_AUTHORS_IF_MISSING, *columns_of(list(authors.values()))
+            )
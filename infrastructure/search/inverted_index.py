@@ -0,0 +1,264 @@
+import heapq
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple, Union
+
+from unidecode import unidecode
+
+from application.interfaces.search_index_interface import SearchIndexInterface
+
+logger = logging.getLogger('api_gateway')
+
+MAGIC = b'PSIX'
+VERSION = 2
+# Title, description and body: a title match counts as three body matches.
+FIELD_WEIGHTS = (3, 2, 1)
+
+Postings = Union[array, memoryview]
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    # The same folding as slugs: markup dropped, unidecode, lowercase words.
+    if not text:
+        return []
+    return re.findall(r'\w+', unidecode(re.sub(r'<[^>]+>', ' ', text)).lower())
+
+
+class InvertedIndex(SearchIndexInterface):
+    """BM25 over posts, kept in flat arrays of document slots.
+
+    Each term maps to parallel arrays of slots and weighted term counts.
+    Removed documents leave a tombstone until the next compaction, so their
+    postings still count towards document frequencies until then. Each
+    slot can also hold the serialised post a hit is served from, so search
+    does not need the database.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self._k1 = k1
+        self._b = b
+        self._ids: List[Optional[str]] = []
+        self._slots: Dict[str, int] = {}
+        self._lengths = array('I')
+        self._documents: List[Optional[Union[bytes, memoryview]]] = []
+        self._docs: Dict[str, Postings] = {}
+        self._freqs: Dict[str, Postings] = {}
+        self._total_length = 0
+        self._deleted = 0
+        self._buffer: Optional[mmap.mmap] = None
+        self.synced_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def add(
+        self,
+        id: str,
+        title: Optional[str],
+        description: Optional[str],
+        body: Optional[str],
+        document: Optional[bytes] = None,
+    ) -> None:
+        id = str(id)
+        self.remove(id)
+
+        counts: Dict[str, int] = defaultdict(int)
+        for text, weight in zip((title, description, body), FIELD_WEIGHTS):
+            for token in tokenize(text):
+                counts[token] += weight
+
+        slot = len(self._ids)
+        self._ids.append(id)
+        self._slots[id] = slot
+        self._documents.append(document)
+        length = sum(counts.values())
+        self._lengths.append(length)
+        self._total_length += length
+        for term, count in counts.items():
+            docs, freqs = self._writable(term)
+            docs.append(slot)
+            freqs.append(count)
+
+    def remove(self, id: str) -> None:
+        slot = self._slots.pop(str(id), None)
+        if slot is None:
+            return
+        self._ids[slot] = None
+        self._documents[slot] = None
+        self._total_length -= self._lengths[slot]
+        self._deleted += 1
+        if self._deleted > max(1000, len(self._slots)):
+            self.compact()
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        after: Optional[Tuple[float, str]] = None,
+    ) -> List[Tuple[str, float]]:
+        terms = set(tokenize(query))
+        if not terms or not self._slots:
+            return []
+
+        total = len(self._ids)
+        average_length = self._total_length / len(self._slots) or 1.0
+        k1, b, ids, lengths = self._k1, self._b, self._ids, self._lengths
+        scores: Dict[int, float] = defaultdict(float)
+        for term in terms:
+            docs = self._docs.get(term)
+            if docs is None:
+                continue
+            idf = math.log(1 + (total - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc, freq in zip(docs, self._freqs[term]):
+                if ids[doc] is None:
+                    continue
+                norm = k1 * (1 - b + b * lengths[doc] / average_length)
+                scores[doc] += idf * freq * (k1 + 1) / (freq + norm)
+
+        # Best first, ties broken by id descending, like the SQL search.
+        hits = ((score, ids[doc]) for doc, score in scores.items())
+        if after is not None:
+            hits = (hit for hit in hits if hit < after)
+        return [(id, score) for score, id in heapq.nlargest(limit, hits)]
+
+    def document(self, id: str) -> Optional[bytes]:
+        slot = self._slots.get(str(id))
+        if slot is None or self._documents[slot] is None:
+            return None
+        return bytes(self._documents[slot])
+
+    def compact(self) -> None:
+        remap = array('i', [-1]) * len(self._ids)
+        ids: List[Optional[str]] = []
+        lengths = array('I')
+        documents = []
+        for slot, id in enumerate(self._ids):
+            if id is not None:
+                remap[slot] = len(ids)
+                ids.append(id)
+                lengths.append(self._lengths[slot])
+                document = self._documents[slot]
+                documents.append(document and bytes(document))
+
+        for term in list(self._docs):
+            docs, freqs = array('I'), array('I')
+            for doc, freq in zip(self._docs[term], self._freqs[term]):
+                if remap[doc] >= 0:
+                    docs.append(remap[doc])
+                    freqs.append(freq)
+            if docs:
+                self._docs[term], self._freqs[term] = docs, freqs
+            else:
+                del self._docs[term], self._freqs[term]
+
+        self._ids = ids
+        self._slots = {id: slot for slot, id in enumerate(ids)}
+        self._lengths = lengths
+        self._documents = documents
+        self._deleted = 0
+        # Nothing points into the snapshot any more.
+        self._buffer = None
+
+    def snapshot(self, path: str) -> None:
+        if self._deleted:
+            self.compact()
+        terms = sorted(self._docs)
+        documents = [document or b'' for document in self._documents]
+        header = json.dumps(
+            {
+                'version': VERSION,
+                'byteorder': sys.byteorder,
+                'synced_at': self.synced_at,
+                'ids': self._ids,
+                'terms': [[term, len(self._docs[term])] for term in terms],
+            }
+        ).encode()
+
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as file:
+            file.write(MAGIC + struct.pack('<I', len(header)) + header)
+            file.write(b'\0' * (-(len(header) + 8) % 4))
+            file.write(self._lengths)
+            file.write(array('I', map(len, documents)))
+            for term in terms:
+                file.write(self._docs[term])
+                file.write(self._freqs[term])
+            for document in documents:
+                file.write(document)
+        # A worker restoring concurrently sees the old file or the new one.
+        os.replace(temporary, path)
+
+    @classmethod
+    def restore(cls, path: str, **options) -> 'InvertedIndex':
+        # Postings stay in the mapped file until a term is written to, so
+        # startup costs one read of the header, not a rebuild.
+        with open(path, 'rb') as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(buffer)
+        if view[:4] != MAGIC:
+            raise ValueError('Not a search index snapshot.')
+
+        (size,) = struct.unpack_from('<I', buffer, 4)
+        header = json.loads(bytes(view[8 : 8 + size]))
+        if (
+            header['version'] != VERSION
+            or header['byteorder'] != sys.byteorder
+        ):
+            raise ValueError('Incompatible search index snapshot.')
+
+        ids = header['ids']
+        offset = 8 + size + (-(size + 8) % 4)
+        expected = offset + 8 * len(ids)
+        expected += sum(8 * count for _, count in header['terms'])
+        if len(buffer) < expected:
+            raise ValueError('Truncated search index snapshot.')
+        sizes = view[offset + 4 * len(ids) : offset + 8 * len(ids)].cast('I')
+        if len(buffer) != expected + sum(sizes):
+            raise ValueError('Truncated search index snapshot.')
+
+        index = cls(**options)
+        index._ids = ids
+        index._slots = {id: slot for slot, id in enumerate(ids)}
+        index._lengths.frombytes(view[offset : offset + 4 * len(ids)])
+        offset += 8 * len(ids)
+        for term, count in header['terms']:
+            size = 4 * count
+            index._docs[term] = view[offset : offset + size].cast('I')
+            index._freqs[term] = view[offset + size : offset + 2 * size].cast(
+                'I'
+            )
+            offset += 2 * size
+        for size in sizes:
+            index._documents.append(view[offset : offset + size] or None)
+            offset += size
+        index._total_length = sum(index._lengths)
+        index._buffer = buffer
+        index.synced_at = header['synced_at']
+        return index
+
+    def _writable(self, term: str) -> Tuple[array, array]:
+        docs = self._docs.get(term)
+        if docs is None:
+            docs = self._docs[term] = array('I')
+            self._freqs[term] = array('I')
+        elif not isinstance(docs, array):
+            # Copy on write: mapped postings are read-only.
+            docs = self._docs[term] = array('I', bytes(docs))
+            self._freqs[term] = array('I', bytes(self._freqs[term]))
+        return docs, self._freqs[term]
+
+
+def restore_search_index(path: str) -> InvertedIndex:
+    try:
+        return InvertedIndex.restore(path)
+    except (OSError, ValueError) as e:
+        logger.info(f'Building the search index from scratch: {e}')
+        return InvertedIndex()
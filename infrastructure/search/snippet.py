@@ -0,0 +1,69 @@
+import re
+from typing import List, Optional, Set
+
+from .inverted_index import tokenize
+
+# The shape of the ts_headline snippets this replaces.
+MAX_WORDS = 35
+MIN_WORDS = 15
+MAX_FRAGMENTS = 2
+LEADING_WORDS = 5
+FRAGMENT_DELIMITER = ' ... '
+START_SELECTION = '<mark>'
+STOP_SELECTION = '</mark>'
+
+
+def query_terms(query: str) -> Set[str]:
+    # The words of a websearch query a match can contain: negated words and
+    # the OR operator are left out.
+    terms: Set[str] = set()
+    for chunk in query.replace('"', ' ').split():
+        if chunk.startswith('-') or chunk.lower() == 'or':
+            continue
+        terms.update(tokenize(chunk))
+    return terms
+
+
+def headline(text: Optional[str], query: str) -> Optional[str]:
+    """Fragments of `text` around the words matching `query`, marked.
+
+    Words are compared folded, as the search vector is, so a query for
+    "cafe" marks "Café"; the snippet keeps the original spelling.
+    """
+    if not text:
+        return None
+    words = re.sub(r'<[^>]+>', ' ', text).split()
+    terms = query_terms(query)
+    matches = [
+        position
+        for position, word in enumerate(words)
+        if terms.intersection(tokenize(word))
+    ]
+    if not matches:
+        return ' '.join(words[:MIN_WORDS])
+
+    fragments: List[str] = []
+    end = 0
+    for position in matches:
+        if position < end:
+            continue
+        if len(fragments) == MAX_FRAGMENTS:
+            break
+        start = max(end, position - LEADING_WORDS)
+        end = min(len(words), start + MAX_WORDS)
+        fragments.append(
+            ' '.join(mark(word, terms) for word in words[start:end])
+        )
+    return FRAGMENT_DELIMITER.join(fragments)
+
+
+def mark(word: str, terms: Set[str]) -> str:
+    return re.sub(
+        r'\w+',
+        lambda match: (
+            f'{START_SELECTION}{match[0]}{STOP_SELECTION}'
+            if terms.intersection(tokenize(match[0]))
+            else match[0]
+        ),
+        word,
+    )
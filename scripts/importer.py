@@ -0,0 +1,243 @@
+import argparse
+import asyncio
+import csv
+import json
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+import asyncpg
+from pydantic import ValidationError
+
+from api.database.postgres import get_postgres_pool
+from application.dtos.post_dto import PostDTO
+from application.services.post_service import PostService
+from infrastructure.models.author_model import AuthorModel
+from infrastructure.models.post_model import PostModel
+from infrastructure.repositories.post_repository import PostRepository
+
+AUTHOR_FIELD_PREFIX = 'author_'
+SELECT_AUTHOR_NAMES = 'SELECT id, firstname, lastname FROM authors'
+
+
+class ImportReport:
+    def __init__(
+        self, rejects: Optional[TextIO] = None, stream: TextIO = sys.stderr
+    ):
+        self._rejects = rejects
+        self._stream = stream
+        self._started = time.monotonic()
+        self.imported = 0
+        self.rejected = 0
+
+    def reject(self, line: int, error: str) -> None:
+        self.rejected += 1
+        if self._rejects is not None:
+            self._rejects.write(json.dumps({'line': line, 'error': error}))
+            self._rejects.write('\n')
+
+    def add_imported(self, count: int) -> None:
+        self.imported += count
+        print(self.summary(), file=self._stream, flush=True)
+
+    def summary(self) -> str:
+        elapsed = time.monotonic() - self._started
+        rate = self.imported / elapsed if elapsed else 0.0
+        return (
+            f'{self.imported} imported, {self.rejected} rejected '
+            f'({rate:.0f} posts/s)'
+        )
+
+
+class AuthorIndex:
+    """Maps author names to ids so each author is written only once."""
+
+    def __init__(self, existing: Iterable[Dict[str, Any]] = ()):
+        self._ids: Dict[Tuple[str, str], str] = {}
+        self._new: List[AuthorModel] = []
+        for author in existing:
+            key = self._key(author['firstname'], author['lastname'])
+            self._ids.setdefault(key, str(author['id']))
+
+    def resolve(self, author: AuthorModel) -> AuthorModel:
+        key = self._key(author.firstname, author.lastname)
+        id = self._ids.get(key)
+        if id is None:
+            self._ids[key] = str(author.id)
+            self._new.append(author)
+        else:
+            author.id = id
+        return author
+
+    def take_new(self) -> List[AuthorModel]:
+        new, self._new = self._new, []
+        return new
+
+    def _key(self, firstname: str, lastname: str) -> Tuple[str, str]:
+        return firstname.strip().casefold(), lastname.strip().casefold()
+
+
+def read_records(
+    file: TextIO, format: str, report: ImportReport
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    if format == 'csv':
+        # Line 1 is the header.
+        yield from enumerate(csv.DictReader(file), start=2)
+        return
+
+    for line, text in enumerate(file, start=1):
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+        except json.JSONDecodeError as e:
+            report.reject(line, f'Invalid JSON: {e}')
+            continue
+        if not isinstance(record, dict):
+            report.reject(
+                line, f'Expected a JSON object, got {type(record).__name__}.'
+            )
+            continue
+        yield line, record
+
+
+def normalise_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    # CSV rows are flat and use empty cells for missing values.
+    record = {
+        key: value for key, value in record.items() if value not in ('', None)
+    }
+    author = {
+        key[len(AUTHOR_FIELD_PREFIX) :]: record.pop(key)
+        for key in list(record)
+        if key.startswith(AUTHOR_FIELD_PREFIX) and key != 'author_id'
+    }
+    if author and 'author' not in record:
+        record['author'] = author
+    return record
+
+
+def parse_posts(
+    records: Iterable[Tuple[int, Dict[str, Any]]], report: ImportReport
+) -> Iterator[Tuple[int, PostDTO]]:
+    for line, record in records:
+        try:
+            yield line, PostDTO.model_validate(normalise_record(record))
+        except ValidationError as e:
+            report.reject(line, format_validation_error(e))
+
+
+def build_models(
+    posts: Iterable[Tuple[int, PostDTO]],
+    service: PostService,
+    authors: AuthorIndex,
+    report: ImportReport,
+) -> Iterator[Tuple[int, PostModel]]:
+    for line, post in posts:
+        try:
+            model = service.build_new_post_model(post)
+        except ValueError as e:
+            report.reject(line, str(e))
+            continue
+        if model.author is not None:
+            model.author = authors.resolve(model.author)
+            model.author_id = model.author.id
+        yield line, model
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def format_validation_error(error: ValidationError) -> str:
+    return '; '.join(
+        f'{".".join(map(str, detail["loc"]))}: {detail["msg"]}'
+        for detail in error.errors()
+    )
+
+
+async def write_batches(
+    repository: PostRepository,
+    batches: Iterable[List[Tuple[int, PostModel]]],
+    authors: AuthorIndex,
+    report: ImportReport,
+) -> None:
+    for batch in batches:
+        models = [model for _, model in batch]
+        slugs = [model.slug for model in models]
+        try:
+            await repository.copy_many(models, authors.take_new())
+            written = {model.id for model in models}
+        except asyncpg.UniqueViolationError:
+            # Some rows already exist: retry the batch on the slower path
+            # that skips conflicts and reports what was actually inserted.
+            for model, slug in zip(models, slugs):
+                model.slug = slug
+            written = set(await repository.create_many(models))
+
+        for line, model in batch:
+            if model.id not in written:
+                report.reject(line, 'Post already exists.')
+        report.add_imported(len(written))
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Import posts and authors from an NDJSON or CSV file.'
+    )
+    parser.add_argument('path', type=Path)
+    parser.add_argument('--format', choices=['ndjson', 'csv'])
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument(
+        '--rejects', type=Path, help='write rejected rows here as NDJSON'
+    )
+    args = parser.parse_args(argv)
+    if args.format is None:
+        args.format = 'csv' if args.path.suffix == '.csv' else 'ndjson'
+    return args
+
+
+async def import_file(
+    pool: asyncpg.Pool,
+    file: TextIO,
+    args: argparse.Namespace,
+    report: ImportReport,
+) -> None:
+    repository = PostRepository(pool)
+    authors = AuthorIndex(await pool.fetch(SELECT_AUTHOR_NAMES))
+    models = build_models(
+        parse_posts(read_records(file, args.format, report), report),
+        PostService(repository),
+        authors,
+        report,
+    )
+    await write_batches(
+        repository, batched(models, args.batch_size), authors, report
+    )
+
+
+async def main(argv: Optional[List[str]] = None) -> ImportReport:
+    args = parse_args(argv)
+    rejects = open(args.rejects, 'w') if args.rejects else None
+    report = ImportReport(rejects)
+    pool = await get_postgres_pool()
+    try:
+        with open(args.path, newline='', encoding='utf-8') as file:
+            await import_file(pool, file, args, report)
+    finally:
+        await pool.close()
+        if rejects is not None:
+            rejects.close()
+    return report
+
+
+def run():
+    try:
+        report = asyncio.run(main())
+    except KeyboardInterrupt:
+        print('\nImport interrupted by user.')
+        exit(1)
+    print(f'Done: {report.summary()}')
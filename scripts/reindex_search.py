@@ -0,0 +1,21 @@
+import asyncio
+
+from api.database.postgres import get_postgres_pool
+from infrastructure.repositories.post_repository import PostRepository
+
+
+async def main() -> int:
+    pool = await get_postgres_pool()
+    try:
+        return await PostRepository(pool).index_missing_search_vectors()
+    finally:
+        await pool.close()
+
+
+def run():
+    try:
+        indexed = asyncio.run(main())
+    except KeyboardInterrupt:
+        print('\nIndexing interrupted by user.')
+        exit(1)
+    print(f'Indexed {indexed} posts for search.')
@@ -1,15 +1,100 @@
-import subprocess
+import os
+import random
+from importlib.util import find_spec
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+from uvicorn.supervisors import ChangeReload, Multiprocess
 
 from api.config.settings import settings
 
+APP = 'api.main:app'
+
+
+class RecyclingServer(uvicorn.Server):
+    """A worker that exits after a jittered number of requests.
+
+    Each worker process draws its own limit, so workers started together
+    are not all recycled at the same moment.
+    """
+
+    def __init__(self, config: uvicorn.Config, jitter: int = 0):
+        super().__init__(config)
+        self.jitter = jitter
+
+    def run(self, sockets: Optional[List] = None) -> None:
+        if self.config.limit_max_requests and self.jitter:
+            self.config.limit_max_requests += random.randint(0, self.jitter)
+        super().run(sockets)
+
+
+def available_cpus() -> int:
+    # Respects container CPU affinity where the platform exposes it.
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def worker_count() -> int:
+    if settings.SERVER_WORKERS > 0:
+        return settings.SERVER_WORKERS
+    return max(1, round(available_cpus() * settings.SERVER_WORKERS_PER_CORE))
+
+
+def server_options() -> Dict[str, Any]:
+    reload = settings.is_dev() and settings.SERVER_RELOAD
+    return {
+        'host': settings.SERVER_HOST,
+        'port': settings.SERVER_PORT,
+        'reload': reload,
+        'workers': 1 if reload else worker_count(),
+        'loop': 'uvloop' if find_spec('uvloop') else 'asyncio',
+        'http': 'httptools' if find_spec('httptools') else 'h11',
+        'backlog': settings.SERVER_BACKLOG,
+        'timeout_keep_alive': settings.SERVER_KEEP_ALIVE,
+        'limit_concurrency': settings.SERVER_LIMIT_CONCURRENCY or None,
+        'limit_max_requests': (
+            None if reload else settings.SERVER_MAX_REQUESTS or None
+        ),
+        'timeout_graceful_shutdown': settings.SERVER_GRACEFUL_TIMEOUT,
+        # The application configures the uvicorn loggers itself.
+        'log_config': None,
+    }
+
+
+def serve(options: Dict[str, Any]) -> None:
+    config = uvicorn.Config(APP, **options)
+    server = RecyclingServer(config, settings.SERVER_MAX_REQUESTS_JITTER)
+    if config.should_reload:
+        ChangeReload(
+            config, target=server.run, sockets=[config.bind_socket()]
+        ).run()
+    elif config.workers > 1 or config.limit_max_requests:
+        # A recycled worker exits; only the supervisor starts a new one,
+        # so it is used even for a single worker.
+        Multiprocess(
+            config, target=server.run, sockets=[config.bind_socket()]
+        ).run()
+    else:
+        server.run()
+
 
 def run():
-    command = f'uvicorn api.main:app --host 0.0.0.0 --port {settings.SERVER_PORT} --reload'
+    logger = settings.configure_logging()
+    options = server_options()
+    logger.info(
+        f'Starting {options["workers"]} worker(s) on '
+        f'{options["host"]}:{options["port"]} with {options["loop"]} '
+        f'and {options["http"]}'
+        f'{", reloading on changes" if options["reload"] else ""}'
+    )
 
     try:
-        result = subprocess.run(command, shell=True)
-        if result.returncode != 0:
-            exit(result.returncode)
+        serve(options)
     except KeyboardInterrupt:
         print('\nServer interrupted by user. Shutting down gracefully.')
         exit(0)
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,302 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from application.dtos.post_list_query_dto import PostListQueryDTO
+from application.interfaces.post_repository_interface import (
+    PostRepositoryInterface,
+)
+from infrastructure.models.author_model import AuthorModel
+from infrastructure.models.post_model import PostModel
+from infrastructure.repositories.cached_post_repository import (
+    CachedPostRepository,
+)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+
+        return queue
+
+    async def execute(self):
+        return [
+            await getattr(self._redis, name)(*args, **kwargs)
+            for name, args, kwargs in self._commands
+        ]
+
+
+class FakeAsyncRedis:
+    def __init__(self):
+        self.data = {}
+        self.error = None
+
+    def _check(self):
+        if self.error:
+            raise self.error
+
+    async def get(self, key):
+        self._check()
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self._check()
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        self._check()
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def incr(self, key):
+        self._check()
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def register_script(self, script):
+        # The only script is the guarded store of an entry and its pointer.
+        async def store(keys, args):
+            self._check()
+            if (self.data.get(keys[0]) or '') != args[0]:
+                return 0
+            self.data[keys[1]] = args[1]
+            if len(keys) > 2:
+                self.data[keys[2]] = args[3]
+            return 1
+
+        return store
+
+
+@pytest.fixture
+def post():
+    author = AuthorModel(id=str(uuid4()), firstname='John', lastname='Doe')
+    return PostModel(
+        id=str(uuid4()),
+        title='Test Post',
+        body='Body',
+        slug='test-post',
+        author_id=author.id,
+        author=author,
+    )
+
+
+@pytest.fixture
+def redis():
+    return FakeAsyncRedis()
+
+
+@pytest.fixture
+def inner(post):
+    repository = AsyncMock(spec=PostRepositoryInterface)
+    repository.view.return_value = post
+    repository.view_by_slug.return_value = post
+    repository.update_many.return_value = [post.id]
+    repository.list.return_value = [post]
+    repository.list_page.return_value = ([post], 'next')
+    return repository
+
+
+@pytest.fixture
+def repository(inner, redis):
+    return CachedPostRepository(inner, redis, early_refresh_beta=0)
+
+
+def test_view_reads_through_once_then_hits_cache(repository, inner, post):
+    async def scenario():
+        first = await repository.view(post.id)
+        second = await repository.view(post.id)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert inner.view.await_count == 1
+    assert second.title == post.title
+    assert second.author.firstname == 'John'
+
+
+def test_view_caches_slug_pointer(repository, redis, post):
+    asyncio.run(repository.view(post.id))
+
+    assert redis.data['posts:slug:test-post'] == post.id
+
+
+def test_missing_post_is_negatively_cached(repository, inner):
+    inner.view.return_value = None
+
+    async def scenario():
+        await repository.view('missing')
+        return await repository.view('missing')
+
+    assert asyncio.run(scenario()) is None
+    assert inner.view.await_count == 1
+
+
+def test_concurrent_misses_load_once(repository, inner, post):
+    async def slow_view(id):
+        await asyncio.sleep(0.01)
+        return post
+
+    inner.view.side_effect = slow_view
+
+    async def scenario():
+        return await asyncio.gather(
+            *(repository.view(post.id) for _ in range(10))
+        )
+
+    results = asyncio.run(scenario())
+
+    assert inner.view.await_count == 1
+    assert all(result.id == post.id for result in results)
+
+
+def test_list_page_is_cached_per_query(repository, inner):
+    async def scenario():
+        await repository.list_page(PostListQueryDTO(limit=10))
+        await repository.list_page(PostListQueryDTO(limit=10))
+        posts, cursor = await repository.list_page(PostListQueryDTO(limit=5))
+        return cursor
+
+    assert asyncio.run(scenario()) == 'next'
+    assert inner.list_page.await_count == 2
+
+
+def test_writes_invalidate_post_and_bump_list_version(
+    repository, inner, redis, post
+):
+    async def scenario():
+        await repository.view(post.id)
+        await repository.list()
+        updated = post.model_copy(update={'slug': 'new-slug'})
+        await repository.update(post.id, updated)
+        assert 'posts:slug:test-post' not in redis.data
+        await repository.view(post.id)
+        await repository.list()
+
+    asyncio.run(scenario())
+
+    assert inner.view.await_count == 2
+    assert inner.list.await_count == 2
+    assert redis.data['posts:list_version'] == 1
+
+
+def test_load_overlapping_a_write_is_not_stored(
+    repository, inner, redis, post
+):
+    loading, release = asyncio.Event(), asyncio.Event()
+
+    async def slow_view(id):
+        loading.set()
+        await release.wait()
+        return post
+
+    inner.view.side_effect = slow_view
+
+    async def scenario():
+        reader = asyncio.create_task(repository.view(post.id))
+        await loading.wait()
+        await repository.update(post.id, post)
+        release.set()
+        return await reader
+
+    assert asyncio.run(scenario()).title == post.title
+    assert f'posts:id:{post.id}' not in redis.data
+    assert 'posts:slug:test-post' not in redis.data
+
+
+def test_delete_invalidates_cached_post(repository, inner, redis, post):
+    async def scenario():
+        await repository.view(post.id)
+        await repository.delete(post.id)
+
+    asyncio.run(scenario())
+
+    assert f'posts:id:{post.id}' not in redis.data
+    inner.delete.assert_awaited_once_with(post.id)
+
+
+def test_expiring_entries_are_refreshed_early(inner, redis, post):
+    repository = CachedPostRepository(inner, redis, early_refresh_beta=1)
+
+    async def scenario():
+        await repository.view(post.id)
+        key = f'posts:id:{post.id}'
+        entry = json.loads(redis.data[key])
+        entry.update(delta=10**9, expires_at=entry['expires_at'] - 299)
+        redis.data[key] = json.dumps(entry)
+        await repository.view(post.id)
+
+    asyncio.run(scenario())
+
+    assert inner.view.await_count == 2
+
+
+def test_redis_outage_reads_through(repository, inner, redis, post):
+    redis.error = ConnectionError('down')
+
+    result = asyncio.run(repository.view(post.id))
+
+    assert result is post
+
+
+def test_stats_report_redis_hit_ratio(repository, post):
+    async def scenario():
+        await repository.view(post.id)
+        await repository.view(post.id)
+
+    asyncio.run(scenario())
+
+    assert repository.stats()['redis'] == {
+        'hits': 1,
+        'misses': 1,
+        'hit_ratio': 0.5,
+    }
+
+
+def test_view_by_slug_follows_cached_pointer(repository, inner, post):
+    async def scenario():
+        first = await repository.view_by_slug('test-post')
+        second = await repository.view_by_slug('test-post')
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert second.id == post.id
+    assert inner.view_by_slug.await_count == 1
+    assert inner.view.await_count == 0
+
+
+def test_view_by_slug_ignores_stale_pointer(repository, inner, redis, post):
+    redis.data['posts:slug:old-slug'] = post.id
+
+    result = asyncio.run(repository.view_by_slug('old-slug'))
+
+    inner.view_by_slug.assert_awaited_once_with('old-slug')
+    assert result is post
+
+
+def test_update_many_invalidates_updated_posts(repository, inner, redis, post):
+    async def scenario():
+        await repository.view(post.id)
+        return await repository.update_many([post])
+
+    assert asyncio.run(scenario()) == [post.id]
+    assert f'posts:id:{post.id}' not in redis.data
+    assert redis.data['posts:list_version'] == 1
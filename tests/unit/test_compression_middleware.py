@@ -0,0 +1,162 @@
+import gzip
+
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from api.middlewares.compression_middleware import (
+    CompressionMiddleware,
+    GzipEncoder,
+)
+from infrastructure.cache.memory_cache import MemoryCache
+
+BODY = b'{"body": "' + b'lorem ipsum dolor sit amet ' * 100 + b'"}'
+
+
+class CountingGzipEncoder(GzipEncoder):
+    created = 0
+
+    def __init__(self):
+        CountingGzipEncoder.created += 1
+        super().__init__(6)
+
+
+def make_client(minimum_size=500):
+    app = FastAPI()
+
+    @app.get('/post')
+    def post():
+        return Response(
+            BODY, media_type='application/json', headers={'ETag': '"1.2"'}
+        )
+
+    @app.get('/small')
+    def small():
+        return Response(b'{"ok": true}', media_type='application/json')
+
+    @app.get('/encoded')
+    def encoded():
+        return Response(
+            gzip.compress(BODY),
+            media_type='application/json',
+            headers={'Content-Encoding': 'gzip'},
+        )
+
+    @app.get('/image')
+    def image():
+        return Response(BODY, media_type='image/png')
+
+    @app.get('/stream')
+    def stream():
+        return StreamingResponse(
+            iter([BODY, BODY, BODY]), media_type='application/x-ndjson'
+        )
+
+    CountingGzipEncoder.created = 0
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=minimum_size,
+        cache=MemoryCache(ttl=60.0),
+        encoders={'gzip': CountingGzipEncoder},
+    )
+    return TestClient(app)
+
+
+def test_compresses_large_response_with_gzip():
+    response = make_client().get('/post', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.headers['vary'] == 'Accept-Encoding'
+    assert int(response.headers['content-length']) < len(BODY)
+    assert response.content == BODY
+
+
+def test_weakens_etag_of_compressed_response():
+    response = make_client().get('/post', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers['etag'] == 'W/"1.2"'
+
+
+def test_leaves_response_alone_without_accepted_encoding():
+    client = make_client()
+
+    for header in ('identity', 'gzip;q=0', 'br'):
+        response = client.get('/post', headers={'Accept-Encoding': header})
+        assert 'content-encoding' not in response.headers
+        assert response.headers['etag'] == '"1.2"'
+        assert response.content == BODY
+
+
+def test_accepts_wildcard_encoding():
+    response = make_client().get('/post', headers={'Accept-Encoding': '*'})
+
+    assert response.headers['content-encoding'] == 'gzip'
+
+
+def test_skips_responses_below_minimum_size():
+    response = make_client().get('/small', headers={'Accept-Encoding': 'gzip'})
+
+    assert 'content-encoding' not in response.headers
+    assert response.content == b'{"ok": true}'
+
+
+def test_skips_already_encoded_responses():
+    response = make_client().get(
+        '/encoded', headers={'Accept-Encoding': 'gzip'}
+    )
+
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.content == BODY
+    assert CountingGzipEncoder.created == 0
+
+
+def test_skips_incompressible_content_types():
+    response = make_client().get('/image', headers={'Accept-Encoding': 'gzip'})
+
+    assert 'content-encoding' not in response.headers
+
+
+def test_compresses_streaming_responses_chunk_by_chunk():
+    client = make_client(minimum_size=0)
+
+    with client.stream(
+        'GET', '/stream', headers={'Accept-Encoding': 'gzip'}
+    ) as response:
+        raw = b''.join(response.iter_raw())
+
+    assert response.headers['content-encoding'] == 'gzip'
+    assert 'content-length' not in response.headers
+    assert gzip.decompress(raw) == BODY * 3
+    assert CountingGzipEncoder.created == 1
+
+
+def test_reuses_compressed_bytes_for_the_same_etag():
+    client = make_client()
+
+    first = client.get('/post', headers={'Accept-Encoding': 'gzip'})
+    second = client.get('/post', headers={'Accept-Encoding': 'gzip'})
+
+    assert first.content == second.content == BODY
+    assert CountingGzipEncoder.created == 1
+
+
+def test_does_not_cache_responses_without_etag():
+    client = make_client(minimum_size=0)
+
+    client.get('/small', headers={'Accept-Encoding': 'gzip'})
+    client.get('/small', headers={'Accept-Encoding': 'gzip'})
+
+    assert CountingGzipEncoder.created == 2
+
+
+def test_prefers_highest_quality_then_server_order():
+    middleware = CompressionMiddleware(
+        FastAPI(),
+        minimum_size=0,
+        encoders={'br': object, 'zstd': object, 'gzip': object},
+    )
+
+    assert middleware.choose_encoding('gzip, br, zstd') == 'br'
+    assert middleware.choose_encoding('gzip, br;q=0.5') == 'gzip'
+    assert middleware.choose_encoding('zstd;q=0.9, gzip;q=0.8') == 'zstd'
+    assert middleware.choose_encoding('deflate') is None
@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.routes.conditional import is_not_modified, make_etag
+from api.routes.post_routes import router
+from application.services.post_service import PostService
+from infrastructure.models.post_model import PostModel
+
+UPDATED_AT = datetime(2024, 5, 1, 12, 0, 0, 500000, tzinfo=timezone.utc)
+
+
+class VersionedRepository:
+    def __init__(self, post):
+        self.post = post
+        self.views = 0
+        self.version_lookups = 0
+
+    async def view(self, id):
+        self.views += 1
+        return self.post if self.post and id == self.post.id else None
+
+    async def view_version(self, id):
+        self.version_lookups += 1
+        if self.post is None or id != self.post.id:
+            return None
+        return self.post.version, self.post.updated_at
+
+
+@pytest.fixture
+def post():
+    return PostModel(
+        id=str(uuid4()),
+        title='Post',
+        body='Body',
+        slug='post',
+        version=4,
+        updated_at=UPDATED_AT,
+    )
+
+
+@pytest.fixture
+def repository(post):
+    return VersionedRepository(post)
+
+
+@pytest.fixture
+def client(repository):
+    app = FastAPI()
+    app.include_router(router)
+    app.state.post_service = PostService(repository)
+    return TestClient(app)
+
+
+def test_get_post_sends_validators(client, post):
+    response = client.get(f'/api/v1/posts/{post.id}')
+
+    assert response.status_code == 200
+    assert response.json()['body'] == 'Body'
+    assert response.headers['etag'] == f'"{post.id}.4"'
+    assert response.headers['last-modified'] == (
+        'Wed, 01 May 2024 12:00:00 GMT'
+    )
+
+
+def test_matching_etag_is_answered_without_loading_the_post(
+    client, repository, post
+):
+    response = client.get(
+        f'/api/v1/posts/{post.id}',
+        headers={'If-None-Match': f'"other", W/"{post.id}.4"'},
+    )
+
+    assert response.status_code == 304
+    assert response.content == b''
+    assert response.headers['etag'] == f'"{post.id}.4"'
+    assert repository.views == 0
+    assert repository.version_lookups == 1
+
+
+def test_stale_etag_gets_the_full_post(client, repository, post):
+    response = client.get(
+        f'/api/v1/posts/{post.id}', headers={'If-None-Match': '"x.3"'}
+    )
+
+    assert response.status_code == 200
+    assert repository.views == 1
+
+
+def test_if_modified_since_compares_whole_seconds(client, repository, post):
+    since = format_datetime(UPDATED_AT.replace(microsecond=0), usegmt=True)
+
+    response = client.get(
+        f'/api/v1/posts/{post.id}', headers={'If-Modified-Since': since}
+    )
+
+    assert response.status_code == 304
+    assert repository.views == 0
+
+
+def test_conditional_get_of_missing_post_is_404(client):
+    response = client.get(
+        f'/api/v1/posts/{uuid4()}', headers={'If-None-Match': '*'}
+    )
+
+    assert response.status_code == 404
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    headers = {
+        'if-none-match': '"other"',
+        'if-modified-since': format_datetime(
+            UPDATED_AT + timedelta(days=1), usegmt=True
+        ),
+    }
+
+    assert not is_not_modified(headers, make_etag('a', 1), UPDATED_AT)
+    assert not is_not_modified(
+        {'if-modified-since': 'garbage'}, make_etag('a', 1), UPDATED_AT
+    )
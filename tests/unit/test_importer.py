@@ -0,0 +1,232 @@
+import asyncio
+import io
+import json
+from uuid import uuid4
+
+import asyncpg
+
+from application.services.post_service import PostService
+from scripts.importer import (
+    AuthorIndex,
+    ImportReport,
+    batched,
+    build_models,
+    parse_args,
+    parse_posts,
+    read_records,
+    write_batches,
+)
+
+
+class FakeRepository:
+    def __init__(self, fail_copy=False, existing=()):
+        self.fail_copy = fail_copy
+        self.existing = set(existing)
+        self.copied = []
+        self.created = []
+
+    async def copy_many(self, data, new_authors=()):
+        if self.fail_copy:
+            raise asyncpg.UniqueViolationError('duplicate key')
+        self.copied.append((data, list(new_authors)))
+
+    async def create_many(self, data):
+        self.created.append(data)
+        return [post.id for post in data if post.id not in self.existing]
+
+
+def run_pipeline(text, format, report, authors=None):
+    authors = authors or AuthorIndex()
+    records = read_records(io.StringIO(text), format, report)
+    return list(
+        build_models(
+            parse_posts(records, report), PostService(None), authors, report
+        )
+    )
+
+
+def test_ndjson_rows_are_validated_and_rejected_with_line_numbers():
+    rejects = io.StringIO()
+    report = ImportReport(rejects, stream=io.StringIO())
+    text = '\n'.join(
+        [
+            json.dumps(
+                {'title': 'Hello World', 'description': 'D', 'body': 'B'}
+            ),
+            '{not json',
+            json.dumps({'description': 'no title'}),
+            json.dumps({'title': 'No body', 'description': 'D'}),
+        ]
+    )
+
+    models = run_pipeline(text, 'ndjson', report)
+
+    assert [(line, model.slug) for line, model in models] == [
+        (1, 'hello-world')
+    ]
+    assert report.rejected == 3
+    rejected = [json.loads(line) for line in rejects.getvalue().splitlines()]
+    assert [reject['line'] for reject in rejected] == [2, 3, 4]
+    assert rejected[1]['error'].startswith('title:')
+    assert rejected[2]['error'] == 'Body is required.'
+
+
+def test_ndjson_values_that_are_not_objects_are_rejected():
+    rejects = io.StringIO()
+    report = ImportReport(rejects, stream=io.StringIO())
+    text = '\n'.join(
+        [
+            '[1, 2]',
+            '"x"',
+            json.dumps(
+                {'title': 'Hello World', 'description': 'D', 'body': 'B'}
+            ),
+            'null',
+        ]
+    )
+
+    models = run_pipeline(text, 'ndjson', report)
+
+    assert [line for line, _ in models] == [3]
+    rejected = [json.loads(line) for line in rejects.getvalue().splitlines()]
+    assert rejected == [
+        {'line': 1, 'error': 'Expected a JSON object, got list.'},
+        {'line': 2, 'error': 'Expected a JSON object, got str.'},
+        {'line': 4, 'error': 'Expected a JSON object, got NoneType.'},
+    ]
+
+
+def test_csv_author_columns_are_deduplicated_by_name():
+    report = ImportReport(stream=io.StringIO())
+    text = (
+        'title,description,body,status,author_firstname,author_lastname\n'
+        'First,D,B,true,John,Doe\n'
+        'Second,D,B,,john ,DOE\n'
+        'Third,D,B,false,Jane,Roe\n'
+    )
+    authors = AuthorIndex()
+
+    models = [model for _, model in run_pipeline(text, 'csv', report, authors)]
+
+    assert len(models) == 3
+    assert models[0].status is True
+    assert models[0].author_id == models[1].author_id
+    assert models[0].author_id != models[2].author_id
+    assert [author.firstname for author in authors.take_new()] == [
+        'John',
+        'Jane',
+    ]
+    assert authors.take_new() == []
+
+
+def test_csv_author_id_column_points_at_an_existing_author():
+    author_id = str(uuid4())
+    report = ImportReport(None, stream=io.StringIO())
+    text = (
+        'title,description,body,author_id\n'
+        f'With author,D,B,{author_id}\n'
+        'Without author,D,B,\n'
+    )
+
+    models = run_pipeline(text, 'csv', report)
+
+    assert [model.author_id for _, model in models] == [author_id, None]
+    assert all(model.author is None for _, model in models)
+    assert report.rejected == 0
+
+
+def test_existing_authors_are_reused():
+    existing_id = str(uuid4())
+    authors = AuthorIndex(
+        [{'id': existing_id, 'firstname': 'John', 'lastname': 'Doe'}]
+    )
+    text = json.dumps(
+        {
+            'title': 'Post',
+            'description': 'D',
+            'body': 'B',
+            'author': {'firstname': 'John', 'lastname': 'Doe'},
+        }
+    )
+
+    [(_, model)] = run_pipeline(
+        text, 'ndjson', ImportReport(stream=io.StringIO()), authors
+    )
+
+    assert model.author_id == existing_id
+    assert authors.take_new() == []
+
+
+def test_batched_yields_fixed_size_chunks_lazily():
+    consumed = []
+
+    def items():
+        for item in range(5):
+            consumed.append(item)
+            yield item
+
+    batches = batched(items(), 2)
+
+    assert next(batches) == [0, 1]
+    assert consumed == [0, 1]
+    assert list(batches) == [[2, 3], [4]]
+
+
+def test_write_batches_copies_each_batch_with_its_new_authors():
+    report = ImportReport(stream=io.StringIO())
+    authors = AuthorIndex()
+    text = '\n'.join(
+        json.dumps(
+            {
+                'title': f'Post {number}',
+                'description': 'D',
+                'body': 'B',
+                'author': {'firstname': f'A{number}', 'lastname': 'B'},
+            }
+        )
+        for number in range(3)
+    )
+    repository = FakeRepository()
+
+    async def scenario():
+        lines = read_records(io.StringIO(text), 'ndjson', report)
+        models = build_models(
+            parse_posts(lines, report), PostService(None), authors, report
+        )
+        await write_batches(repository, batched(models, 2), authors, report)
+
+    asyncio.run(scenario())
+
+    assert [len(posts) for posts, _ in repository.copied] == [2, 1]
+    assert [len(new) for _, new in repository.copied] == [2, 1]
+    assert report.imported == 3
+
+
+def test_write_batches_falls_back_when_rows_already_exist():
+    rejects = io.StringIO()
+    report = ImportReport(rejects, stream=io.StringIO())
+    models = run_pipeline(
+        '\n'.join(
+            json.dumps({'title': title, 'description': 'D', 'body': 'B'})
+            for title in ['One', 'Two']
+        ),
+        'ndjson',
+        report,
+    )
+    repository = FakeRepository(fail_copy=True, existing=[models[1][1].id])
+
+    asyncio.run(
+        write_batches(repository, batched(models, 10), AuthorIndex(), report)
+    )
+
+    assert report.imported == 1
+    assert json.loads(rejects.getvalue()) == {
+        'line': 2,
+        'error': 'Post already exists.',
+    }
+
+
+def test_format_is_inferred_from_the_file_extension():
+    assert parse_args(['posts.csv']).format == 'csv'
+    assert parse_args(['posts.ndjson']).format == 'ndjson'
+    assert parse_args(['posts.txt', '--format', 'csv']).format == 'csv'
@@ -0,0 +1,195 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from application.dtos.post_dto import PostDTO
+from application.dtos.post_search_query_dto import PostSearchQueryDTO
+from application.interfaces.post_repository_interface import (
+    PostRepositoryInterface,
+)
+from application.services.post_service import PostService
+from infrastructure.models.post_model import PostModel
+from infrastructure.search.inverted_index import (
+    InvertedIndex,
+    restore_search_index,
+    tokenize,
+)
+
+
+@pytest.fixture
+def index():
+    index = InvertedIndex()
+    index.add(
+        'a',
+        'Café com leite',
+        'About coffee',
+        '<p>coffee and milk</p>',
+        b'{"title": "Cafe"}',
+    )
+    index.add('b', 'Tea time', 'About tea', 'Tea with a little milk')
+    index.add('c', 'Other things', 'Nothing', 'Coffee, once.')
+    return index
+
+
+def test_tokenize_folds_like_slugs():
+    assert tokenize('<b>Ação</b> e CAFÉ-com-leite!') == [
+        'acao',
+        'e',
+        'cafe',
+        'com',
+        'leite',
+    ]
+    assert tokenize(None) == []
+
+
+def test_search_ranks_title_matches_first(index):
+    hits = index.search('coffee café', 10)
+
+    assert [id for id, _ in hits] == ['a', 'c']
+    assert hits[0][1] > hits[1][1]
+
+
+def test_search_pages_after_a_score_and_id(index):
+    first = index.search('milk', 1)
+    rest = index.search('milk', 10, after=(first[0][1], first[0][0]))
+
+    assert len(first) == 1
+    assert {id for id, _ in first + rest} == {'a', 'b'}
+
+
+def test_add_replaces_and_remove_hides_documents(index):
+    index.add('c', 'Tea', 'Tea', 'Tea')
+    index.remove('b')
+
+    assert [id for id, _ in index.search('tea', 10)] == ['c']
+    assert [id for id, _ in index.search('coffee', 10)] == ['a']
+    assert len(index) == 2
+
+
+def test_compact_drops_tombstones(index):
+    index.remove('a')
+    index.compact()
+
+    assert [id for id, _ in index.search('coffee', 10)] == ['c']
+    assert 'leite' not in index._docs
+
+
+def test_snapshot_restores_postings_from_the_mapped_file(index, tmp_path):
+    path = str(tmp_path / 'posts.index')
+    index.remove('b')
+    index.snapshot(path)
+
+    restored = InvertedIndex.restore(path)
+
+    assert len(restored) == 2
+    assert restored.search('coffee', 10) == index.search('coffee', 10)
+    assert isinstance(restored._docs['coffee'], memoryview)
+    assert restored.document('a') == index.document('a')
+    assert restored.document('b') is None
+    assert restored.document('c') is None
+    restored.add('d', 'Coffee news', None, 'coffee', b'{}')
+    restored.remove('a')
+    restored.compact()
+    assert [id for id, _ in restored.search('coffee', 1)] == ['d']
+    assert restored.document('d') == b'{}'
+
+
+def test_restore_rejects_other_files(tmp_path):
+    path = tmp_path / 'posts.index'
+    path.write_bytes(b'not an index')
+
+    with pytest.raises(ValueError):
+        InvertedIndex.restore(str(path))
+
+
+def test_sync_rebuilds_then_catches_up_from_snapshot(tmp_path):
+    path = str(tmp_path / 'posts.index')
+    posts = [
+        PostModel(id=str(uuid4()), title='First coffee', body='Body'),
+        PostModel(id=str(uuid4()), title='Second coffee', body='Body'),
+    ]
+
+    class Repository:
+        since = []
+
+        async def stream(self, since=None):
+            self.since.append(since)
+            for post in posts:
+                yield post
+
+    repository = Repository()
+    index = restore_search_index(path)
+    asyncio.run(PostService(repository, index).sync_search_index())
+    index.snapshot(path)
+    posts[:] = [posts[1]]
+    posts[0].title = 'Second tea'
+    warm = restore_search_index(path)
+    asyncio.run(PostService(repository, warm).sync_search_index())
+
+    assert repository.since[0] is None
+    assert repository.since[1] == datetime.fromtimestamp(
+        index.synced_at, timezone.utc
+    )
+    assert warm.synced_at >= index.synced_at
+    assert len(warm.search('coffee', 10)) == 1
+    assert len(warm.search('tea', 10)) == 1
+
+
+def test_service_keeps_the_index_in_sync_and_searches_it():
+    repository = AsyncMock(spec=PostRepositoryInterface)
+    index = InvertedIndex()
+    service = PostService(repository, index)
+
+    created = asyncio.run(
+        service.create(
+            PostDTO(title='Café', description='Coffee', body='Body text')
+        )
+    )
+    page = asyncio.run(service.search(PostSearchQueryDTO(q='cafe')))
+    asyncio.run(service.delete(str(created.id)))
+
+    assert [item.post.title for item in page.items] == ['Café']
+    assert page.items[0].post.body is None
+    assert page.items[0].post.created_at is not None
+    assert page.items[0].rank > 0
+    repository.search.assert_not_awaited()
+    repository.view.assert_not_awaited()
+    assert index.search('cafe', 10) == []
+
+
+def test_search_needs_only_the_snapshot(tmp_path):
+    path = str(tmp_path / 'posts.index')
+    index = InvertedIndex()
+    writer = PostService(AsyncMock(spec=PostRepositoryInterface), index)
+    created = asyncio.run(
+        writer.create(
+            PostDTO(title='Draft coffee', description='Draft', body='Body')
+        )
+    )
+    created_at = PostDTO.model_validate_json(
+        index.document(str(created.id))
+    ).created_at
+    asyncio.run(
+        writer.update(
+            str(created.id),
+            PostDTO(
+                title='Published coffee',
+                description='Out',
+                body='Body',
+                status=True,
+            ),
+        )
+    )
+    index.snapshot(path)
+
+    service = PostService(None, restore_search_index(path))
+    page = asyncio.run(
+        service.search(PostSearchQueryDTO(q='coffee', status=True))
+    )
+
+    assert not service.has_repository
+    assert [item.post.title for item in page.items] == ['Published coffee']
+    assert page.items[0].post.created_at == created_at
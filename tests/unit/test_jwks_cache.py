@@ -0,0 +1,157 @@
+import asyncio
+
+import httpx
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+
+from api.security.jwks_cache import JWKSCache
+
+
+def make_jwk(kid: str) -> dict:
+    private_key = rsa.generate_private_key(
+        public_exponent=65537, key_size=2048
+    )
+    jwk = jwt.algorithms.RSAAlgorithm.to_jwk(
+        private_key.public_key(), as_dict=True
+    )
+    jwk.update(kid=kid, use='sig')
+    return jwk
+
+
+@pytest.fixture
+def jwks():
+    return {'keys': [make_jwk('key-1')]}
+
+
+def build_cache(handler, **kwargs) -> JWKSCache:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return JWKSCache('https://keycloak/certs', http_client=client, **kwargs)
+
+
+def test_get_key_fetches_once_and_caches(jwks):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json=jwks)
+
+    async def scenario():
+        cache = build_cache(handler)
+        first = await cache.get_key('key-1')
+        second = await cache.get_key('key-1')
+        default = await cache.get_key(None)
+        await cache.close()
+        return first, second, default
+
+    first, second, default = asyncio.run(scenario())
+
+    assert first is second is default
+    assert len(calls) == 1
+
+
+def test_concurrent_requests_share_a_single_fetch(jwks):
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=jwks)
+
+    async def scenario():
+        cache = build_cache(handler)
+        await asyncio.gather(*(cache.get_key('key-1') for _ in range(20)))
+        await cache.close()
+
+    asyncio.run(scenario())
+
+    assert len(calls) == 1
+
+
+def test_unknown_kid_refetches_once(jwks):
+    rotated = {'keys': jwks['keys'] + [make_jwk('key-2')]}
+    responses = [jwks, rotated]
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json=responses[len(calls) - 1])
+
+    async def scenario():
+        cache = build_cache(handler, min_refresh_interval=0)
+        await cache.get_key('key-1')
+        key = await cache.get_key('key-2')
+        await cache.close()
+        return key
+
+    assert asyncio.run(scenario()) is not None
+    assert len(calls) == 2
+
+
+def test_unknown_kid_is_rate_limited(jwks):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json=jwks)
+
+    async def scenario():
+        cache = build_cache(handler, min_refresh_interval=60)
+        await cache.get_key('key-1')
+        with pytest.raises(jwt.InvalidTokenError):
+            await cache.get_key('missing')
+        await cache.close()
+
+    asyncio.run(scenario())
+
+    assert len(calls) == 1
+
+
+def test_cache_control_max_age_sets_ttl(jwks):
+    def handler(request):
+        return httpx.Response(
+            200, json=jwks, headers={'Cache-Control': 'public, max-age=900'}
+        )
+
+    async def scenario():
+        cache = build_cache(handler, refresh_margin=0)
+        await cache.get_key('key-1')
+        ttl = cache._expires_at - cache._fetched_at
+        await cache.close()
+        return ttl
+
+    assert 899 <= asyncio.run(scenario()) <= 901
+
+
+def test_serves_stale_keys_when_keycloak_is_down(jwks):
+    responses = [httpx.Response(200, json=jwks), httpx.Response(503)]
+
+    def handler(request):
+        return responses.pop(0) if responses else httpx.Response(503)
+
+    async def scenario():
+        cache = build_cache(handler, min_refresh_interval=0)
+        first = await cache.get_key('key-1')
+        await cache.refresh()
+        second = await cache.get_key('key-1')
+        await cache.close()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first is second
+
+
+def test_raises_http_exception_without_any_keys():
+    def handler(request):
+        return httpx.Response(503)
+
+    async def scenario():
+        cache = build_cache(handler)
+        with pytest.raises(HTTPException) as exc_info:
+            await cache.get_key('key-1')
+        await cache.close()
+        return exc_info.value
+
+    assert asyncio.run(scenario()).status_code == 500
@@ -0,0 +1,276 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from application.interfaces.post_repository_interface import (
+    PostRepositoryInterface,
+)
+from infrastructure.cache.memory_cache import MemoryCache
+from infrastructure.models.author_model import AuthorModel
+from infrastructure.models.post_model import PostModel
+from infrastructure.repositories.local_cached_post_repository import (
+    LocalCachedPostRepository,
+)
+
+
+class FakePubSub:
+    def __init__(self, broker):
+        self._broker = broker
+        self._queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        if self._broker.subscribe_errors:
+            raise self._broker.subscribe_errors.pop(0)
+        self._broker.subscribers.setdefault(channel, []).append(self._queue)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        try:
+            async with asyncio.timeout(timeout):
+                message = await self._queue.get()
+        except TimeoutError:
+            return None
+        if ignore_subscribe_messages and message['type'] == 'subscribe':
+            return None
+        return message
+
+    async def aclose(self):
+        pass
+
+
+class FakeBroker:
+    def __init__(self):
+        self.subscribers = {}
+        self.error = None
+        self.subscribe_errors = []
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    async def publish(self, channel, data):
+        if self.error:
+            raise self.error
+        for queue in self.subscribers.get(channel, []):
+            queue.put_nowait({'type': 'message', 'data': data})
+
+
+@pytest.fixture
+def post():
+    author = AuthorModel(id=str(uuid4()), firstname='John', lastname='Doe')
+    return PostModel(
+        id=str(uuid4()),
+        title='Test Post',
+        body='Body',
+        slug='test-post',
+        author_id=author.id,
+        author=author,
+    )
+
+
+@pytest.fixture
+def inner(post):
+    repository = AsyncMock(spec=PostRepositoryInterface)
+    repository.view.return_value = post
+    repository.view_by_slug.return_value = post
+    repository.delete_many.return_value = [post.id]
+    return repository
+
+
+@pytest.fixture
+def broker():
+    return FakeBroker()
+
+
+def make_repository(inner, broker):
+    return LocalCachedPostRepository(inner, broker, MemoryCache())
+
+
+def test_view_is_served_from_memory(inner, broker, post):
+    repository = make_repository(inner, broker)
+
+    async def scenario():
+        await repository.view(post.id)
+        return await repository.view(post.id)
+
+    assert asyncio.run(scenario()) is post
+    assert inner.view.await_count == 1
+    assert repository.stats()['l1']['hits'] == 1
+
+
+def test_stats_include_inner_tiers(inner, broker):
+    inner.stats = lambda: {'redis': {'hits': 3}}
+    repository = make_repository(inner, broker)
+
+    assert repository.stats()['redis'] == {'hits': 3}
+
+
+def test_update_invalidates_other_workers(inner, broker, post):
+    first = make_repository(inner, broker)
+    second = make_repository(inner, broker)
+
+    async def scenario():
+        await first.start()
+        await second.start()
+        await asyncio.sleep(0)
+        await first.view(post.id)
+        await second.view(post.id)
+        await first.update(post.id, post)
+        await asyncio.sleep(0)
+        await second.view(post.id)
+        await first.stop()
+        await second.stop()
+
+    asyncio.run(scenario())
+
+    assert inner.view.await_count == 3
+    inner.update.assert_awaited_once_with(post.id, post)
+
+
+def test_delete_evicts_locally_when_publish_fails(inner, broker, post):
+    broker.error = ConnectionError('down')
+    repository = make_repository(inner, broker)
+
+    async def scenario():
+        await repository.view(post.id)
+        await repository.delete(post.id)
+        await repository.view(post.id)
+
+    asyncio.run(scenario())
+
+    assert inner.view.await_count == 2
+
+
+def test_view_overlapping_an_eviction_is_not_cached(inner, broker, post):
+    repository = make_repository(inner, None)
+    loading, release = asyncio.Event(), asyncio.Event()
+
+    async def slow_view(id):
+        loading.set()
+        await release.wait()
+        return post
+
+    inner.view.side_effect = slow_view
+
+    async def scenario():
+        reader = asyncio.create_task(repository.view(post.id))
+        await loading.wait()
+        repository.evict(post.id)
+        release.set()
+        await reader
+        inner.view.side_effect = None
+        await repository.view(post.id)
+
+    asyncio.run(scenario())
+
+    assert inner.view.await_count == 2
+
+
+def test_listener_ignores_non_message_events(inner, broker, post):
+    repository = make_repository(inner, broker)
+
+    async def scenario():
+        await repository.start()
+        await asyncio.sleep(0)
+        await repository.view(post.id)
+        for queue in broker.subscribers['posts:invalidate']:
+            queue.put_nowait({'type': 'subscribe', 'data': 1})
+            queue.put_nowait(
+                {'type': 'message', 'data': json.dumps({'ids': ['other']})}
+            )
+        await asyncio.sleep(0)
+        await repository.view(post.id)
+        await repository.stop()
+
+    asyncio.run(scenario())
+
+    assert inner.view.await_count == 1
+
+
+def test_idle_listener_keeps_the_cache(inner, broker, post):
+    repository = LocalCachedPostRepository(
+        inner, broker, MemoryCache(), poll_timeout=0.01
+    )
+
+    async def scenario():
+        await repository.start()
+        await asyncio.sleep(0)
+        await repository.view(post.id)
+        await asyncio.sleep(0.05)
+        await repository.view(post.id)
+        await repository.stop()
+
+    asyncio.run(scenario())
+
+    assert inner.view.await_count == 1
+
+
+def test_listener_clears_the_cache_after_reconnecting(inner, broker, post):
+    broker.subscribe_errors.append(ConnectionError('down'))
+    repository = LocalCachedPostRepository(
+        inner, broker, MemoryCache(), reconnect_delay=0.01
+    )
+
+    async def scenario():
+        await repository.start()
+        await asyncio.sleep(0)
+        await repository.view(post.id)
+        await asyncio.sleep(0.05)
+        await repository.view(post.id)
+        await repository.stop()
+
+    asyncio.run(scenario())
+
+    assert inner.view.await_count == 2
+
+
+def test_view_by_slug_shares_entries_with_view_by_id(inner, broker, post):
+    repository = make_repository(inner, broker)
+
+    async def scenario():
+        await repository.view_by_slug('test-post')
+        await repository.view(post.id)
+        await repository.view_by_slug('test-post')
+        await repository.update(post.id, post)
+        await repository.view_by_slug('test-post')
+
+    asyncio.run(scenario())
+
+    assert inner.view_by_slug.await_count == 1
+    assert inner.view.await_count == 1
+
+
+def test_delete_many_invalidates_deleted_posts(inner, broker, post):
+    repository = make_repository(inner, broker)
+
+    async def scenario():
+        await repository.start()
+        await asyncio.sleep(0)
+        await repository.view(post.id)
+        await repository.delete_many([post.id, 'missing'])
+        await asyncio.sleep(0)
+        await repository.view(post.id)
+        await repository.stop()
+
+    asyncio.run(scenario())
+
+    assert inner.view.await_count == 2
+
+
+def test_view_version_is_answered_from_memory(inner, broker, post):
+    repository = make_repository(inner, broker)
+    inner.view_version.return_value = (1, None)
+
+    async def scenario():
+        missing = await repository.view_version(post.id)
+        await repository.view(post.id)
+        cached = await repository.view_version(post.id)
+        return missing, cached
+
+    missing, cached = asyncio.run(scenario())
+
+    assert missing == (1, None)
+    assert cached == (post.version, post.updated_at)
+    inner.view_version.assert_awaited_once_with(post.id)
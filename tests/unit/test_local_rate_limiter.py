@@ -0,0 +1,136 @@
+import asyncio
+
+from redis.exceptions import ConnectionError
+
+from api.rate_limit.local_limiter import TwoTierRateLimiter
+from api.rate_limit.rules import RateLimitRule
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def incrby(self, key, amount):
+        self._commands.append(('incrby', key, amount))
+
+    def expire(self, key, seconds):
+        self._commands.append(('expire', key, seconds))
+
+    async def execute(self):
+        if self._redis.error:
+            raise self._redis.error
+        self._redis.executions += 1
+        results = []
+        for command, key, value in self._commands:
+            if command == 'incrby':
+                self._redis.data[key] = self._redis.data.get(key, 0) + value
+                results.append(self._redis.data[key])
+            else:
+                results.append(True)
+        return results
+
+
+class FakeAsyncRedis:
+    def __init__(self):
+        self.data = {}
+        self.executions = 0
+        self.error = None
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+RULE = RateLimitRule(limit=5, period=60)
+
+
+def test_local_bucket_limits_without_redis():
+    limiter = TwoTierRateLimiter(None)
+
+    async def scenario():
+        return [await limiter.hit('ip:1', RULE) for _ in range(6)]
+
+    results = asyncio.run(scenario())
+
+    assert [result.allowed for result in results] == [True] * 5 + [False]
+    assert results[4].remaining == 0
+    assert results[5].retry_after > 0
+
+
+def test_sync_pushes_pending_counts_in_one_pipeline():
+    redis = FakeAsyncRedis()
+    limiter = TwoTierRateLimiter(redis, max_overshoot=1)
+
+    async def scenario():
+        await limiter.hit('ip:1', RULE)
+        await limiter.hit('ip:1', RULE)
+        await limiter.hit('ip:2', RULE)
+        await limiter.sync()
+
+    asyncio.run(scenario())
+
+    assert redis.executions == 1
+    assert sorted(redis.data.values()) == [1, 2]
+    assert limiter.stats()['pending'] == 0
+
+
+def test_sync_clamps_local_tokens_to_global_usage():
+    redis = FakeAsyncRedis()
+    limiter = TwoTierRateLimiter(redis, max_overshoot=1)
+
+    async def scenario():
+        await limiter.hit('ip:1', RULE)
+        await limiter.sync()
+        key = next(iter(redis.data))
+        redis.data[key] += 3
+        await limiter.hit('ip:1', RULE)
+        await limiter.sync()
+        return await limiter.hit('ip:1', RULE)
+
+    assert not asyncio.run(scenario()).allowed
+
+
+def test_reaching_overshoot_schedules_flush():
+    redis = FakeAsyncRedis()
+    limiter = TwoTierRateLimiter(redis, max_overshoot=0.4)
+
+    async def scenario():
+        await limiter.hit('ip:1', RULE)
+        await limiter.hit('ip:1', RULE)
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+
+    assert redis.executions == 1
+
+
+def test_redis_outage_degrades_to_local_limiting():
+    redis = FakeAsyncRedis()
+    redis.error = ConnectionError('down')
+    limiter = TwoTierRateLimiter(redis, max_overshoot=1)
+
+    async def scenario():
+        allowed = [(await limiter.hit('ip:1', RULE)).allowed for _ in range(3)]
+        await limiter.sync()
+        return allowed
+
+    assert asyncio.run(scenario()) == [True, True, True]
+    assert limiter.stats()['redis_available'] == 0
+
+
+def test_least_recently_used_buckets_are_evicted():
+    limiter = TwoTierRateLimiter(None, max_keys=2)
+
+    async def scenario():
+        for key in ('a', 'b', 'a', 'c'):
+            await limiter.hit(key, RULE)
+
+    asyncio.run(scenario())
+
+    assert list(limiter._buckets) == ['a', 'c']
@@ -0,0 +1,91 @@
+import json
+import logging
+import sys
+from queue import SimpleQueue
+
+from api.config.logger_config import (
+    FastJsonFormatter,
+    LocalQueueHandler,
+    SamplingFilter,
+    configure_logging,
+    stop_logging,
+)
+
+
+def make_record(level=logging.INFO, msg='hello %s', args=('world',), **extra):
+    record = logging.LogRecord(
+        'api_gateway', level, '/app/module.py', 12, msg, args, None
+    )
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_writes_fields_and_extras():
+    formatter = FastJsonFormatter('blog')
+
+    document = json.loads(formatter.format(make_record(request_id='r-1')))
+
+    assert document['app'] == 'blog'
+    assert document['levelname'] == 'INFO'
+    assert document['msg'] == 'hello world'
+    assert document['pathname'] == '/app/module.py'
+    assert document['lineno'] == 12
+    assert document['request_id'] == 'r-1'
+    assert 'args' not in document
+
+
+def test_json_formatter_includes_exception():
+    formatter = FastJsonFormatter('blog')
+    try:
+        raise ValueError('broken')
+    except ValueError:
+        record = make_record(level=logging.ERROR)
+        record.exc_info = sys.exc_info()
+
+    document = json.loads(formatter.format(record))
+
+    assert 'ValueError: broken' in document['exc_info']
+
+
+def test_json_formatter_time_matches_standard_formatter():
+    record = make_record()
+
+    assert FastJsonFormatter('blog').formatTime(
+        record
+    ) == logging.Formatter().formatTime(record)
+
+
+def test_queue_handler_renders_message_before_enqueueing():
+    queue = SimpleQueue()
+    handler = LocalQueueHandler(queue)
+    items = ['first']
+
+    handler.handle(make_record(msg='%s', args=(items,)))
+    items.append('second')
+
+    assert queue.get_nowait().getMessage() == "['first']"
+
+
+def test_sampling_filter_drops_only_low_levels():
+    sampling = SamplingFilter(0.0)
+
+    assert not sampling.filter(make_record(level=logging.DEBUG))
+    assert sampling.filter(make_record(level=logging.INFO))
+    assert SamplingFilter(1.0).filter(make_record(level=logging.DEBUG))
+
+
+def test_configure_logging_writes_through_the_listener(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    logger = configure_logging(False, 'blog')
+    logger.info('post %s created', 'p-1')
+    logging.getLogger('uvicorn.access').info('GET /posts')
+    stop_logging()
+
+    log_dir = tmp_path / 'logs' / 'blog'
+    text = (log_dir / 'blog.log').read_text()
+    lines = (log_dir / 'blog_structured.log').read_text().splitlines()
+    assert 'post p-1 created' in text
+    assert 'GET /posts' not in text
+    assert json.loads(lines[-1])['msg'] == 'post p-1 created'
+    assert logger.handlers[0].__class__ is LocalQueueHandler
@@ -0,0 +1,45 @@
+from infrastructure.cache.memory_cache import MemoryCache
+
+
+def test_get_returns_cached_value_and_counts_hits():
+    cache = MemoryCache()
+    cache.set('a', 1, size=10)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+    assert cache.stats()['hit_ratio'] == 0.5
+
+
+def test_expired_entries_are_dropped():
+    cache = MemoryCache(ttl=0)
+    cache.set('a', 1, size=10)
+
+    assert cache.get('a') is None
+    assert len(cache) == 0
+    assert cache.bytes == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = MemoryCache(max_entries=2)
+    cache.set('a', 1, size=1)
+    cache.set('b', 2, size=1)
+    cache.get('a')
+    cache.set('c', 3, size=1)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+
+def test_byte_budget_is_enforced():
+    cache = MemoryCache(max_bytes=100)
+    cache.set('a', 1, size=60)
+    cache.set('b', 2, size=60)
+    cache.set('huge', 3, size=101)
+
+    assert cache.get('a') is None
+    assert cache.get('b') == 2
+    assert cache.get('huge') is None
+    assert cache.bytes == 60
@@ -0,0 +1,217 @@
+import asyncio
+import json
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.metrics.instruments import (
+    CACHE_HITS,
+    EVENT_LOOP_LAG_HISTOGRAM,
+    LAG_BUCKETS,
+    REQUEST_DURATION,
+    record_cache_stats,
+)
+from api.metrics.tasks import monitor_event_loop_lag
+from api.middlewares.metrics_middleware import MetricsMiddleware
+from api.routes.metrics_routes import router as metrics_router
+from infrastructure.metrics import multiprocess
+from infrastructure.metrics.multiprocess import ARCHIVE, MetricsStore
+from infrastructure.metrics.registry import Registry, merge, render
+from infrastructure.metrics.timing import timed
+
+
+def make_registry():
+    registry = Registry()
+    requests = registry.counter('requests_total', 'Requests.', ['route'])
+    lag = registry.gauge('lag_seconds', 'Lag.')
+    latency = registry.histogram(
+        'latency_seconds', 'Latency.', ['route'], buckets=(0.1, 1.0)
+    )
+    return registry, requests, lag, latency
+
+
+def test_renders_prometheus_text_format():
+    registry, requests, lag, latency = make_registry()
+    requests.inc(('/posts/{id}',))
+    requests.inc(('/posts/{id}',), 2)
+    lag.set(0.25)
+    latency.observe(0.05, ('/posts',))
+    latency.observe(0.5, ('/posts',))
+    latency.observe(3.0, ('/posts',))
+
+    text = render(registry.collect())
+
+    assert '# TYPE requests_total counter' in text
+    assert 'requests_total{route="/posts/{id}"} 3' in text
+    assert 'lag_seconds 0.25' in text
+    assert 'latency_seconds_bucket{route="/posts",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/posts",le="1"} 2' in text
+    assert 'latency_seconds_bucket{route="/posts",le="+Inf"} 3' in text
+    assert 'latency_seconds_sum{route="/posts"} 3.55' in text
+    assert 'latency_seconds_count{route="/posts"} 3' in text
+
+
+def test_escapes_label_values():
+    registry = Registry()
+    registry.counter('total', 'Total.', ['path']).inc(('a"b\\c\n',))
+
+    assert 'total{path="a\\"b\\\\c\\n"} 1' in render(registry.collect())
+
+
+def test_rejects_duplicate_metric_names():
+    registry = Registry()
+    registry.counter('total', 'Total.')
+
+    try:
+        registry.gauge('total', 'Again.')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('expected ValueError')
+
+
+def test_collect_runs_hooks_and_survives_failures():
+    registry, requests, _, _ = make_registry()
+    registry.on_collect(lambda: requests.set(7, ('/',)))
+    registry.on_collect(lambda: 1 / 0)
+
+    assert 'requests_total{route="/"} 7' in render(registry.collect())
+
+
+def test_merge_sums_counters_and_keeps_live_gauges_per_pid():
+    first, second = make_registry(), make_registry()
+    for (_, requests, lag, latency), value in ((first, 0.1), (second, 0.2)):
+        requests.inc(('/',))
+        lag.set(value)
+        latency.observe(value, ('/',))
+
+    merged = merge(
+        [
+            (first[0].collect(), '101', True),
+            (second[0].collect(), '102', False),
+        ]
+    )
+    text = render(merged)
+
+    assert 'requests_total{route="/"} 2' in text
+    assert 'latency_seconds_count{route="/"} 2' in text
+    assert 'lag_seconds{pid="101"} 0.1' in text
+    assert 'pid="102"' not in text
+
+
+def test_store_archives_exited_workers(tmp_path, monkeypatch):
+    exited_registry, exited_requests, exited_lag, _ = make_registry()
+    exited_requests.inc(('/',), 5)
+    exited_lag.set(1.0)
+    (tmp_path / '999999-1.json').write_text(
+        json.dumps(exited_registry.collect())
+    )
+    monkeypatch.setattr(multiprocess, 'pid_alive', lambda pid: pid != 999999)
+    registry, requests, lag, _ = make_registry()
+    requests.inc(('/',))
+    lag.set(0.5)
+    store = MetricsStore(str(tmp_path))
+
+    text = render(store.collect(registry.collect()))
+
+    assert 'requests_total{route="/"} 6' in text
+    assert 'lag_seconds{pid=' in text and '1.0' not in text
+    assert not (tmp_path / '999999-1.json').exists()
+    assert (tmp_path / ARCHIVE).exists()
+
+    requests.inc(('/',))
+    assert 'requests_total{route="/"} 7' in render(
+        store.collect(registry.collect())
+    )
+
+
+def test_timed_observes_coroutine_duration_by_name():
+    registry = Registry()
+    histogram = registry.histogram('query_seconds', 'Queries.', ['operation'])
+
+    @timed(histogram)
+    async def view():
+        return 'post'
+
+    assert asyncio.run(view()) == 'post'
+    assert 'query_seconds_count{operation="view"} 1' in render(
+        registry.collect()
+    )
+
+
+def test_record_cache_stats_exports_hits_and_misses():
+    record_cache_stats(
+        {
+            'l1': {'hits': 3, 'misses': 1, 'entries': 2, 'bytes': 10},
+            'redis': {'hits': 4, 'misses': 2, 'hit_ratio': 0.66},
+        }
+    )
+
+    assert CACHE_HITS._values[('l1',)] == 3
+    assert CACHE_HITS._values[('redis',)] == 4
+
+
+def make_client():
+    app = FastAPI()
+
+    @app.get('/posts/{id}')
+    async def view(id: str):
+        return {'id': id}
+
+    app.include_router(metrics_router)
+    app.add_middleware(MetricsMiddleware)
+    return TestClient(app)
+
+
+def request_count(route, status):
+    counts = REQUEST_DURATION._values.get(('GET', route, status))
+    return sum(counts[:-1]) if counts else 0
+
+
+def test_middleware_labels_requests_by_route_template():
+    client = make_client()
+    before = request_count('/posts/{id}', '200')
+    unmatched = request_count('unmatched', '404')
+
+    client.get('/posts/1')
+    client.get('/posts/2')
+    client.get('/missing')
+
+    assert request_count('/posts/{id}', '200') == before + 2
+    assert request_count('unmatched', '404') == unmatched + 1
+
+
+def test_metrics_endpoint_serves_text_format():
+    client = make_client()
+    client.get('/posts/1')
+
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain')
+    assert (
+        'http_request_duration_seconds_count{method="GET",'
+        'route="/posts/{id}",status="200"}' in response.text
+    )
+
+
+def slow_probes():
+    # Probes that woke up more than 25 ms late.
+    counts = EVENT_LOOP_LAG_HISTOGRAM._values.get((), [0] * 12)
+    return sum(counts[LAG_BUCKETS.index(0.025) + 1 : -1])
+
+
+def test_event_loop_lag_reports_blocking():
+    before = slow_probes()
+
+    async def block_loop():
+        task = asyncio.create_task(monitor_event_loop_lag(0.01))
+        await asyncio.sleep(0)
+        time.sleep(0.05)
+        await asyncio.sleep(0.02)
+        task.cancel()
+
+    asyncio.run(block_loop())
+
+    assert slow_probes() > before
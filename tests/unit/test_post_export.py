@@ -0,0 +1,160 @@
+import asyncio
+import gzip
+import json
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.routes.post_routes import router
+from api.routes.streaming import accepts_gzip, gzip_chunks, ndjson_chunks
+from application.services.post_service import PostService
+from infrastructure.models.post_model import PostModel
+
+
+class StreamingRepository:
+    def __init__(self, posts):
+        self.posts = posts
+        self.since = None
+
+    async def stream(self, since=None):
+        self.since = since
+        for post in self.posts:
+            yield post
+
+
+def make_client(count=3):
+    posts = [
+        PostModel(id=str(uuid4()), title=f'Post {number}', slug=f'p-{number}')
+        for number in range(count)
+    ]
+    app = FastAPI()
+    app.include_router(router)
+    repository = StreamingRepository(posts)
+    app.state.post_service = PostService(repository)
+    return TestClient(app), repository
+
+
+def test_export_streams_one_json_document_per_line():
+    client, _ = make_client()
+
+    response = client.get(
+        '/api/v1/posts/export', headers={'Accept-Encoding': 'identity'}
+    )
+
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    assert 'content-encoding' not in response.headers
+    lines = response.text.splitlines()
+    assert [json.loads(line)['title'] for line in lines] == [
+        'Post 0',
+        'Post 1',
+        'Post 2',
+    ]
+
+
+def test_export_is_gzipped_when_accepted():
+    client, _ = make_client()
+
+    response = client.get(
+        '/api/v1/posts/export', headers={'Accept-Encoding': 'gzip'}
+    )
+
+    assert response.headers['content-encoding'] == 'gzip'
+    assert len(response.text.splitlines()) == 3
+
+
+def test_export_passes_since_to_the_repository():
+    client, repository = make_client(count=0)
+
+    response = client.get(
+        '/api/v1/posts/export',
+        params={'since': '2024-01-01T00:00:00+00:00'},
+    )
+
+    assert response.text == ''
+    assert repository.since == datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def test_ndjson_lines_are_grouped_into_chunks():
+    posts = [
+        PostModel(id=str(number), title='x' * 100) for number in range(50)
+    ]
+
+    async def items():
+        for post in posts:
+            yield post
+
+    async def collect():
+        return [chunk async for chunk in ndjson_chunks(items(), 1024)]
+
+    chunks = asyncio.run(collect())
+
+    assert 1 < len(chunks) < len(posts)
+    assert b''.join(chunks).count(b'\n') == len(posts)
+
+
+def test_gzip_chunks_produce_a_single_gzip_stream():
+    async def chunks():
+        for _ in range(100):
+            yield b'line\n'
+
+    async def collect():
+        return b''.join([chunk async for chunk in gzip_chunks(chunks())])
+
+    assert gzip.decompress(asyncio.run(collect())) == b'line\n' * 100
+
+
+def test_accepts_gzip_honours_quality_values():
+    assert accepts_gzip('gzip, deflate, br')
+    assert accepts_gzip('*')
+    assert not accepts_gzip('')
+    assert not accepts_gzip('gzip;q=0')
+    assert not accepts_gzip('*, gzip;q=0')
+    assert not accepts_gzip('identity')
+
+
+class SearchingRepository:
+    def __init__(self, posts):
+        self.posts = posts
+        self.query = None
+
+    async def search(self, query):
+        self.query = query
+        if query.cursor == 'bad':
+            raise ValueError('Invalid cursor.')
+        return [(post, 0.1, None) for post in self.posts], None
+
+
+def make_search_client():
+    app = FastAPI()
+    app.include_router(router)
+    repository = SearchingRepository(
+        [PostModel(id=str(uuid4()), title='Post', slug='post')]
+    )
+    app.state.post_service = PostService(repository)
+    return TestClient(app), repository
+
+
+def test_search_route_passes_query_parameters():
+    client, repository = make_search_client()
+
+    response = client.get(
+        '/api/v1/posts/search', params={'q': 'post', 'limit': 5}
+    )
+
+    assert response.status_code == 200
+    assert response.json()['items'][0]['post']['title'] == 'Post'
+    assert repository.query.q == 'post'
+    assert repository.query.limit == 5
+
+
+def test_search_route_rejects_bad_input():
+    client, _ = make_search_client()
+
+    assert client.get('/api/v1/posts/search').status_code == 422
+    response = client.get(
+        '/api/v1/posts/search', params={'q': 'post', 'cursor': 'bad'}
+    )
+    assert response.status_code == 400
@@ -0,0 +1,662 @@
+import asyncio
+import re
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+from application.dtos.post_list_query_dto import PostListQueryDTO
+from application.dtos.post_search_query_dto import PostSearchQueryDTO
+from application.services.cursor import (
+    decode_cursor,
+    decode_search_cursor,
+    encode_cursor,
+    encode_search_cursor,
+)
+from infrastructure.database.postgres import get_schema_statements
+from infrastructure.models.author_model import AuthorModel
+from infrastructure.models.post_model import PostModel
+from infrastructure.repositories.post_repository import (
+    DELETE_POST,
+    DELETE_POSTS,
+    INSERT_POST,
+    INSERT_POSTS,
+    LOCK_SLUGS,
+    SELECT_POST_VERSION,
+    SELECT_TAKEN_SLUGS,
+    SET_SEARCH_VECTORS,
+    UPDATE_POST,
+    UPDATE_POSTS,
+    PostRepository,
+    SlugAllocator,
+    fold_text,
+    next_free_slug,
+)
+
+
+class FakeConnection:
+    def __init__(self, rows=None, row=None):
+        self.rows = rows or []
+        self.row = row
+        self.queries = []
+
+    async def execute(self, query, *args):
+        self.queries.append((query, args))
+
+    async def fetch(self, query, *args):
+        self.queries.append((query, args))
+        return self.rows
+
+    async def fetchrow(self, query, *args):
+        self.queries.append((query, args))
+        if self.row is not None:
+            return self.row
+        return self.rows[0] if self.rows else None
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+
+class FakePool(FakeConnection):
+    @asynccontextmanager
+    async def acquire(self):
+        yield self
+
+
+@pytest.fixture
+def post_row():
+    return dict(
+        id=str(uuid4()),
+        title='Test Post',
+        description='A post for testing',
+        body='This is the body of the post',
+        slug='test-post',
+        status=True,
+        thumbnail='http://example.com/thumbnail.jpg',
+        author_id=str(uuid4()),
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+def test_create_inserts_author_and_post_in_one_transaction(post_row):
+    pool = FakePool()
+    author = AuthorModel(
+        id=post_row.pop('author_id'), firstname='John', lastname='Doe'
+    )
+    post = PostModel(author=author, **post_row)
+
+    asyncio.run(PostRepository(pool).create(post))
+
+    (
+        (author_query, author_args),
+        _,
+        _,
+        (post_query, post_args),
+    ) = pool.queries
+    assert 'INSERT INTO authors' in author_query
+    assert author_args[0] == author.id
+    assert post_query == INSERT_POST
+    assert post_args[0] == post_row['id']
+    assert post_args[7] == author.id
+
+
+def test_view_maps_row_to_model(post_row):
+    pool = FakePool(rows=[post_row])
+
+    post = asyncio.run(PostRepository(pool).view(post_row['id']))
+
+    query, args = pool.queries[0]
+    assert isinstance(post, PostModel)
+    assert post.title == 'Test Post'
+    assert query.endswith('WHERE p.id = $1')
+    assert args == (post_row['id'],)
+
+
+def test_view_returns_none_when_missing():
+    assert asyncio.run(PostRepository(FakePool()).view('missing')) is None
+
+
+def test_list_maps_all_rows(post_row):
+    pool = FakePool(rows=[post_row, {**post_row, 'id': str(uuid4())}])
+
+    posts = asyncio.run(PostRepository(pool).list())
+
+    assert [post.id for post in posts] == [
+        post_row['id'],
+        pool.rows[1]['id'],
+    ]
+
+
+def test_update_and_delete_use_id(post_row):
+    pool = FakePool(row={'version': 2, 'slug': 'test-post', 'author_id': None})
+    repository = PostRepository(pool)
+
+    version = asyncio.run(
+        repository.update(post_row['id'], PostModel(**post_row))
+    )
+    asyncio.run(repository.delete(post_row['id']))
+
+    *_, (update_query, update_args), (delete_query, delete_args) = pool.queries
+    assert version == 2
+    assert update_query == UPDATE_POST
+    assert 'RETURNING version' in UPDATE_POST
+    assert update_args[0] == post_row['id']
+    assert delete_query == DELETE_POST
+    assert delete_args == (post_row['id'],)
+
+
+def test_schema_statements_create_tables_in_dependency_order():
+    statements = get_schema_statements()
+    tables = [s for s in statements if s.startswith('CREATE TABLE')]
+
+    assert 'authors' in tables[0]
+    assert 'posts' in tables[1]
+
+
+def make_rows(post_row, count):
+    return [
+        {
+            **post_row,
+            'id': str(uuid4()),
+            'created_at': post_row['created_at'] - timedelta(minutes=index),
+        }
+        for index in range(count)
+    ]
+
+
+def test_list_page_fetches_one_extra_row_for_next_cursor(post_row):
+    pool = FakePool(rows=make_rows(post_row, 3))
+
+    posts, next_cursor = asyncio.run(
+        PostRepository(pool).list_page(PostListQueryDTO(limit=2))
+    )
+
+    query, args = pool.queries[0]
+    assert 'ORDER BY p.created_at DESC, p.id DESC LIMIT $1' in query
+    assert 'WHERE' not in query
+    assert args == (3,)
+    assert len(posts) == 2
+    assert decode_cursor(next_cursor) == (
+        posts[-1].created_at,
+        posts[-1].id,
+    )
+
+
+def test_list_page_without_more_rows_has_no_cursor(post_row):
+    pool = FakePool(rows=make_rows(post_row, 2))
+
+    posts, next_cursor = asyncio.run(
+        PostRepository(pool).list_page(PostListQueryDTO(limit=2))
+    )
+
+    assert len(posts) == 2
+    assert next_cursor is None
+
+
+def test_list_page_applies_filters_cursor_and_summary(post_row):
+    pool = FakePool()
+    author_id = uuid4()
+    cursor = encode_cursor(post_row['created_at'], post_row['id'])
+
+    asyncio.run(
+        PostRepository(pool).list_page(
+            PostListQueryDTO(
+                limit=10,
+                cursor=cursor,
+                status=True,
+                author_id=author_id,
+                summary=True,
+            )
+        )
+    )
+
+    query, args = pool.queries[0]
+    assert 'p.body' not in query
+    assert 'p.excerpt, p.word_count, p.reading_time' in query
+    assert (
+        'WHERE p.status = $1 AND p.author_id = $2 '
+        'AND (p.created_at, p.id) < ($3, $4)'
+    ) in query
+    assert args == (
+        True,
+        str(author_id),
+        post_row['created_at'],
+        post_row['id'],
+        11,
+    )
+
+
+def test_list_query_enforces_max_page_size():
+    with pytest.raises(ValueError):
+        PostListQueryDTO(limit=1000)
+
+
+def test_decode_cursor_rejects_garbage():
+    with pytest.raises(ValueError, match='Invalid cursor.'):
+        decode_cursor('not-a-cursor')
+
+
+def with_author(row):
+    return {
+        **row,
+        'author__firstname': 'John',
+        'author__lastname': 'Doe',
+        'author__description': None,
+        'author__resume': None,
+    }
+
+
+@pytest.mark.parametrize('count', [1, 10, 100])
+def test_list_loads_authors_with_a_constant_number_of_queries(post_row, count):
+    pool = FakePool(
+        rows=[with_author(row) for row in make_rows(post_row, count)]
+    )
+
+    posts = asyncio.run(PostRepository(pool).list())
+
+    assert len(pool.queries) == 1
+    assert 'LEFT JOIN authors a ON a.id = p.author_id' in pool.queries[0][0]
+    assert all(post.author.firstname == 'John' for post in posts)
+    assert all(post.author.id == post.author_id for post in posts)
+
+
+def test_view_loads_author_in_the_same_query(post_row):
+    pool = FakePool(rows=[with_author(post_row)])
+
+    post = asyncio.run(PostRepository(pool).view(post_row['id']))
+
+    assert len(pool.queries) == 1
+    assert post.author.lastname == 'Doe'
+
+
+def test_author_join_can_be_skipped(post_row):
+    pool = FakePool(rows=[post_row])
+
+    post = asyncio.run(
+        PostRepository(pool).view(post_row['id'], include_author=False)
+    )
+
+    assert 'JOIN' not in pool.queries[0][0]
+    assert post.author is None
+
+
+def test_post_without_author_has_no_author_model(post_row):
+    row = {
+        **post_row,
+        'author_id': None,
+        'author__firstname': None,
+        'author__lastname': None,
+        'author__description': None,
+        'author__resume': None,
+    }
+    pool = FakePool(rows=[row])
+
+    post = asyncio.run(PostRepository(pool).view(post_row['id']))
+
+    assert post.author is None
+
+
+def test_view_by_slug_uses_indexed_lookup(post_row):
+    pool = FakePool(rows=[post_row])
+
+    post = asyncio.run(PostRepository(pool).view_by_slug('test-post'))
+
+    query, args = pool.queries[0]
+    assert post.slug == 'test-post'
+    assert query.endswith('WHERE p.slug = $1')
+    assert args == ('test-post',)
+
+
+def test_create_resolves_slug_collisions_with_one_query(post_row):
+    pool = FakePool(
+        rows=[
+            {'base': 'test-post', 'slug': 'test-post'},
+            {'base': 'test-post', 'slug': 'test-post-2'},
+        ],
+    )
+    post = PostModel(**post_row)
+
+    asyncio.run(PostRepository(pool).create(post))
+
+    (
+        (lock_query, lock_args),
+        (select_query, select_args),
+        (
+            insert_query,
+            insert_args,
+        ),
+    ) = pool.queries
+    assert lock_query == LOCK_SLUGS
+    assert lock_args == (['test-post'],)
+    assert select_query == SELECT_TAKEN_SLUGS
+    assert select_args == (['test-post'], [])
+    assert post.slug == 'test-post-3'
+    assert insert_args[4] == 'test-post-3'
+
+
+def test_taken_slugs_upper_bound_is_grouped_before_comparison():
+    # ~<~ and || share a precedence level and group left to right, so an
+    # unparenthesised bound would compare first and concatenate after.
+    join = re.search(r'JOIN posts p ON (.+)', SELECT_TAKEN_SLUGS).group(1)
+
+    assert [part.strip() for part in join.split(' AND ')] == [
+        'p.slug ~>=~ b.base',
+        "p.slug ~<~ (b.base || '.')",
+    ]
+
+
+def test_update_excludes_own_row_from_slug_collisions(post_row):
+    pool = FakePool(rows=[])
+    post = PostModel(**post_row)
+
+    asyncio.run(PostRepository(pool).update(post_row['id'], post))
+
+    _, (_, select_args), (_, update_args) = pool.queries
+    assert select_args[1] == [post_row['id']]
+    assert update_args[4] == 'test-post'
+
+
+def test_empty_slugs_fall_back_to_the_post_id():
+    pool = FakePool(rows=[])
+    posts = [
+        PostModel(id=str(uuid4()), title=title, slug='')
+        for title in ('!!!', '🎉')
+    ]
+
+    for post in posts:
+        asyncio.run(PostRepository(pool).create(post))
+
+    inserted = [
+        args[4] for query, args in pool.queries if query == INSERT_POST
+    ]
+    assert inserted == [posts[0].id, posts[1].id]
+
+
+@pytest.mark.parametrize(
+    'taken, expected',
+    [
+        ([], 'post'),
+        (['post-2'], 'post'),
+        (['post'], 'post-2'),
+        (['post', 'post-2', 'post-10', 'post-about'], 'post-11'),
+        (['post', 'post-about-3'], 'post-2'),
+    ],
+)
+def test_next_free_slug(taken, expected):
+    assert next_free_slug('post', taken) == expected
+
+
+def test_slug_index_is_unique_and_supports_prefix_ranges():
+    statements = get_schema_statements()
+
+    assert (
+        'CREATE UNIQUE INDEX IF NOT EXISTS ix_posts_slug '
+        'ON posts (slug text_pattern_ops)'
+    ) in statements
+
+
+def test_slug_allocator_numbers_duplicates_within_a_batch():
+    allocator = SlugAllocator([('post', 'post'), ('post', 'post-3')])
+
+    assert [allocator.allocate('post') for _ in range(3)] == [
+        'post-4',
+        'post-5',
+        'post-6',
+    ]
+    assert allocator.allocate('post-5') == 'post-5-2'
+    assert allocator.allocate('other') == 'other'
+
+
+class BatchConnection(FakePool):
+    async def fetch(self, query, *args):
+        self.queries.append((query, args))
+        if query == SELECT_TAKEN_SLUGS:
+            return []
+        return [
+            {'id': id, 'slug': f'stored-{id}', 'author_id': 'stored'}
+            for id in args[0]
+        ][:-1]
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.queries.append((f'COPY {table}', (records, columns)))
+
+
+def test_create_many_uses_one_bulk_insert_in_one_transaction(post_row):
+    pool = BatchConnection()
+    author = AuthorModel(id=str(uuid4()), firstname='John', lastname='Doe')
+    posts = [
+        PostModel(**{**post_row, 'id': str(uuid4())}, author=author)
+        for _ in range(3)
+    ]
+
+    created = asyncio.run(PostRepository(pool).create_many(posts))
+
+    queries = [query for query, _ in pool.queries]
+    assert len(queries) == 4
+    assert 'unnest' in queries[0]
+    assert queries[1:] == [LOCK_SLUGS, SELECT_TAKEN_SLUGS, INSERT_POSTS]
+    author_args = pool.queries[0][1]
+    assert author_args[0] == [author.id]
+    insert_args = pool.queries[-1][1]
+    assert insert_args[4] == ['test-post', 'test-post-2', 'test-post-3']
+    assert created == [post.id for post in posts[:2]]
+
+
+def test_update_many_and_delete_many_return_affected_ids(post_row):
+    pool = BatchConnection()
+    repository = PostRepository(pool)
+    posts = [PostModel(**{**post_row, 'id': str(uuid4())}) for _ in range(2)]
+
+    updated = asyncio.run(repository.update_many(posts))
+    deleted = asyncio.run(repository.delete_many([post.id for post in posts]))
+
+    update_query, update_args = pool.queries[-2]
+    assert update_query == UPDATE_POSTS
+    assert len(update_args) == 14
+    assert pool.queries[1][1][1] == [post.id for post in posts]
+    assert updated == [posts[0].id]
+    assert posts[0].slug == f'stored-{posts[0].id}'
+    assert posts[1].slug == 'test-post-2'
+    assert pool.queries[-1][0] == DELETE_POSTS
+    assert deleted == [posts[0].id]
+
+
+def test_batch_operations_skip_empty_input():
+    pool = FakePool()
+    repository = PostRepository(pool)
+
+    assert asyncio.run(repository.create_many([])) == []
+    assert asyncio.run(repository.delete_many([])) == []
+    assert pool.queries == []
+
+
+def test_copy_many_copies_authors_then_posts(post_row):
+    pool = BatchConnection()
+    author = AuthorModel(id=str(uuid4()), firstname='John', lastname='Doe')
+    post = PostModel(
+        **{**post_row, 'created_at': None, 'author_id': author.id},
+        author=author,
+    )
+
+    asyncio.run(PostRepository(pool).copy_many([post], [author]))
+
+    queries = [query for query, _ in pool.queries]
+    assert queries == [
+        'COPY authors',
+        LOCK_SLUGS,
+        SELECT_TAKEN_SLUGS,
+        'COPY posts',
+        SET_SEARCH_VECTORS,
+    ]
+    author_records, author_columns = pool.queries[0][1]
+    assert author_columns[0] == 'id'
+    assert author_records == [(author.id, 'John', 'Doe', None, None)]
+    assert pool.queries[-1][1][0] == [post.id]
+    [record], columns = pool.queries[-2][1]
+    assert dict(zip(columns, record))['author_id'] == author.id
+    assert dict(zip(columns, record))['created_at'] is not None
+
+
+class CursorPool(FakePool):
+    def __init__(self, rows):
+        super().__init__(rows)
+        self.transactions = []
+        self.prefetch = None
+
+    @asynccontextmanager
+    async def transaction(self, **options):
+        self.transactions.append(options)
+        yield
+
+    async def cursor(self, query, *args, prefetch=None):
+        self.queries.append((query, args))
+        self.prefetch = prefetch
+        for row in self.rows:
+            yield row
+
+
+def test_stream_reads_through_a_server_side_cursor(post_row):
+    pool = CursorPool([post_row, {**post_row, 'id': str(uuid4())}])
+    since = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    async def collect():
+        repository = PostRepository(pool)
+        return [post async for post in repository.stream(since, prefetch=50)]
+
+    posts = asyncio.run(collect())
+
+    query, args = pool.queries[0]
+    assert len(posts) == 2
+    assert query.endswith(
+        'WHERE p.updated_at >= $1 ORDER BY p.updated_at, p.id'
+    )
+    assert args == (since,)
+    assert pool.prefetch == 50
+    assert pool.transactions == [
+        {'isolation': 'repeatable_read', 'readonly': True}
+    ]
+
+
+def test_update_keeps_the_stored_slug_and_author_when_left_out(post_row):
+    author_id = str(uuid4())
+    pool = FakePool(row={'version': 3, 'slug': 'kept', 'author_id': author_id})
+    post = PostModel(**{**post_row, 'slug': None, 'author_id': None})
+
+    version = asyncio.run(PostRepository(pool).update(post.id, post))
+
+    (query, args) = pool.queries[-1]
+    assert query == UPDATE_POST
+    assert args[4] is None and args[7] is None
+    assert 'COALESCE($5, slug)' in UPDATE_POST
+    assert 'COALESCE($8, author_id)' in UPDATE_POST
+    assert 'COALESCE(v.slug, p.slug)' in UPDATE_POSTS
+    assert 'COALESCE(v.author_id, p.author_id)' in UPDATE_POSTS
+    assert (version, post.slug, post.author_id) == (3, 'kept', author_id)
+
+
+def test_updates_touch_updated_at():
+    assert 'updated_at = now()' in UPDATE_POST
+    assert 'updated_at = now()' in UPDATE_POSTS
+
+
+def search_rows(post_row, count):
+    return [
+        {
+            key: value
+            for key, value in {
+                **post_row,
+                'id': str(uuid4()),
+                'rank': 1.0 / (index + 1),
+                'snippet_source': '<p>Um café, por favor.</p>',
+            }.items()
+            if key != 'body'
+        }
+        for index in range(count)
+    ]
+
+
+def test_search_ranks_matches_and_pages_by_rank(post_row):
+    pool = FakePool(rows=search_rows(post_row, 3))
+
+    hits, next_cursor = asyncio.run(
+        PostRepository(pool).search(PostSearchQueryDTO(q='Café', limit=2))
+    )
+
+    query, args = pool.queries[0]
+    assert "websearch_to_tsquery('simple', $1)" in query
+    assert 'p.search_vector @@ q.query' in query
+    assert 'ts_headline' not in query
+    assert query.count('p.body') == 1
+    assert args == ('Cafe', 3)
+    assert [(rank, snippet) for _, rank, snippet in hits] == [
+        (1.0, 'Um <mark>café</mark>, por favor.'),
+        (0.5, 'Um <mark>café</mark>, por favor.'),
+    ]
+    assert hits[0][0].title == 'Test Post'
+    assert decode_search_cursor(next_cursor) == (0.5, hits[1][0].id)
+
+
+def test_search_cursor_continues_after_the_last_rank(post_row):
+    pool = FakePool(rows=search_rows(post_row, 1))
+    cursor = encode_search_cursor(0.25, 'abc')
+
+    hits, next_cursor = asyncio.run(
+        PostRepository(pool).search(
+            PostSearchQueryDTO(q='test', cursor=cursor, status=True)
+        )
+    )
+
+    query, args = pool.queries[0]
+    assert 'p.status = $2' in query
+    assert '(ts_rank(p.search_vector, q.query), p.id) < ($3::real, $4)' in (
+        query
+    )
+    assert args == ('test', True, 0.25, 'abc', 21)
+    assert len(hits) == 1
+    assert next_cursor is None
+
+
+def test_search_rejects_invalid_cursor():
+    with pytest.raises(ValueError, match='Invalid cursor.'):
+        asyncio.run(
+            PostRepository(FakePool()).search(
+                PostSearchQueryDTO(q='test', cursor='garbage')
+            )
+        )
+
+
+def test_writes_send_folded_search_text_only_when_it_differs(post_row):
+    pool = FakePool()
+    post = PostModel(**{**post_row, 'title': 'Ação e café'})
+
+    asyncio.run(PostRepository(pool).create(post))
+
+    _, args = pool.queries[-1]
+    assert args[-3:] == ('Acao e cafe', None, None)
+    assert fold_text('') is None
+
+
+def test_search_vector_has_a_gin_index():
+    assert (
+        'CREATE INDEX IF NOT EXISTS ix_posts_search_vector ON posts '
+        'USING gin (search_vector)'
+    ) in get_schema_statements()
+
+
+def test_view_version_reads_only_version_columns(post_row):
+    pool = FakePool(
+        rows=[{'version': 3, 'updated_at': post_row['created_at']}]
+    )
+
+    version = asyncio.run(PostRepository(pool).view_version(post_row['id']))
+
+    assert version == (3, post_row['created_at'])
+    assert pool.queries == [(SELECT_POST_VERSION, (post_row['id'],))]
+    assert 'body' not in SELECT_POST_VERSION
+
+
+def test_updates_bump_version():
+    assert 'version = version + 1' in UPDATE_POST
+    assert 'version = p.version + 1' in UPDATE_POSTS
@@ -0,0 +1,199 @@
+import asyncio
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from api.routes.streaming import dump_json
+from application.dtos.author_dto import AuthorDTO
+from application.dtos.post_dto import PostDTO
+from application.dtos.post_list_query_dto import PostListQueryDTO
+from application.dtos.post_search_query_dto import PostSearchQueryDTO
+from application.interfaces.post_repository_interface import (
+    PostRepositoryInterface,
+)
+from application.services.post_service import PostService
+from infrastructure.models.post_model import PostModel
+from infrastructure.search.inverted_index import InvertedIndex
+
+
+@pytest.fixture
+def repository():
+    return AsyncMock(spec=PostRepositoryInterface)
+
+
+@pytest.fixture
+def service(repository):
+    return PostService(repository)
+
+
+@pytest.fixture
+def post_data():
+    return PostDTO(
+        id=uuid4(),
+        title='Hello World',
+        description='Description',
+        body='Body',
+        author=AuthorDTO(id=uuid4(), firstname='John', lastname='Doe'),
+    )
+
+
+def test_create_generates_slug_and_persists(service, repository, post_data):
+    result = asyncio.run(service.create(post_data))
+
+    assert result.slug == 'hello-world'
+    assert result.author.firstname == 'John'
+    (model,), _ = repository.create.await_args
+    assert model.id == str(post_data.id)
+
+
+def test_create_validates_through_the_entity(service, repository):
+    with pytest.raises(ValueError, match='Body is required.'):
+        asyncio.run(service.create(PostDTO(title='x', description='d')))
+
+    repository.create.assert_not_awaited()
+
+
+def test_get_returns_none_when_missing(service, repository):
+    repository.view.return_value = None
+
+    assert asyncio.run(service.get('missing')) is None
+
+
+def test_update_uses_the_given_id(service, repository, post_data):
+    id = str(uuid4())
+
+    result = asyncio.run(service.update(id, post_data))
+
+    assert str(result.id) == id
+    repository.update.assert_awaited_once()
+    assert repository.update.await_args.args[0] == id
+
+
+def test_update_carries_author_id_and_leaves_a_missing_slug_out(
+    service, repository
+):
+    author_id = uuid4()
+    repository.update.return_value = 2
+
+    asyncio.run(
+        service.update(
+            str(uuid4()),
+            PostDTO(
+                title='Hello', description='D', body='B', author_id=author_id
+            ),
+        )
+    )
+
+    (_, model), _ = repository.update.await_args
+    assert model.author_id == str(author_id)
+    assert model.slug is None
+
+
+def test_update_returns_none_and_skips_the_index_when_missing(
+    repository, post_data
+):
+    index = InvertedIndex()
+    service = PostService(repository, index)
+    repository.update.return_value = None
+
+    result = asyncio.run(service.update(str(uuid4()), post_data))
+
+    assert result is None
+    assert len(index) == 0
+
+
+def test_update_returns_the_new_version(service, repository, post_data):
+    repository.update.return_value = 3
+
+    result = asyncio.run(service.update(str(post_data.id), post_data))
+
+    assert result.version == 3
+
+
+def test_authors_without_id_map_to_one_row_per_name(service, repository):
+    posts = [
+        PostDTO(
+            title=f'Post {number}',
+            description='D',
+            body='B',
+            author=AuthorDTO(firstname=firstname, lastname='Doe'),
+        )
+        for number, firstname in enumerate(['Jane', ' jane ', 'John'])
+    ]
+    repository.create_many.side_effect = lambda models: [
+        model.id for model in models
+    ]
+
+    asyncio.run(service.create_many(posts))
+    asyncio.run(service.update(str(uuid4()), posts[0]))
+
+    (models,), _ = repository.create_many.await_args
+    (_, updated), _ = repository.update.await_args
+    ids = [model.author.id for model in models]
+    assert ids[0] == ids[1] == updated.author.id
+    assert ids[2] != ids[0]
+
+
+def test_list_page_wraps_models_in_a_page(service, repository):
+    repository.list_page.return_value = ([PostModel(title='a')], 'next')
+
+    page = asyncio.run(service.list_page(PostListQueryDTO()))
+
+    assert [item.title for item in page.items] == ['a']
+    assert page.next_cursor == 'next'
+
+
+def test_one_instance_serves_concurrent_calls(service, repository):
+    posts = {
+        str(uuid4()): PostModel(title=f'Post {number}') for number in range(20)
+    }
+    delays = dict(zip(posts, reversed(range(20))))
+
+    async def view(id):
+        await asyncio.sleep(0.001 * delays[id])
+        return posts[id].model_copy(update={'id': id})
+
+    repository.view.side_effect = view
+
+    async def scenario():
+        return await asyncio.gather(*(service.get(id) for id in posts))
+
+    results = asyncio.run(scenario())
+
+    assert [result.title for result in results] == [
+        post.title for post in posts.values()
+    ]
+
+
+def test_convert_model_to_dto_keeps_missing_values_as_none(service):
+    author_id = str(uuid4())
+    model = PostModel(
+        id=str(uuid4()),
+        title='Post',
+        author_id=author_id,
+        thumbnail='https://example.com/a.png',
+    )
+
+    dto = service.convert_model_to_dto(model)
+
+    assert dto.description is None
+    assert dto.author is None
+    assert str(dto.author_id) == author_id
+    assert str(dto.thumbnail) == 'https://example.com/a.png'
+    assert dump_json(dto) == dto.model_dump_json().encode()
+
+
+def test_search_returns_hits_with_rank_and_snippet(service, repository):
+    model = PostModel(id=str(uuid4()), title='Hello', slug='hello')
+    repository.search.return_value = (
+        [(model, 0.5, '<mark>Hello</mark>')],
+        'c',
+    )
+
+    page = asyncio.run(service.search(PostSearchQueryDTO(q='hello')))
+
+    assert page.next_cursor == 'c'
+    assert page.items[0].post.title == 'Hello'
+    assert page.items[0].rank == 0.5
+    assert page.items[0].snippet == '<mark>Hello</mark>'
@@ -1,15 +1,21 @@
-from unittest.mock import MagicMock
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 
 import pytest
 
 from application.dtos.post_dto import PostDTO
+from application.dtos.post_list_query_dto import PostListQueryDTO
 from application.interfaces.base_repository_interface import (
     BaseRepositoryInterface,
 )
+from application.interfaces.post_repository_interface import (
+    PostRepositoryInterface,
+)
 from application.services.post_services import PostServices
 from infrastructure.models.author_model import AuthorModel
 from infrastructure.models.post_model import PostModel
+from infrastructure.search.inverted_index import InvertedIndex
 
 
 class PostRepository(BaseRepositoryInterface):
@@ -80,6 +86,9 @@ def test_execute_update(mock_repository: PostRepository, post_data: PostDTO):
     service.update_a_post(post_data.id)
     service.set_post_data(post_data)
     post_model = service.convert_dto_to_model(post_data)
+    post_model.excerpt = post_data.body
+    post_model.word_count = 7
+    post_model.reading_time = 1
     result = service.execute()
 
     assert result.title == 'Updated Title'
@@ -117,3 +126,136 @@ def test_list_all_posts(mock_repository: PostRepository, post_data: PostDTO):
 
     assert isinstance(result, list)
     mock_repository.list.assert_called_once()
+
+
+@pytest.fixture
+def mock_async_repository(mock_repository):
+    mock_repo = AsyncMock(spec=PostRepositoryInterface)
+    mock_repo.view.return_value = mock_repository.view.return_value
+    mock_repo.view_by_slug.return_value = mock_repository.view.return_value
+    mock_repo.list.return_value = mock_repository.list.return_value
+    mock_repo.list_page.return_value = (
+        mock_repository.list.return_value,
+        'next',
+    )
+    return mock_repo
+
+
+def test_execute_async_create(mock_async_repository, post_data: PostDTO):
+    service = PostServices(mock_async_repository)
+    service.create_a_new_post(post_data)
+
+    result = asyncio.run(service.execute_async())
+
+    assert result.title == post_data.title
+    mock_async_repository.create.assert_awaited_once_with(result)
+
+
+def test_execute_async_view(mock_async_repository, post_data: PostDTO):
+    service = PostServices(mock_async_repository)
+    service.view_a_post(post_data.id)
+
+    result = asyncio.run(service.execute_async())
+
+    assert result.id == post_data.id
+    mock_async_repository.view.assert_awaited_once_with(post_data.id)
+
+
+def test_execute_async_view_by_slug(mock_async_repository):
+    service = PostServices(mock_async_repository)
+    service.view_a_post_by_slug('test-post')
+
+    result = asyncio.run(service.execute_async())
+
+    assert result is not None
+    mock_async_repository.view_by_slug.assert_awaited_once_with('test-post')
+
+
+def test_execute_async_list(mock_async_repository):
+    service = PostServices(mock_async_repository)
+    service.list_all_posts()
+
+    result = asyncio.run(service.execute_async())
+
+    assert len(result) == 1
+    mock_async_repository.list.assert_awaited_once()
+
+
+def test_execute_async_delete(mock_async_repository, post_data: PostDTO):
+    service = PostServices(mock_async_repository)
+    service.delete_a_post(post_data.id)
+
+    assert asyncio.run(service.execute_async()) is None
+    mock_async_repository.delete.assert_awaited_once_with(post_data.id)
+
+
+def test_execute_async_list_page(mock_async_repository):
+    query = PostListQueryDTO(limit=1, summary=True)
+    service = PostServices(mock_async_repository)
+    service.list_posts(query)
+
+    result = asyncio.run(service.execute_async())
+
+    assert len(result.items) == 1
+    assert result.next_cursor == 'next'
+    mock_async_repository.list_page.assert_awaited_once_with(query)
+
+
+def test_create_many_reports_per_item_results(mock_async_repository):
+    valid = PostDTO(title='Hello World', description='D', body='B')
+    invalid = PostDTO(title='No body', description='D')
+    existing = PostDTO(id=uuid4(), title='Existing', description='D', body='B')
+
+    async def create_many(models):
+        return [model.id for model in models if model.title != 'Existing']
+
+    mock_async_repository.create_many.side_effect = create_many
+    service = PostServices(mock_async_repository)
+
+    results = asyncio.run(service.create_many([valid, invalid, existing]))
+
+    assert [result.success for result in results] == [True, False, False]
+    assert results[1].error == 'Body is required.'
+    assert results[2].error == 'Post already exists.'
+    (models,), _ = mock_async_repository.create_many.await_args
+    assert [model.slug for model in models] == ['hello-world', 'existing']
+
+
+def test_update_many_requires_ids(mock_async_repository, post_data: PostDTO):
+    mock_async_repository.update_many.return_value = [str(post_data.id)]
+    service = PostServices(mock_async_repository)
+    no_id = post_data.model_copy(update={'id': None})
+
+    results = asyncio.run(service.update_many([post_data, no_id, post_data]))
+
+    assert results[0].success
+    assert results[1].error == 'Id is required.'
+    assert results[2].error == 'Duplicate id.'
+    (models,), _ = mock_async_repository.update_many.await_args
+    assert models[0].author.firstname == 'John'
+
+
+def test_delete_many_reports_missing_posts(mock_async_repository):
+    mock_async_repository.delete_many.return_value = ['a']
+    service = PostServices(mock_async_repository)
+
+    results = asyncio.run(service.delete_many(['a', 'b']))
+
+    assert [result.success for result in results] == [True, False]
+    assert results[1].error == 'Post not found.'
+
+
+def test_builder_keeps_search_index_in_sync(
+    mock_repository: PostRepository, post_data: PostDTO
+):
+    index = InvertedIndex()
+    service = PostServices(mock_repository, index)
+    service.create_a_new_post(post_data)
+    created = service.execute()
+
+    assert [id for id, _ in index.search('testing', 10)] == [created.id]
+
+    service.delete_a_post(created.id)
+    service.execute()
+
+    assert index.search('testing', 10) == []
@@ -0,0 +1,164 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from redis.exceptions import ConnectionError
+
+from api.middlewares.rate_limit_middleware import RateLimitMiddleware
+from api.rate_limit.redis_limiter import RateLimitResult
+from api.rate_limit.rules import RateLimitRule, parse_rate, parse_route_limits
+
+
+class FakeRateLimiter:
+    def __init__(self):
+        self.counts = {}
+        self.calls = []
+        self.error = None
+
+    async def hit(self, key, rule, cost=1):
+        if self.error:
+            raise self.error
+        self.calls.append((key, rule))
+        used = self.counts.get(key, 0)
+        allowed = used + cost <= rule.limit
+        if allowed:
+            self.counts[key] = used + cost
+        return RateLimitResult(
+            allowed=allowed,
+            limit=rule.limit,
+            remaining=rule.limit - self.counts[key],
+            retry_after=0 if allowed else 12.3,
+            reset_after=30,
+        )
+
+
+class UserMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        scope.setdefault('state', {})['user'] = {'sub': 'user-1'}
+        await self.app(scope, receive, send)
+
+
+@pytest.fixture
+def limiter():
+    return FakeRateLimiter()
+
+
+def build_client(limiter, authenticated=False, **options):
+    app = FastAPI()
+    app.state.rate_limiter = limiter
+    app.add_middleware(
+        RateLimitMiddleware,
+        default_limit=RateLimitRule(2, 60),
+        authenticated_limit=RateLimitRule(5, 60),
+        route_limits=options.get('route_limits', {}),
+    )
+    if authenticated:
+        app.add_middleware(UserMiddleware)
+
+    @app.get('/ping')
+    async def ping():
+        return {'ok': True}
+
+    @app.post('/login')
+    async def login():
+        return {'ok': True}
+
+    @app.get('/stream')
+    async def stream():
+        async def chunks():
+            for chunk in (b'a', b'b', b'c'):
+                yield chunk
+
+        return StreamingResponse(chunks())
+
+    return TestClient(app)
+
+
+def test_allows_requests_within_limit_and_sets_headers(limiter):
+    client = build_client(limiter)
+
+    first = client.get('/ping')
+    second = client.get('/ping')
+
+    assert first.status_code == second.status_code == 200
+    assert first.headers['RateLimit-Limit'] == '2'
+    assert first.headers['RateLimit-Remaining'] == '1'
+    assert second.headers['RateLimit-Remaining'] == '0'
+    assert first.headers['RateLimit-Policy'] == '2;w=60'
+
+
+def test_rejects_requests_over_limit_with_retry_after(limiter):
+    client = build_client(limiter)
+    client.get('/ping')
+    client.get('/ping')
+
+    response = client.get('/ping')
+
+    assert response.status_code == 429
+    assert response.json() == {'detail': 'Too many requests'}
+    assert response.headers['Retry-After'] == '13'
+
+
+def test_streaming_responses_pass_through_with_headers(limiter):
+    client = build_client(limiter)
+
+    response = client.get('/stream')
+
+    assert response.content == b'abc'
+    assert response.headers['RateLimit-Remaining'] == '1'
+
+
+def test_authenticated_requests_are_limited_by_subject(limiter):
+    client = build_client(limiter, authenticated=True)
+
+    client.get('/ping')
+
+    key, rule = limiter.calls[0]
+    assert key == '*:user:user-1'
+    assert rule == RateLimitRule(5, 60)
+
+
+def test_route_limits_match_method_and_prefix(limiter):
+    client = build_client(
+        limiter, route_limits={'POST /login': RateLimitRule(1, 60)}
+    )
+
+    assert client.post('/login').status_code == 200
+    assert client.post('/login').status_code == 429
+    assert client.get('/ping').status_code == 200
+    assert limiter.calls[0][0] == 'POST:/login:ip:testclient'
+
+
+def test_docs_are_not_rate_limited(limiter):
+    client = build_client(limiter)
+    client.get('/openapi.json')
+
+    assert limiter.calls == []
+
+
+def test_redis_errors_fail_open(limiter):
+    limiter.error = ConnectionError('down')
+    client = build_client(limiter)
+
+    assert client.get('/ping').status_code == 200
+
+
+def test_parse_rate():
+    assert parse_rate('10/minute') == RateLimitRule(10, 60)
+    assert parse_rate('100/hours') == RateLimitRule(100, 3600)
+    assert parse_rate('5/30') == RateLimitRule(5, 30)
+    with pytest.raises(ValueError):
+        parse_rate('ten per minute')
+
+
+def test_parse_route_limits():
+    assert parse_route_limits(
+        'POST /api/v1/auth/login=5/minute, /api/v1/search=30/minute'
+    ) == {
+        'POST /api/v1/auth/login': RateLimitRule(5, 60),
+        '/api/v1/search': RateLimitRule(30, 60),
+    }
+    assert parse_route_limits('') == {}
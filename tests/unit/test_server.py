@@ -0,0 +1,91 @@
+from scripts import server
+from scripts.server import RecyclingServer, server_options, worker_count
+
+
+def configure(monkeypatch, **values):
+    for name, value in values.items():
+        monkeypatch.setattr(server.settings, name, value)
+
+
+def test_explicit_worker_count_wins(monkeypatch):
+    configure(monkeypatch, SERVER_WORKERS=3, SERVER_WORKERS_PER_CORE=4.0)
+
+    assert worker_count() == 3
+
+
+def test_workers_scale_with_cores(monkeypatch):
+    configure(monkeypatch, SERVER_WORKERS=0, SERVER_WORKERS_PER_CORE=1.5)
+    monkeypatch.setattr(server, 'available_cpus', lambda: 4)
+
+    assert worker_count() == 6
+
+
+def test_at_least_one_worker(monkeypatch):
+    configure(monkeypatch, SERVER_WORKERS=0, SERVER_WORKERS_PER_CORE=0.1)
+    monkeypatch.setattr(server, 'available_cpus', lambda: 1)
+
+    assert worker_count() == 1
+
+
+def test_production_options_never_reload(monkeypatch):
+    configure(
+        monkeypatch,
+        APP_ENV='production',
+        SERVER_RELOAD=True,
+        SERVER_WORKERS=4,
+        SERVER_LIMIT_CONCURRENCY=0,
+        SERVER_MAX_REQUESTS=10000,
+    )
+
+    options = server_options()
+
+    assert options['reload'] is False
+    assert options['workers'] == 4
+    assert options['limit_concurrency'] is None
+    assert options['limit_max_requests'] == 10000
+    assert options['log_config'] is None
+
+
+def test_development_reload_uses_a_single_worker(monkeypatch):
+    configure(
+        monkeypatch,
+        APP_ENV='development',
+        SERVER_RELOAD=True,
+        SERVER_WORKERS=4,
+        SERVER_MAX_REQUESTS=10000,
+    )
+
+    options = server_options()
+
+    assert options['reload'] is True
+    assert options['workers'] == 1
+    assert options['limit_max_requests'] is None
+
+
+def test_falls_back_without_uvloop_and_httptools(monkeypatch):
+    monkeypatch.setattr(server, 'find_spec', lambda name: None)
+
+    options = server_options()
+
+    assert options['loop'] == 'asyncio'
+    assert options['http'] == 'h11'
+
+
+def test_uses_uvloop_and_httptools_when_installed(monkeypatch):
+    monkeypatch.setattr(server, 'find_spec', lambda name: object())
+
+    options = server_options()
+
+    assert options['loop'] == 'uvloop'
+    assert options['http'] == 'httptools'
+
+
+def test_recycling_server_adds_jitter_to_request_limit(monkeypatch):
+    config = server.uvicorn.Config(server.APP, limit_max_requests=100)
+    recycling = RecyclingServer(config, jitter=50)
+    monkeypatch.setattr(server.random, 'randint', lambda low, high: high)
+    monkeypatch.setattr(server.uvicorn.Server, 'run', lambda self, s: None)
+
+    recycling.run()
+
+    assert config.limit_max_requests == 150
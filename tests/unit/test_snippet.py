@@ -0,0 +1,34 @@
+from infrastructure.search.snippet import (
+    FRAGMENT_DELIMITER,
+    MAX_WORDS,
+    headline,
+    query_terms,
+)
+
+
+def test_query_terms_are_folded_without_negations_or_operators():
+    assert query_terms('"Café com" -leite or Ação') == {'cafe', 'com', 'acao'}
+
+
+def test_headline_marks_accented_words_for_a_folded_query():
+    assert headline('<p>Um <b>Café</b> e um cafe.</p>', 'cafe') == (
+        'Um <mark>Café</mark> e um <mark>cafe</mark>.'
+    )
+    assert headline('Um Café.', 'café') == 'Um <mark>Café</mark>.'
+
+
+def test_headline_keeps_at_most_two_fragments_around_matches():
+    words = ['filler'] * 100
+    words[10] = words[60] = words[90] = 'match'
+
+    snippet = headline(' '.join(words), 'match')
+
+    fragments = snippet.split(FRAGMENT_DELIMITER)
+    assert len(fragments) == 2
+    assert all(len(fragment.split()) == MAX_WORDS for fragment in fragments)
+    assert snippet.count('<mark>match</mark>') == 2
+
+
+def test_headline_without_matches_starts_the_text():
+    assert headline('one two three', 'other') == 'one two three'
+    assert headline(None, 'other') is None
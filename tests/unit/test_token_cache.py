@@ -0,0 +1,110 @@
+import asyncio
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from api.middlewares.jwt_middleware import JWTMiddleware
+from api.security.token_cache import VerifiedTokenCache
+
+
+class StaticKeyCache:
+    def __init__(self, public_key):
+        self.public_key = public_key
+        self.calls = 0
+
+    async def get_key(self, kid=None):
+        self.calls += 1
+        return self.public_key
+
+
+@pytest.fixture
+def private_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def make_token(private_key, **claims) -> str:
+    payload = {'sub': 'user-1', 'exp': int(time.time()) + 60, **claims}
+    return jwt.encode(payload, private_key, algorithm='RS256')
+
+
+def test_get_returns_none_and_counts_miss():
+    cache = VerifiedTokenCache()
+
+    assert cache.get('token') is None
+    assert cache.stats() == {'hits': 0, 'misses': 1, 'size': 0}
+
+
+def test_set_then_get_counts_hit():
+    cache = VerifiedTokenCache()
+    payload = {'sub': 'user-1', 'exp': time.time() + 60}
+    cache.set('token', payload)
+
+    assert cache.get('token') is payload
+    assert cache.hits == 1
+
+
+def test_entry_expires_with_token():
+    cache = VerifiedTokenCache()
+    cache.set('token', {'sub': 'user-1', 'exp': time.time() - 1})
+
+    assert cache.get('token') is None
+    assert len(cache) == 0
+
+
+def test_entry_is_capped_by_max_ttl(monkeypatch):
+    cache = VerifiedTokenCache(max_ttl=10)
+    now = time.time()
+    cache.set('token', {'sub': 'user-1', 'exp': now + 3600})
+
+    monkeypatch.setattr(time, 'time', lambda: now + 11)
+
+    assert cache.get('token') is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = VerifiedTokenCache(max_size=2)
+    exp = time.time() + 60
+    cache.set('a', {'exp': exp})
+    cache.set('b', {'exp': exp})
+    cache.get('a')
+    cache.set('c', {'exp': exp})
+
+    assert cache.get('a') is not None
+    assert cache.get('b') is None
+    assert cache.get('c') is not None
+
+
+def test_disabled_cache_stores_nothing():
+    cache = VerifiedTokenCache(max_size=0)
+    cache.set('token', {'exp': time.time() + 60})
+
+    assert len(cache) == 0
+
+
+def test_decode_token_verifies_once_per_token(private_key):
+    key_cache = StaticKeyCache(private_key.public_key())
+    middleware = JWTMiddleware(app=None, jwks_cache=key_cache)
+    token = make_token(private_key)
+
+    async def scenario():
+        return [await middleware.decode_token(token) for _ in range(3)]
+
+    payloads = asyncio.run(scenario())
+
+    assert all(payload['sub'] == 'user-1' for payload in payloads)
+    assert key_cache.calls == 1
+    assert middleware.token_cache.hits == 2
+
+
+def test_decode_token_does_not_cache_invalid_tokens(private_key):
+    other_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    middleware = JWTMiddleware(
+        app=None, jwks_cache=StaticKeyCache(private_key.public_key())
+    )
+    token = make_token(other_key)
+
+    with pytest.raises(jwt.InvalidSignatureError):
+        asyncio.run(middleware.decode_token(token))
+    assert len(middleware.token_cache) == 0